@@ -0,0 +1,75 @@
+"""
+SQLite-backed Activity Log Shared by All Server Processes
+"""
+import os
+import socket
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+class ActivityLog:
+    """Recent monitor activities in SQLite, so any worker process can show what the monitor did"""
+
+    def __init__(self, db_path="data/email_pipeline.db", max_activities=500, prune_every=50):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.max_activities = max_activities
+        self.prune_every = prune_every
+        self.process = f"{socket.gethostname()}-{os.getpid()}"
+        self._writes = 0
+        self.init_database()
+
+    def get_connection(self):
+        """Get database connection (autocommit)"""
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def init_database(self):
+        """Initialize activity table"""
+        conn = self.get_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS activities (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                type TEXT NOT NULL,
+                message TEXT NOT NULL,
+                subject TEXT,
+                process TEXT,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.close()
+
+    def add(self, activity_type, message, email_subject=None):
+        """Append an activity; older rows beyond max_activities are pruned now and then"""
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                """INSERT INTO activities (timestamp, type, message, subject, process, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (datetime.now().isoformat(), activity_type, message, email_subject, self.process, time.time())
+            )
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                conn.execute(
+                    "DELETE FROM activities WHERE id <= (SELECT MAX(id) FROM activities) - ?",
+                    (self.max_activities,)
+                )
+        except sqlite3.Error as e:
+            print(f"Error logging activity: {e}")
+        finally:
+            conn.close()
+
+    def recent(self, limit=20):
+        """Last `limit` activities, oldest first"""
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT timestamp, type, message, subject FROM activities ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [{'timestamp': row[0], 'type': row[1], 'message': row[2], 'subject': row[3]} for row in reversed(rows)]
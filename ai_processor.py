@@ -1,460 +1,840 @@
-"""
-AI Processor for Email Analysis and Natural Language Commands
-"""
-import google.generativeai as genai
-import json
-import re
-from datetime import datetime, timedelta
-from dateutil import parser
-
-class AIProcessor:
-    def __init__(self, api_key=None, excel_manager=None):
-        self.api_key = api_key
-        self.excel_manager = excel_manager
-        self.model = None
-        if api_key:
-            self.initialize_ai(api_key)
-    
-    def initialize_ai(self, api_key):
-        """Initialize Gemini AI"""
-        try:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-lite')
-            self.api_key = api_key
-            return True
-        except Exception as e:
-            print(f"Failed to initialize AI: {e}")
-            return False
-    
-    def process_email(self, email_data):
-        """Process email with AI to extract recruitment information"""
-        if not self.model:
-            return None
-        
-        prompt = f"""
-        Analyze this recruitment email and extract relevant information:
-        
-        Subject: {email_data['subject']}
-        From: {email_data['sender_name']} ({email_data['sender']})
-        Body: {email_data['body'][:2000]}
-        Attachments: {', '.join([att['filename'] for att in email_data.get('attachments', [])])}
-        
-        Extract the following if present:
-        1. Candidate name(s)
-        2. Position/Job title
-        3. Project name
-        4. CV submission details
-        5. Interview schedule information (date, time, location)
-        6. Hiring manager feedback
-        7. Interview results
-        8. Offer details
-        9. Any status updates
-        10. Email address of candidate
-        11. Phone number
-        12. Current location
-        13. Notice period
-        14. Nationality
-        
-        Return as JSON format with appropriate fields. Use these field names:
-        - candidate_name
-        - position
-        - project_name
-        - job_id (if mentioned)
-        - cv_source
-        - email
-        - mobile
-        - current_location
-        - notice_period
-        - nationality
-        - interview_date
-        - interview_time
-        - interview_location
-        - feedback
-        - interview_result
-        - offer_details
-        - status_update
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            extracted_data = self._parse_ai_response(response.text)
-            
-            # Process extracted data and update trackers
-            result = self._update_trackers(extracted_data, email_data)
-            
-            return result
-        except Exception as e:
-            print(f"AI processing error: {e}")
-            return None
-    
-    def process_command(self, command):
-        """Process natural language command"""
-        if not self.model:
-            return {"error": "AI not initialized", "response": "Please configure AI API key first."}
-        
-        prompt = f"""
-        Parse this recruitment system command and extract the action and parameters:
-        
-        Command: {command}
-        
-        Possible actions:
-        1. Add/Log candidate(s) - Extract: candidate names, job ID, CV source, email, mobile, location, etc.
-        2. Update CV/candidate status - Extract: CV ID, new status, dates, comments
-        3. Add hiring manager - Extract: name, email, project
-        4. Add project - Extract: project name
-        5. Search/Show data - Extract: search criteria, filters
-        6. Send email - Extract: recipient, subject, content
-        7. Schedule interview - Extract: candidate, date, time, interviewer
-        8. Update feedback - Extract: candidate, feedback, decision
-        
-        Return as JSON with 'action' and 'parameters' fields.
-        For candidates, use array format in parameters.candidates
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            parsed_command = self._parse_ai_response(response.text)
-            
-            # Execute command
-            result = self._execute_command(parsed_command)
-            
-            return result
-        except Exception as e:
-            return {"error": str(e), "response": "Failed to process command."}
-    
-    def _parse_ai_response(self, response_text):
-        """Parse AI response to extract JSON"""
-        try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                # Try to parse the entire response
-                return json.loads(response_text)
-        except:
-            # Return empty dict if parsing fails
-            return {}
-    
-    def _update_trackers(self, extracted_data, email_data):
-        """Update Excel trackers based on extracted data"""
-        if not self.excel_manager:
-            return None
-        
-        action_taken = None
-        
-        try:
-            # Check if it's a CV submission
-            if extracted_data.get('candidate_name') and extracted_data.get('position'):
-                cv_data = {
-                    'Candidate Name': extracted_data['candidate_name'],
-                    'Position': extracted_data['position'],
-                    'CV Source': extracted_data.get('cv_source', 'Email'),
-                    'Date CV Shared': datetime.now().date(),
-                    'Email': extracted_data.get('email', ''),
-                    'Mobile': extracted_data.get('mobile', ''),
-                    'Current Location': extracted_data.get('current_location', ''),
-                    'Notice Period': extracted_data.get('notice_period', ''),
-                    'Nationality': extracted_data.get('nationality', ''),
-                    'Application Status': 'CV Shared'
-                }
-                
-                # Add project if specified
-                if extracted_data.get('project_name'):
-                    cv_data['Project'] = extracted_data['project_name']
-                
-                # Try to find matching JobID
-                if extracted_data.get('job_id'):
-                    cv_data['JobID'] = extracted_data['job_id']
-                else:
-                    # Search for matching job
-                    jobs = self.excel_manager.search_jobs({
-                        'Job Title': extracted_data['position']
-                    })
-                    if not jobs.empty:
-                        cv_data['JobID'] = jobs.iloc[0]['JobID']
-                        # Get project from job if not already set
-                        if not cv_data.get('Project'):
-                            cv_data['Project'] = jobs.iloc[0].get('Project Name', '')
-                
-                if cv_data.get('JobID'):
-                    cv_id, message = self.excel_manager.add_cv(cv_data)
-                    if cv_id:
-                        action_taken = f"Added CV for {extracted_data['candidate_name']} (ID: {cv_id})"
-                        extracted_data['action_taken'] = action_taken
-            
-            # Check if it's interview scheduling
-            if extracted_data.get('interview_date') and extracted_data.get('candidate_name'):
-                # Find CV record
-                cvs = self.excel_manager.search_cvs({
-                    'Candidate Name': extracted_data['candidate_name']
-                })
-                if not cvs.empty:
-                    cv_id = cvs.iloc[0]['CVID']
-                    
-                    # Parse interview date
-                    try:
-                        interview_datetime = parser.parse(extracted_data['interview_date'])
-                        if extracted_data.get('interview_time'):
-                            # Combine date and time if separate
-                            time_str = extracted_data['interview_time']
-                            interview_datetime = parser.parse(f"{extracted_data['interview_date']} {time_str}")
-                    except:
-                        interview_datetime = extracted_data['interview_date']
-                    
-                    updates = {
-                        'Interview Date': interview_datetime,
-                        'Application Status': 'Interview Scheduled'
-                    }
-                    
-                    if extracted_data.get('interview_location'):
-                        updates['Remarks'] = f"Interview Location: {extracted_data['interview_location']}"
-                    
-                    success, message = self.excel_manager.update_cv(cv_id, updates)
-                    if success:
-                        action_taken = f"Updated interview schedule for {extracted_data['candidate_name']}"
-                        extracted_data['action_taken'] = action_taken
-            
-            # Check if it's feedback or interview results
-            if (extracted_data.get('feedback') or extracted_data.get('interview_result')) and extracted_data.get('candidate_name'):
-                cvs = self.excel_manager.search_cvs({
-                    'Candidate Name': extracted_data['candidate_name']
-                })
-                if not cvs.empty:
-                    cv_id = cvs.iloc[0]['CVID']
-                    updates = {}
-                    
-                    if extracted_data.get('feedback'):
-                        updates['HM Feedback'] = extracted_data['feedback']
-                        updates['HM Feedback Date'] = datetime.now().date()
-                        
-                        # Add to comments if long feedback
-                        if len(extracted_data['feedback']) > 100:
-                            updates['HM Comments'] = extracted_data['feedback']
-                            updates['HM Feedback'] = extracted_data['feedback'][:100] + "..."
-                    
-                    if extracted_data.get('interview_result'):
-                        updates['Interview Results'] = extracted_data['interview_result']
-                        updates['Date Interview Result'] = datetime.now().date()
-                        
-                        # Update status based on result
-                        result_lower = extracted_data['interview_result'].lower()
-                        if any(word in result_lower for word in ['pass', 'selected', 'yes', 'approved']):
-                            updates['Application Status'] = 'Interview Passed'
-                        elif any(word in result_lower for word in ['fail', 'reject', 'no']):
-                            updates['Application Status'] = 'Rejected'
-                    
-                    success, message = self.excel_manager.update_cv(cv_id, updates)
-                    if success:
-                        action_taken = f"Updated feedback for {extracted_data['candidate_name']}"
-                        extracted_data['action_taken'] = action_taken
-            
-            # Check if it's an offer
-            if extracted_data.get('offer_details') and extracted_data.get('candidate_name'):
-                cvs = self.excel_manager.search_cvs({
-                    'Candidate Name': extracted_data['candidate_name']
-                })
-                if not cvs.empty:
-                    cv_id = cvs.iloc[0]['CVID']
-                    updates = {
-                        'Application Status': 'Offer Extended',
-                        'Date Offer Issued': datetime.now().date(),
-                        'Offer Status': 'Pending'
-                    }
-                    
-                    # Extract salary if mentioned
-                    salary_match = re.search(r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:AED|USD|GBP|EUR)?', extracted_data['offer_details'])
-                    if salary_match:
-                        updates['Package'] = salary_match.group(1).replace(',', '')
-                    
-                    success, message = self.excel_manager.update_cv(cv_id, updates)
-                    if success:
-                        action_taken = f"Updated offer details for {extracted_data['candidate_name']}"
-                        extracted_data['action_taken'] = action_taken
-                    
-        except Exception as e:
-            print(f"Error updating trackers: {e}")
-        
-        return extracted_data
-    
-    def _execute_command(self, parsed_command):
-        """Execute parsed command"""
-        action = parsed_command.get('action', '').lower()
-        params = parsed_command.get('parameters', {})
-        
-        try:
-            if 'add' in action and 'candidate' in action:
-                return self._add_candidates(params)
-            elif 'update' in action:
-                return self._update_status(params)
-            elif 'add' in action and 'manager' in action:
-                return self._add_hiring_manager(params)
-            elif 'add' in action and 'project' in action:
-                return self._add_project(params)
-            elif 'search' in action or 'show' in action:
-                return self._search_data(params)
-            elif 'schedule' in action and 'interview' in action:
-                return self._schedule_interview(params)
-            else:
-                return {"response": "Command understood but not yet implemented."}
-                
-        except Exception as e:
-            return {"error": str(e), "response": "Failed to execute command."}
-    
-    def _add_candidates(self, params):
-        """Add candidates to CV tracker"""
-        if not self.excel_manager:
-            return {"error": "Excel manager not available"}
-        
-        candidates = params.get('candidates', [])
-        job_id = params.get('job_id')
-        
-        # Handle single candidate as well
-        if not candidates and params.get('name'):
-            candidates = [{
-                'name': params.get('name'),
-                'email': params.get('email'),
-                'source': params.get('source', 'Direct')
-            }]
-        
-        if not candidates:
-            return {"response": "No candidates found in command."}
-        
-        results = []
-        for candidate in candidates:
-            cv_data = {
-                'JobID': job_id,
-                'Candidate Name': candidate.get('name'),
-                'CV Source': candidate.get('source', 'Direct'),
-                'Email': candidate.get('email', ''),
-                'Mobile': candidate.get('mobile', ''),
-                'Current Location': candidate.get('location', ''),
-                'Application Status': 'CV Shared',
-                'Date CV Shared': datetime.now().date()
-            }
-            
-            cv_id, message = self.excel_manager.add_cv(cv_data)
-            if cv_id:
-                results.append(f"✓ Added {candidate.get('name')} (ID: {cv_id})")
-            else:
-                results.append(f"✗ Failed to add {candidate.get('name')}: {message}")
-        
-        return {"response": "\n".join(results)}
-    
-    def _update_status(self, params):
-        """Update CV status"""
-        if not self.excel_manager:
-            return {"error": "Excel manager not available"}
-        
-        cv_id = params.get('cv_id')
-        updates = params.get('updates', {})
-        
-        # Map common status updates
-        if params.get('status'):
-            updates['Application Status'] = params['status']
-        if params.get('interview_date'):
-            updates['Interview Date'] = params['interview_date']
-        if params.get('feedback'):
-            updates['HM Feedback'] = params['feedback']
-            updates['HM Feedback Date'] = datetime.now().date()
-        
-        if not cv_id:
-            return {"response": "CV ID not specified."}
-        
-        success, message = self.excel_manager.update_cv(cv_id, updates)
-        
-        return {"response": message}
-    
-    def _schedule_interview(self, params):
-        """Schedule interview for candidate"""
-        if not self.excel_manager:
-            return {"error": "Excel manager not available"}
-        
-        candidate_name = params.get('candidate')
-        interview_date = params.get('date')
-        interview_time = params.get('time')
-        interviewer = params.get('interviewer')
-        
-        if not candidate_name:
-            return {"response": "Candidate name not specified."}
-        
-        # Find candidate
-        cvs = self.excel_manager.search_cvs({
-            'Candidate Name': candidate_name
-        })
-        
-        if cvs.empty:
-            return {"response": f"Candidate {candidate_name} not found."}
-        
-        cv_id = cvs.iloc[0]['CVID']
-        
-        # Combine date and time
-        interview_datetime = interview_date
-        if interview_time:
-            interview_datetime = f"{interview_date} {interview_time}"
-        
-        updates = {
-            'Interview Date': interview_datetime,
-            'Application Status': 'Interview Scheduled'
-        }
-        
-        if interviewer:
-            updates['Remarks'] = f"Interview with {interviewer}"
-        
-        success, message = self.excel_manager.update_cv(cv_id, updates)
-        
-        if success:
-            return {"response": f"Interview scheduled for {candidate_name} on {interview_datetime}"}
-        else:
-            return {"response": f"Failed to schedule interview: {message}"}
-    
-    def _add_hiring_manager(self, params):
-        """Add hiring manager"""
-        # This would integrate with the database module
-        return {"response": f"Hiring manager {params.get('name')} would be added with email {params.get('email')}."}
-    
-    def _add_project(self, params):
-        """Add project"""
-        # This would integrate with the database module
-        return {"response": f"Project {params.get('name')} would be added."}
-    
-    def _search_data(self, params):
-        """Search tracker data"""
-        if not self.excel_manager:
-            return {"error": "Excel manager not available"}
-        
-        search_type = params.get('type', 'cv')
-        criteria = params.get('criteria', {})
-        
-        # Handle various search patterns
-        if params.get('project'):
-            criteria['Project'] = params['project']
-        if params.get('position'):
-            criteria['Position'] = params['position']
-        if params.get('status'):
-            criteria['Application Status'] = params['status']
-        if params.get('candidate'):
-            criteria['Candidate Name'] = params['candidate']
-        
-        if search_type == 'job':
-            results = self.excel_manager.search_jobs(criteria)
-        else:
-            results = self.excel_manager.search_cvs(criteria)
-        
-        if results.empty:
-            return {"response": "No results found."}
-        
-        # Format results
-        response = f"Found {len(results)} results:\n\n"
-        for idx, row in results.head(10).iterrows():
-            if search_type == 'job':
-                response += f"• {row['JobID']}: {row['Job Title']} at {row['Project Name']} ({row['Job Status']})\n"
-            else:
-                response += f"• {row['CVID']}: {row['Candidate Name']} for {row['Position']} ({row['Application Status']})\n"
-                if row.get('Interview Date'):
-                    response += f"  Interview: {row['Interview Date']}\n"
-        
-        if len(results) > 10:
-            response += f"\n... and {len(results) - 10} more results"
-        
-        return {"response": response, "data": results.to_dict('records')}
\ No newline at end of file
+"""
+AI Processor for Email Analysis and Natural Language Commands
+"""
+import json
+import re
+from datetime import datetime, timedelta
+from dateutil import parser
+
+from llm_cache import LLMCache
+from llm_client import LLMClient
+from llm_providers import GeminiProvider
+from rule_extractor import RuleBasedExtractor
+from intent_parser import IntentParser
+from entity_resolver import EntityResolver
+from prompt_builder import EmailPromptBuilder
+from email_text import is_forward
+import metrics
+
+class AIProcessingError(Exception):
+    """An email could not be analysed; its queue item should be retried"""
+
+
+# Field names requested from the model for email extraction
+EXTRACTION_FIELDS = [
+    'candidate_name', 'position', 'project_name', 'job_id', 'cv_source', 'email', 'mobile',
+    'current_location', 'notice_period', 'nationality', 'interview_date', 'interview_time',
+    'interview_location', 'feedback', 'interview_result', 'offer_details', 'status_update'
+]
+
+EXTRACTION_INSTRUCTIONS = """Extract the following if present:
+        1. Candidate name(s)
+        2. Position/Job title
+        3. Project name
+        4. CV submission details
+        5. Interview schedule information (date, time, location)
+        6. Hiring manager feedback
+        7. Interview results
+        8. Offer details
+        9. Any status updates
+        10. Email address of candidate
+        11. Phone number
+        12. Current location
+        13. Notice period
+        14. Nationality
+        
+        Return as JSON format with appropriate fields. Use these field names:
+        - candidate_name
+        - position
+        - project_name
+        - job_id (if mentioned)
+        - cv_source
+        - email
+        - mobile
+        - current_location
+        - notice_period
+        - nationality
+        - interview_date
+        - interview_time
+        - interview_location
+        - feedback
+        - interview_result
+        - offer_details
+        - status_update
+        """
+
+class AIProcessor:
+    def __init__(self, api_key=None, excel_manager=None, cache=None, client_options=None, provider=None):
+        self.api_key = api_key
+        self.excel_manager = excel_manager
+        self.entity_resolver = EntityResolver(excel_manager) if excel_manager else None
+        self.model = None  # The active LLMProvider
+        self.client = None
+        self.client_options = client_options or {}  # Concurrency, rate limits and timeouts for LLMClient
+        self.model_name = 'gemini-2.0-flash-lite'
+        self.cache = cache or LLMCache()
+        self.rule_extractor = RuleBasedExtractor()  # Fast path that skips the LLM when confident
+        self.extraction_stats = {'emails': 0, 'fast_path': 0, 'llm': 0}
+        self.intent_parser = IntentParser()  # Handles frequent command shapes without the LLM
+        self.command_stats = {'local': 0, 'llm': 0}
+        self.prompt_builder = EmailPromptBuilder()  # Cleans and token-budgets email bodies
+        self.batch_prompt_budget = 12000  # Max characters of email content per batched prompt
+        self.max_batch_size = 20
+        if provider:
+            self.set_provider(provider)
+        elif api_key:
+            self.initialize_ai(api_key)
+    
+    def initialize_ai(self, api_key):
+        """Initialize Gemini AI"""
+        try:
+            self.set_provider(GeminiProvider(api_key, self.model_name))
+            self.api_key = api_key
+            return True
+        except Exception as e:
+            print(f"Failed to initialize AI: {e}")
+            return False
+    
+    def set_provider(self, provider):
+        """Use an LLMProvider (anything with generate_content) behind the LLM client"""
+        if self.client:
+            self.client.shutdown()
+        self.model = provider
+        self.model_name = getattr(provider, 'model_name', self.model_name)
+        self.client = LLMClient(provider, **self.client_options)
+    
+    def process_email(self, email_data):
+        """Process email with AI to extract recruitment information"""
+        fast_result = self._try_fast_path(email_data)
+        if fast_result is not None:
+            return fast_result
+        
+        if not self.model:
+            raise AIProcessingError("No AI model configured")
+        
+        self._count_extraction('llm')
+        return self._process_single(email_data)
+    
+    def _process_single(self, email_data):
+        """Extract one email with the LLM and update trackers"""
+        prompt = f"""
+        Analyze this recruitment email and extract relevant information:
+        
+        Subject: {email_data['subject']}
+        From: {email_data['sender_name']} ({email_data['sender']})
+        Body: {self.prompt_builder.body_for_prompt(email_data.get('body'), forwarded=is_forward(email_data['subject']))}
+        Attachments: {', '.join([att['filename'] for att in email_data.get('attachments', [])])}
+        
+        {EXTRACTION_INSTRUCTIONS}
+        """
+        
+        try:
+            extracted_data = self._generate_json(prompt)
+            
+            # Process extracted data and update trackers
+            result = self._update_trackers(extracted_data, email_data)
+            
+            return result
+        except AIProcessingError:
+            raise
+        except Exception as e:
+            print(f"AI processing error: {e}")
+            raise AIProcessingError(str(e)) from e
+
+    def process_conversation(self, emails):
+        """Process all messages of one email thread with a single AI call"""
+        if not emails:
+            return None
+        if len(emails) == 1:
+            return self.process_email(emails[0])
+        if not self.model:
+            raise AIProcessingError("No AI model configured")
+
+        self._count_extraction('llm', len(emails))
+        messages = ""
+        for i, email_data in enumerate(emails, 1):
+            messages += f"""
+        --- Message {i} of {len(emails)} ---{self._format_email(email_data)}"""
+
+        prompt = f"""
+        Analyze this recruitment email thread (oldest message first) and extract relevant information.
+        Where messages disagree, use the most recent one, so the result reflects the current state of the thread.
+        {messages}
+        {EXTRACTION_INSTRUCTIONS}
+        Return a single JSON object for the whole thread.
+        """
+
+        try:
+            extracted_data = self._generate_json(prompt)
+
+            # Apply one merged update for the thread, attributed to the latest message
+            result = self._update_trackers(extracted_data, emails[-1])
+
+            return result
+        except AIProcessingError:
+            raise
+        except Exception as e:
+            print(f"AI processing error: {e}")
+            raise AIProcessingError(str(e)) from e
+
+    def process_email_batch(self, emails):
+        """
+        Process several independent emails with as few AI calls as the prompt budget
+        allows. An email that could not be analysed gets an AIProcessingError as its result.
+        """
+        results = [self._or_error(self._try_fast_path, email_data) for email_data in emails]
+        
+        # Only emails the rules couldn't handle go to the model
+        remaining = [i for i, result in enumerate(results) if result is None]
+        if not remaining:
+            return results
+        if not self.model:
+            for i in remaining:
+                results[i] = AIProcessingError("No AI model configured")
+            return results
+        
+        self._count_extraction('llm', len(remaining))
+        llm_results = []
+        for batch in self._split_batches([emails[i] for i in remaining]):
+            llm_results.extend(self._process_batch(batch))
+        
+        for i, result in zip(remaining, llm_results):
+            results[i] = result
+        return results
+    
+    def _try_fast_path(self, email_data):
+        """Run rule-based extraction; returns the tracker result if the LLM can be skipped"""
+        extracted_data = self.rule_extractor.extract(email_data)
+        if not self.rule_extractor.is_sufficient(extracted_data, email_data):
+            return None
+        
+        self._count_extraction('fast_path')
+        return self._update_trackers(extracted_data, email_data) or extracted_data
+    
+    def _count_extraction(self, method, count=1):
+        self.extraction_stats['emails'] += count
+        self.extraction_stats[method] += count
+    
+    def get_extraction_stats(self):
+        """Share of emails handled by the rule-based fast path, plus prompt-size metrics"""
+        stats = dict(self.extraction_stats)
+        stats['fast_path_share'] = round(stats['fast_path'] / stats['emails'], 3) if stats['emails'] else None
+        stats['commands'] = dict(self.command_stats)
+        stats['prompts'] = self.prompt_builder.get_stats()
+        return stats
+    
+    def _split_batches(self, emails):
+        """Group emails so each batched prompt stays within the size budget"""
+        batches = []
+        current = []
+        current_size = 0
+        
+        for email_data in emails:
+            size = len(self._format_email(email_data))
+            if current and (current_size + size > self.batch_prompt_budget or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current = []
+                current_size = 0
+            current.append(email_data)
+            current_size += size
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _process_batch(self, emails):
+        """Extract a batch of emails in one call, falling back to single calls for bad items"""
+        if len(emails) == 1:
+            return [self._or_error(self._process_single, emails[0])]
+        
+        messages = ""
+        for i, email_data in enumerate(emails):
+            messages += f"""
+        --- Email {i} ---{self._format_email(email_data)}"""
+        
+        prompt = f"""
+        Analyze each of these {len(emails)} independent recruitment emails and extract relevant information.
+        {messages}
+        {EXTRACTION_INSTRUCTIONS}
+        Return a JSON array with exactly one object per email. Each object must include an "index" field
+        with the email number shown above, plus the extracted fields for that email only.
+        """
+        
+        try:
+            items = self._generate_json(prompt, parse=self._parse_ai_array)
+        except Exception as e:
+            print(f"AI batch processing error: {e}")
+            items = []
+        
+        extracted = {}
+        for item in items:
+            index = self._validate_batch_item(item, len(emails))
+            if index is not None and index not in extracted:
+                extracted[index] = item
+        
+        results = []
+        for i, email_data in enumerate(emails):
+            if i in extracted:
+                extracted_data = {k: v for k, v in extracted[i].items() if k != 'index'}
+                results.append(self._or_error(self._update_trackers, extracted_data, email_data))
+            else:
+                # Missing or malformed in the batch response
+                results.append(self._or_error(self._process_single, email_data))
+        return results
+    
+    def _or_error(self, method, *args):
+        """Call a per-email step for a batch, returning its AIProcessingError instead of raising it"""
+        try:
+            return method(*args)
+        except AIProcessingError as e:
+            return e
+    
+    def _validate_batch_item(self, item, batch_size):
+        """Return the message index of a valid batch element, or None"""
+        if not isinstance(item, dict):
+            return None
+        try:
+            index = int(item.get('index'))
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= index < batch_size:
+            return None
+        for field in EXTRACTION_FIELDS:
+            value = item.get(field)
+            if value is not None and not isinstance(value, (str, int, float, list)):
+                return None
+        return index
+    
+    def _format_email(self, email_data):
+        """Format one email for inclusion in a prompt"""
+        return f"""
+        Date: {email_data.get('received_time') or ''}
+        Subject: {email_data['subject']}
+        From: {email_data['sender_name']} ({email_data['sender']})
+        Body: {self.prompt_builder.body_for_prompt(email_data.get('body'), forwarded=is_forward(email_data['subject']))}
+        Attachments: {', '.join([att['filename'] for att in email_data.get('attachments', [])])}
+        """
+    
+    def process_command(self, command):
+        """Process natural language command"""
+        # Frequent command shapes are parsed locally in milliseconds
+        parsed_command = self.intent_parser.parse(command)
+        if parsed_command:
+            self.command_stats['local'] += 1
+            return self._execute_command(parsed_command)
+        
+        if not self.model:
+            return {"error": "AI not initialized", "response": "Please configure AI API key first."}
+        
+        try:
+            # Only the parse is cached; the command itself always executes
+            parsed_command = self._parse_command_with_ai(command)
+            
+            # Execute command
+            result = self._execute_command(parsed_command)
+            
+            return result
+        except Exception as e:
+            return {"error": str(e), "response": "Failed to process command."}
+    
+    def stream_command(self, command, page_size=100):
+        """
+        Process a command as a sequence of (event, data) pairs: the parsed intent first,
+        then progress, then the result, with search rows sent in pages
+        """
+        yield 'progress', {'stage': 'parsing'}
+        
+        parsed_command = self.intent_parser.parse(command)
+        source = 'local'
+        if parsed_command:
+            self.command_stats['local'] += 1
+        elif not self.model:
+            yield 'error', {"error": "AI not initialized", "response": "Please configure AI API key first."}
+            return
+        else:
+            source = 'llm'
+            try:
+                parsed_command = self._parse_command_with_ai(command)
+            except Exception as e:
+                yield 'error', {"error": str(e), "response": "Failed to process command."}
+                return
+        
+        yield 'intent', {'action': parsed_command.get('action'), 'parameters': parsed_command.get('parameters', {}), 'source': source}
+        
+        action = (parsed_command.get('action') or '').lower()
+        if not (('search' in action or 'show' in action) and self.excel_manager):
+            yield 'progress', {'stage': 'executing'}
+            yield 'result', self._execute_command(parsed_command)
+            yield 'done', {}
+            return
+        
+        yield 'progress', {'stage': 'searching'}
+        try:
+            search_type, results = self._run_search(parsed_command.get('parameters', {}))
+        except Exception as e:
+            yield 'error', {"error": str(e), "response": "Failed to execute command."}
+            return
+        
+        yield 'result', {'response': self._format_search(search_type, results), 'total': len(results)}
+        
+        # Rows follow in pages so the client can render while the rest is serialised
+        for start in range(0, len(results), page_size):
+            page = results.iloc[start:start + page_size]
+            rows = page.astype(object).where(page.notna(), None).to_dict('records')
+            yield 'rows', {'offset': start, 'rows': rows}
+        
+        yield 'done', {'total': len(results)}
+    
+    def _parse_command_with_ai(self, command, today=None):
+        """Parse a command with the LLM into {'action', 'parameters'}"""
+        # The date is part of the prompt, and so of the cache key: a cached parse of
+        # "tomorrow" or "Monday" is only replayed on the day it was made
+        today = today or datetime.now().date()
+        prompt = f"""
+        Parse this recruitment system command and extract the action and parameters:
+        
+        Command: {command}
+        Today's date: {today.isoformat()} ({today.strftime('%A')}). Resolve relative dates such as today, tomorrow or a weekday against it.
+        
+        Possible actions:
+        1. Add/Log candidate(s) - Extract: candidate names, job ID, CV source, email, mobile, location, etc.
+        2. Update CV/candidate status - Extract: CV ID, new status, dates, comments
+        3. Add hiring manager - Extract: name, email, project
+        4. Add project - Extract: project name
+        5. Search/Show data - Extract: search criteria, filters
+        6. Send email - Extract: recipient, subject, content
+        7. Schedule interview - Extract: candidate, date, time, interviewer
+        8. Update feedback - Extract: candidate, feedback, decision
+        
+        Return as JSON with 'action' and 'parameters' fields.
+        For candidates, use array format in parameters.candidates
+        """
+        
+        parsed_command = self._generate_json(prompt)
+        self.command_stats['llm'] += 1
+        return parsed_command
+    
+    def _generate_json(self, prompt, parse=None):
+        """Call the model (or the response cache) and parse the JSON result"""
+        parse = parse or self._parse_ai_response
+        key = self.cache.make_key(self.model_name, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return parse(cached)
+        
+        self.prompt_builder.record_prompt(prompt)
+        with metrics.timer('llm', 'generate'):
+            response_text = self.client.generate(prompt)
+        parsed = parse(response_text)
+        
+        # Don't cache responses we couldn't use
+        if parsed:
+            self.cache.put(key, self.model_name, response_text)
+        
+        return parsed
+    
+    def _parse_ai_response(self, response_text):
+        """Parse AI response to extract JSON"""
+        try:
+            # Try to extract JSON from response
+            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            if json_match:
+                return json.loads(json_match.group())
+            else:
+                # Try to parse the entire response
+                return json.loads(response_text)
+        except:
+            # Return empty dict if parsing fails
+            return {}
+    
+    def _parse_ai_array(self, response_text):
+        """Parse AI response to extract a JSON array"""
+        try:
+            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+            parsed = json.loads(json_match.group() if json_match else response_text)
+            return parsed if isinstance(parsed, list) else []
+        except:
+            return []
+    
+    def _update_trackers(self, extracted_data, email_data):
+        """
+        Update Excel trackers based on extracted data, writing each tracker at most once.
+        Raises AIProcessingError if the update fails, so the email is retried rather than lost.
+        """
+        if not self.excel_manager:
+            return None
+        
+        actions = []
+        
+        try:
+            # One read and one atomic write per tracker; nothing is saved if any step fails
+            with self.excel_manager.transaction() as tx:
+                self._apply_tracker_updates(tx, extracted_data, actions)
+        except Exception as e:
+            print(f"Error updating trackers: {e}")
+            raise AIProcessingError(f"Tracker update failed: {e}") from e
+        
+        if actions:
+            extracted_data['action_taken'] = "; ".join(actions)
+            extracted_data['tracker_changes'] = tx.changes
+        
+        return extracted_data
+    
+    def _apply_tracker_updates(self, tx, extracted_data, actions):
+        """Stage all tracker changes implied by the extracted data on a transaction"""
+        # Check if it's a CV submission
+        if extracted_data.get('candidate_name') and extracted_data.get('position'):
+            cv_data = {
+                'Candidate Name': extracted_data['candidate_name'],
+                'Position': extracted_data['position'],
+                'CV Source': extracted_data.get('cv_source', 'Email'),
+                'Date CV Shared': datetime.now().date(),
+                'Email': extracted_data.get('email', ''),
+                'Mobile': extracted_data.get('mobile', ''),
+                'Current Location': extracted_data.get('current_location', ''),
+                'Notice Period': extracted_data.get('notice_period', ''),
+                'Nationality': extracted_data.get('nationality', ''),
+                'Application Status': 'CV Shared'
+            }
+            
+            # Add project if specified
+            if extracted_data.get('project_name'):
+                cv_data['Project'] = extracted_data['project_name']
+            
+            # Try to find matching JobID
+            if extracted_data.get('job_id'):
+                cv_data['JobID'] = extracted_data['job_id']
+            else:
+                # Find the matching job
+                match = self.entity_resolver.resolve_job(
+                    extracted_data['position'], extracted_data.get('project_name'), tx=tx
+                )
+                self._note_ambiguity(extracted_data, 'job', extracted_data['position'], match)
+                if match['id']:
+                    cv_data['JobID'] = match['id']
+                    # Get project from job if not already set
+                    if not cv_data.get('Project'):
+                        job = tx.find_jobs({'JobID': match['id']})
+                        cv_data['Project'] = job.iloc[0].get('Project Name', '')
+            
+            if cv_data.get('JobID'):
+                cv_id, message = tx.add_cv(cv_data)
+                if cv_id:
+                    actions.append(f"Added CV for {extracted_data['candidate_name']} (ID: {cv_id})")
+        
+        # Check if it's interview scheduling
+        if extracted_data.get('interview_date') and extracted_data.get('candidate_name'):
+            # Find CV record
+            cv_id = self._resolve_candidate(tx, extracted_data)
+            if cv_id:
+                # Parse interview date
+                try:
+                    interview_datetime = parser.parse(extracted_data['interview_date'])
+                    if extracted_data.get('interview_time'):
+                        # Combine date and time if separate
+                        time_str = extracted_data['interview_time']
+                        interview_datetime = parser.parse(f"{extracted_data['interview_date']} {time_str}")
+                except:
+                    interview_datetime = extracted_data['interview_date']
+                
+                updates = {
+                    'Interview Date': interview_datetime,
+                    'Application Status': 'Interview Scheduled'
+                }
+                
+                if extracted_data.get('interview_location'):
+                    updates['Remarks'] = f"Interview Location: {extracted_data['interview_location']}"
+                
+                success, message = tx.update_cv(cv_id, updates)
+                if success:
+                    actions.append(f"Updated interview schedule for {extracted_data['candidate_name']}")
+        
+        # Check if it's feedback or interview results
+        if (extracted_data.get('feedback') or extracted_data.get('interview_result')) and extracted_data.get('candidate_name'):
+            cv_id = self._resolve_candidate(tx, extracted_data)
+            if cv_id:
+                updates = {}
+                
+                if extracted_data.get('feedback'):
+                    updates['HM Feedback'] = extracted_data['feedback']
+                    updates['HM Feedback Date'] = datetime.now().date()
+                    
+                    # Add to comments if long feedback
+                    if len(extracted_data['feedback']) > 100:
+                        updates['HM Comments'] = extracted_data['feedback']
+                        updates['HM Feedback'] = extracted_data['feedback'][:100] + "..."
+                
+                if extracted_data.get('interview_result'):
+                    updates['Interview Results'] = extracted_data['interview_result']
+                    updates['Date Interview Result'] = datetime.now().date()
+                    
+                    # Update status based on result
+                    result_lower = extracted_data['interview_result'].lower()
+                    if any(word in result_lower for word in ['pass', 'selected', 'yes', 'approved']):
+                        updates['Application Status'] = 'Interview Passed'
+                    elif any(word in result_lower for word in ['fail', 'reject', 'no']):
+                        updates['Application Status'] = 'Rejected'
+                
+                success, message = tx.update_cv(cv_id, updates)
+                if success:
+                    actions.append(f"Updated feedback for {extracted_data['candidate_name']}")
+        
+        # Check if it's an offer
+        if extracted_data.get('offer_details') and extracted_data.get('candidate_name'):
+            cv_id = self._resolve_candidate(tx, extracted_data)
+            if cv_id:
+                updates = {
+                    'Application Status': 'Offer Extended',
+                    'Date Offer Issued': datetime.now().date(),
+                    'Offer Status': 'Pending'
+                }
+                
+                # Extract salary if mentioned
+                salary_match = re.search(r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:AED|USD|GBP|EUR)?', extracted_data['offer_details'])
+                if salary_match:
+                    updates['Package'] = salary_match.group(1).replace(',', '')
+                
+                success, message = tx.update_cv(cv_id, updates)
+                if success:
+                    actions.append(f"Updated offer details for {extracted_data['candidate_name']}")
+    
+    def _resolve_candidate(self, tx, extracted_data):
+        """CVID of the candidate the email refers to, or None if there's no confident, unique match"""
+        # A CV this email has just added is the one its interview, feedback or offer refers to,
+        # even if an older row has the same name
+        added = [c['id'] for c in tx.changes if c['tracker'] == 'cv' and c.get('action') == 'added']
+        if len(added) == 1:
+            return added[0]
+        
+        match = self.entity_resolver.resolve_cv(
+            name=extracted_data['candidate_name'],
+            email=extracted_data.get('email'),
+            phone=extracted_data.get('mobile'),
+            position=extracted_data.get('position'),
+            tx=tx
+        )
+        self._note_ambiguity(extracted_data, 'cv', extracted_data['candidate_name'], match)
+        return match['id']
+    
+    def _note_ambiguity(self, extracted_data, kind, query, match):
+        """Report ambiguous matches instead of updating whichever row comes first"""
+        if not match['ambiguous']:
+            return
+        ids = ", ".join(str(c['id']) for c in match['candidates'])
+        print(f"Ambiguous {kind} match for '{query}': {ids} - skipped")
+        extracted_data.setdefault('ambiguous_matches', []).append({
+            'type': kind, 'query': query, 'candidates': match['candidates']
+        })
+    
+    def _execute_command(self, parsed_command):
+        """Execute parsed command"""
+        action = parsed_command.get('action', '').lower()
+        params = parsed_command.get('parameters', {})
+        
+        try:
+            if 'add' in action and 'candidate' in action:
+                return self._add_candidates(params)
+            elif 'update' in action:
+                return self._update_status(params)
+            elif 'add' in action and 'manager' in action:
+                return self._add_hiring_manager(params)
+            elif 'add' in action and 'project' in action:
+                return self._add_project(params)
+            elif 'search' in action or 'show' in action:
+                return self._search_data(params)
+            elif 'schedule' in action and 'interview' in action:
+                return self._schedule_interview(params)
+            else:
+                return {"response": "Command understood but not yet implemented."}
+                
+        except Exception as e:
+            return {"error": str(e), "response": "Failed to execute command."}
+    
+    def _add_candidates(self, params):
+        """Add candidates to CV tracker"""
+        if not self.excel_manager:
+            return {"error": "Excel manager not available"}
+        
+        candidates = params.get('candidates', [])
+        job_id = params.get('job_id')
+        
+        # Handle single candidate as well
+        if not candidates and params.get('name'):
+            candidates = [{
+                'name': params.get('name'),
+                'email': params.get('email'),
+                'source': params.get('source', 'Direct')
+            }]
+        
+        if not candidates:
+            return {"response": "No candidates found in command."}
+        
+        results = []
+        for candidate in candidates:
+            cv_data = {
+                'JobID': job_id,
+                'Candidate Name': candidate.get('name'),
+                'CV Source': candidate.get('source', 'Direct'),
+                'Email': candidate.get('email', ''),
+                'Mobile': candidate.get('mobile', ''),
+                'Current Location': candidate.get('location', ''),
+                'Application Status': 'CV Shared',
+                'Date CV Shared': datetime.now().date()
+            }
+            
+            cv_id, message = self.excel_manager.add_cv(cv_data)
+            if cv_id:
+                results.append(f"✓ Added {candidate.get('name')} (ID: {cv_id})")
+            else:
+                results.append(f"✗ Failed to add {candidate.get('name')}: {message}")
+        
+        return {"response": "\n".join(results)}
+    
+    def _update_status(self, params):
+        """Update CV status"""
+        if not self.excel_manager:
+            return {"error": "Excel manager not available"}
+        
+        cv_id = params.get('cv_id')
+        updates = params.get('updates', {})
+        
+        # Map common status updates
+        if params.get('status'):
+            updates['Application Status'] = params['status']
+        if params.get('interview_date'):
+            updates['Interview Date'] = params['interview_date']
+        if params.get('feedback'):
+            updates['HM Feedback'] = params['feedback']
+            updates['HM Feedback Date'] = datetime.now().date()
+        
+        if not cv_id:
+            return {"response": "CV ID not specified."}
+        
+        success, message = self.excel_manager.update_cv(cv_id, updates)
+        
+        return {"response": message}
+    
+    def _schedule_interview(self, params):
+        """Schedule interview for candidate"""
+        if not self.excel_manager:
+            return {"error": "Excel manager not available"}
+        
+        candidate_name = params.get('candidate')
+        cv_id = params.get('cv_id')
+        interview_date = params.get('date')
+        interview_time = params.get('time')
+        interviewer = params.get('interviewer')
+        
+        if not candidate_name and not cv_id:
+            return {"response": "Candidate name not specified."}
+        
+        if not cv_id:
+            # Find candidate
+            match = self.entity_resolver.resolve_cv(name=candidate_name)
+            
+            if match['ambiguous']:
+                options = ", ".join(f"{c['name']} ({c['id']})" for c in match['candidates'])
+                return {"response": f"Several candidates match {candidate_name}: {options}. Please specify the CV ID."}
+            
+            if not match['id'] and match['candidates']:
+                # A partial name such as "Ali" scores below the threshold; offer the closest
+                options = ", ".join(f"{c['name']} ({c['id']})" for c in match['candidates'][:3])
+                return {"response": f"No exact match for {candidate_name}. Did you mean: {options}? Please specify the CV ID."}
+            
+            if not match['id']:
+                return {"response": f"Candidate {candidate_name} not found."}
+            
+            cv_id = match['id']
+        
+        candidate_name = candidate_name or cv_id
+        
+        # Combine date and time
+        interview_datetime = interview_date
+        if interview_time:
+            interview_datetime = f"{interview_date} {interview_time}"
+        
+        updates = {
+            'Interview Date': interview_datetime,
+            'Application Status': 'Interview Scheduled'
+        }
+        
+        if interviewer:
+            updates['Remarks'] = f"Interview with {interviewer}"
+        
+        success, message = self.excel_manager.update_cv(cv_id, updates)
+        
+        if success:
+            return {"response": f"Interview scheduled for {candidate_name} on {interview_datetime}"}
+        else:
+            return {"response": f"Failed to schedule interview: {message}"}
+    
+    def _add_hiring_manager(self, params):
+        """Add hiring manager"""
+        # This would integrate with the database module
+        return {"response": f"Hiring manager {params.get('name')} would be added with email {params.get('email')}."}
+    
+    def _add_project(self, params):
+        """Add project"""
+        # This would integrate with the database module
+        return {"response": f"Project {params.get('name')} would be added."}
+    
+    def _search_data(self, params):
+        """Search tracker data"""
+        if not self.excel_manager:
+            return {"error": "Excel manager not available"}
+        
+        search_type, results = self._run_search(params)
+        
+        if results.empty:
+            return {"response": "No results found."}
+        
+        return {"response": self._format_search(search_type, results), "data": results.to_dict('records')}
+    
+    def _run_search(self, params):
+        """Search the tracker named by params['type']; returns (search_type, results)"""
+        search_type = params.get('type', 'cv')
+        criteria = params.get('criteria', {})
+        
+        # Handle various search patterns
+        if search_type == 'job':
+            if params.get('project'):
+                criteria['Project Name'] = params['project']
+            if params.get('position'):
+                criteria['Job Title'] = params['position']
+            if params.get('status'):
+                criteria['Job Status'] = params['status']
+        else:
+            if params.get('project'):
+                criteria['Project'] = params['project']
+            if params.get('position'):
+                criteria['Position'] = params['position']
+            if params.get('status'):
+                criteria['Application Status'] = params['status']
+            if params.get('candidate'):
+                criteria['Candidate Name'] = params['candidate']
+        
+        if search_type == 'job':
+            results = self.excel_manager.search_jobs(criteria)
+        else:
+            results = self.excel_manager.search_cvs(criteria)
+        
+        return search_type, results
+    
+    def _format_search(self, search_type, results):
+        """Chat summary of search results (first 10 rows)"""
+        if results.empty:
+            return "No results found."
+        
+        response = f"Found {len(results)} results:\n\n"
+        for idx, row in results.head(10).iterrows():
+            if search_type == 'job':
+                response += f"• {row['JobID']}: {row['Job Title']} at {row['Project Name']} ({row['Job Status']})\n"
+            else:
+                response += f"• {row['CVID']}: {row['Candidate Name']} for {row['Position']} ({row['Application Status']})\n"
+                if row.get('Interview Date'):
+                    response += f"  Interview: {row['Interview Date']}\n"
+        
+        if len(results) > 10:
+            response += f"\n... and {len(results) - 10} more results"
+        
+        return response
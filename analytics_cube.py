@@ -0,0 +1,274 @@
+"""
+Materialised Recruitment Analytics Cube (Funnel, Time-to-Hire, Offer Acceptance)
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Query name -> column of the per-CV fact table
+DIMENSIONS = {
+    'project': 'project',
+    'hiring_manager': 'hiring_manager',
+    'location': 'location',
+    'month': 'month',
+}
+DIMENSION_COLUMNS = list(DIMENSIONS.values())
+MEASURES = ['cvs', 'interviews', 'offers', 'hires', 'offers_decided', 'offers_accepted',
+            'time_to_hire_days', 'time_to_hire_count']
+
+INTERVIEW_STATUSES = ['Interview Scheduled', 'Interview Passed', 'Offer Extended', 'Hired']
+OFFER_STATUSES = ['Offer Extended', 'Hired']
+ACCEPTED_OFFERS = ['accepted']
+DECLINED_OFFERS = ['rejected', 'declined']
+UNKNOWN = 'Unknown'
+
+
+def _column(df, name):
+    """Column of a tracker frame, or an empty column if the sheet doesn't have it"""
+    return df[name] if name in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+
+
+def _text(series):
+    return series.astype(object).where(series.notna(), '').astype(str).str.strip()
+
+
+def compute_facts(cvs, jobs):
+    """One row of dimensions and funnel measures per CVID, computed column-wise"""
+    if cvs.empty or 'CVID' not in cvs.columns:
+        return pd.DataFrame(columns=DIMENSION_COLUMNS + MEASURES, index=pd.Index([], name='cvid'))
+
+    cvs = cvs.drop_duplicates('CVID', keep='last')
+    job_ids = _column(cvs, 'JobID')
+    if not jobs.empty and 'JobID' in jobs.columns:
+        jobs = jobs.drop_duplicates('JobID', keep='last').set_index('JobID')
+    else:
+        jobs = pd.DataFrame(index=pd.Index([], name='JobID'))
+
+    def from_job(cv_column, job_column):
+        # The CV's own value wins; the job fills the gaps
+        value = _text(_column(cvs, cv_column)) if cv_column else pd.Series('', index=cvs.index)
+        if job_column in jobs.columns:
+            value = value.where(value != '', _text(job_ids.map(jobs[job_column])))
+        return value.replace('', UNKNOWN)
+
+    shared = pd.to_datetime(_column(cvs, 'Date CV Shared'), errors='coerce')
+    interview_date = pd.to_datetime(_column(cvs, 'Interview Date'), errors='coerce')
+    offer_date = pd.to_datetime(_column(cvs, 'Date Offer Issued'), errors='coerce')
+    onboard = pd.to_datetime(_column(cvs, 'Date Onboard'), errors='coerce')
+    status = _text(_column(cvs, 'Application Status'))
+    offer_status = _text(_column(cvs, 'Offer Status')).str.lower()
+
+    # A later funnel stage implies the earlier ones
+    hired = onboard.notna() | (status == 'Hired')
+    offered = offer_date.notna() | status.isin(OFFER_STATUSES) | (offer_status != '') | hired
+    interviewed = interview_date.notna() | status.isin(INTERVIEW_STATUSES) | offered
+    accepted = offer_status.isin(ACCEPTED_OFFERS) | hired
+    decided = accepted | offer_status.isin(DECLINED_OFFERS)
+    days = (onboard - shared).dt.days.where(hired & onboard.notna() & shared.notna())
+
+    facts = pd.DataFrame({
+        'project': from_job('Project', 'Project Name'),
+        'hiring_manager': from_job('Hiring Manager', 'Hiring Manager'),
+        'location': from_job(None, 'Job Location (Country)'),
+        'month': shared.dt.strftime('%Y-%m').fillna(UNKNOWN),
+        'cvs': 1,
+        'interviews': interviewed.astype(int),
+        'offers': offered.astype(int),
+        'hires': hired.astype(int),
+        'offers_decided': decided.astype(int),
+        'offers_accepted': accepted.astype(int),
+        'time_to_hire_days': days.fillna(0).astype(float),
+        'time_to_hire_count': days.notna().astype(int),
+    })
+    facts.index = _text(cvs['CVID']).rename('cvid')
+    return facts
+
+
+def aggregate(facts):
+    """Sum measures over the finest grain of all dimensions"""
+    if facts.empty:
+        return typed(pd.DataFrame(columns=DIMENSION_COLUMNS + MEASURES))
+    return typed(facts.groupby(DIMENSION_COLUMNS, as_index=False)[MEASURES].sum())
+
+
+def typed(frame):
+    """Counts as integers and day totals as floats, whatever the frame went through"""
+    frame = frame.copy()
+    frame[DIMENSION_COLUMNS] = frame[DIMENSION_COLUMNS].astype(str)
+    counts = [measure for measure in MEASURES if measure != 'time_to_hire_days']
+    frame[counts] = frame[counts].fillna(0).astype('int64')
+    frame['time_to_hire_days'] = frame['time_to_hire_days'].fillna(0).astype(float)
+    return frame
+
+
+class AnalyticsCube:
+    """
+    Funnel aggregates per project, hiring manager, location and month, kept in memory
+    and in SQLite. Refreshes diff per-CV facts against the stored ones and apply only
+    the changed rows to the cube.
+    """
+
+    def __init__(self, excel_manager, db_path="data/analytics.db"):
+        self.excel_manager = excel_manager
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.facts = None
+        self.cube = None
+        self.stamps = None
+        self.stats = {'full_rebuilds': 0, 'incremental_refreshes': 0, 'rows_changed': 0}
+        self._lock = threading.Lock()
+        self.init_database()
+        self._load()
+        excel_manager.commit_listeners.append(self.apply_transaction)
+
+    def get_connection(self):
+        """Get database connection"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        """Initialize metadata table (fact and cube tables are written by pandas)"""
+        conn = self.get_connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS analytics_meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+        conn.close()
+
+    def _load(self):
+        """Restore the materialised facts and cube"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT value FROM analytics_meta WHERE key = 'stamps'").fetchone()
+            if not row:
+                return
+            self.facts = typed(pd.read_sql("SELECT * FROM cv_facts", conn, index_col='cvid'))
+            self.cube = typed(pd.read_sql("SELECT * FROM analytics_cube", conn))
+            self.stamps = [tuple(stamp) if stamp else None for stamp in json.loads(row[0])]
+        except (sqlite3.Error, pd.errors.DatabaseError, ValueError) as e:
+            print(f"Analytics cube not loaded, will rebuild: {e}")
+            self.facts = self.cube = self.stamps = None
+        finally:
+            conn.close()
+
+    def _save(self, changed_ids=None, removed_ids=()):
+        """Persist changed fact rows (all rows when changed_ids is None), the cube and the stamps"""
+        conn = self.get_connection()
+        try:
+            if changed_ids is None:
+                self.facts.to_sql('cv_facts', conn, if_exists='replace', index=True, index_label='cvid')
+            else:
+                stale = list(changed_ids) + list(removed_ids)
+                for start in range(0, len(stale), 500):
+                    chunk = stale[start:start + 500]
+                    conn.execute(f"DELETE FROM cv_facts WHERE cvid IN ({','.join('?' * len(chunk))})", chunk)
+                self.facts.loc[list(changed_ids)].to_sql('cv_facts', conn, if_exists='append', index=True, index_label='cvid')
+            self.cube.to_sql('analytics_cube', conn, if_exists='replace', index=False)
+            conn.execute("INSERT OR REPLACE INTO analytics_meta (key, value) VALUES ('stamps', ?)",
+                         (json.dumps(self.stamps),))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def apply_transaction(self, tx):
+        """Refresh from a committed transaction's in-memory frames"""
+        with self._lock:
+            self._refresh(tx.cvs, tx.jobs)
+
+    def refresh(self, full=False):
+        """Bring the cube up to date with the tracker files"""
+        with self._lock:
+            if full:
+                self.facts = self.cube = None
+            if full or self.stamps != list(self.excel_manager.tracker_version()):
+                self._refresh(self.excel_manager.read_cv_tracker(), self.excel_manager.read_master_tracker())
+
+    def _refresh(self, cvs, jobs):
+        stamps = list(self.excel_manager.tracker_version())
+        facts = compute_facts(cvs, jobs)
+
+        if self.facts is None:
+            self.facts = facts
+            self.cube = aggregate(facts)
+            self.stamps = stamps
+            self.stats['full_rebuilds'] += 1
+            self._save()
+            return
+
+        # Rows whose facts differ from the materialised ones
+        old = self.facts.reindex(columns=DIMENSION_COLUMNS + MEASURES)
+        common = facts.index.intersection(old.index)
+        new_hashes = pd.util.hash_pandas_object(facts.loc[common].astype(str), index=True)
+        old_hashes = pd.util.hash_pandas_object(old.loc[common].astype(str), index=True)
+        changed = common[new_hashes.to_numpy() != old_hashes.to_numpy()]
+        added = facts.index.difference(old.index)
+        removed = old.index.difference(facts.index)
+
+        if len(changed) or len(added) or len(removed):
+            retracted = old.loc[changed.union(removed)].copy()
+            retracted[MEASURES] = -retracted[MEASURES]
+            delta = pd.concat([retracted, facts.loc[changed.union(added)]])
+            cube = pd.concat([self.cube, aggregate(delta)])
+            cube = typed(cube.groupby(DIMENSION_COLUMNS, as_index=False)[MEASURES].sum())
+            self.cube = cube[cube['cvs'] > 0].reset_index(drop=True)
+            self.facts = facts
+            self.stats['rows_changed'] += len(changed) + len(added) + len(removed)
+
+        self.stamps = stamps
+        self.stats['incremental_refreshes'] += 1
+        self._save(changed_ids=changed.union(added), removed_ids=removed)
+
+    def query(self, by=(), filters=None):
+        """
+        Roll the cube up to the given dimensions, e.g. by=['project', 'month'], with
+        optional exact-match filters on dimensions. Returns a DataFrame of summed measures.
+        """
+        self.refresh()
+        unknown = [name for name in list(by) + list(filters or {}) if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(unknown)}")
+
+        with self._lock:
+            cube = self.cube
+        for name, value in (filters or {}).items():
+            cube = cube[cube[DIMENSIONS[name]] == value]
+
+        columns = [DIMENSIONS[name] for name in by]
+        if columns:
+            return cube.groupby(columns, as_index=False)[MEASURES].sum()
+        return pd.DataFrame({measure: [cube[measure].sum()] for measure in MEASURES})
+
+    def funnel(self, by=(), filters=None):
+        """CV Shared -> Interview -> Offer -> Hired counts and stage conversion rates"""
+        result = self.query(by, filters)
+        result['interview_rate'] = _rate(result['interviews'], result['cvs'])
+        result['offer_rate'] = _rate(result['offers'], result['interviews'])
+        result['hire_rate'] = _rate(result['hires'], result['offers'])
+        result['overall_conversion'] = _rate(result['hires'], result['cvs'])
+        return _records(result, list(by) + ['cvs', 'interviews', 'offers', 'hires', 'interview_rate',
+                                             'offer_rate', 'hire_rate', 'overall_conversion'])
+
+    def time_to_hire(self, by=(), filters=None):
+        """Average days from CV shared to onboarding"""
+        result = self.query(by, filters)
+        result['avg_days'] = _rate(result['time_to_hire_days'], result['time_to_hire_count'], digits=1)
+        result = result.rename(columns={'time_to_hire_count': 'hires_with_dates'})
+        return _records(result, list(by) + ['hires_with_dates', 'avg_days'])
+
+    def offer_acceptance(self, by=(), filters=None):
+        """Accepted share of decided offers"""
+        result = self.query(by, filters)
+        result['acceptance_rate'] = _rate(result['offers_accepted'], result['offers_decided'])
+        return _records(result, list(by) + ['offers', 'offers_decided', 'offers_accepted', 'acceptance_rate'])
+
+
+def _rate(numerator, denominator, digits=3):
+    numerator = numerator.astype(float)
+    denominator = denominator.astype(float)
+    rate = (numerator / denominator.where(denominator > 0)).round(digits)
+    return rate.astype(object).where(rate.notna(), None)
+
+
+def _records(result, columns):
+    result = result.rename(columns={column: name for name, column in DIMENSIONS.items()})
+    return result[columns].to_dict('records')
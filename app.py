@@ -1,320 +1,655 @@
-"""
-Flask Application for Recruitment Tracker System
-"""
-from flask import Flask, render_template, jsonify, request, send_file
-from flask_cors import CORS
-import json
-import pandas as pd
-from datetime import datetime
-import os
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-from database import Database
-from excel_manager import ExcelManager
-from email_monitor import EmailMonitor
-from ai_processor import AIProcessor
-
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app)
-
-
-
-# Initialize components
-db = Database()
-excel_manager = ExcelManager()
-ai_processor = AIProcessor(excel_manager=excel_manager)
-email_monitor = EmailMonitor(ai_processor=ai_processor)
-
-# Routes
-@app.route('/')
-def index():
-    """Serve main page"""
-    return render_template('index.html')
-
-@app.route('/api/system/status')
-def system_status():
-    """Get system status"""
-    return jsonify({
-        'email_monitoring': email_monitor.monitoring,
-        'ai_configured': ai_processor.model is not None,
-        'pending_emails': email_monitor.email_queue.qsize(),
-        'recent_activities': email_monitor.get_activities()[-5:]  # Last 5 activities
-    })
-
-@app.route('/api/system/start_monitoring', methods=['POST'])
-def start_monitoring():
-    """Start email monitoring"""
-    success = email_monitor.start_monitoring()
-    return jsonify({'success': success})
-
-@app.route('/api/system/stop_monitoring', methods=['POST'])
-def stop_monitoring():
-    """Stop email monitoring"""
-    success = email_monitor.stop_monitoring()
-    return jsonify({'success': success})
-
-@app.route('/api/email/activities')
-def get_email_activities():
-    """Get recent email monitoring activities"""
-    activities = email_monitor.get_activities()
-    return jsonify(activities)
-
-@app.route('/api/config/ai_key', methods=['POST'])
-def set_ai_key():
-    """Set AI API key"""
-    data = request.json
-    api_key = data.get('api_key')
-    
-    if api_key:
-        # Save to database
-        db.set_config('ai_api_key', api_key, encrypt=True)
-        
-        # Initialize AI
-        success = ai_processor.initialize_ai(api_key)
-        
-        return jsonify({'success': success})
-    
-    return jsonify({'success': False, 'error': 'No API key provided'})
-
-@app.route('/api/hiring_managers', methods=['GET', 'POST'])
-def hiring_managers():
-    """Handle hiring managers"""
-    if request.method == 'POST':
-        data = request.json
-        hm_id = db.add_hiring_manager(data['name'], data['email'])
-        return jsonify({'success': hm_id is not None, 'id': hm_id})
-    else:
-        hms = db.get_hiring_managers()
-        return jsonify([{
-            'id': hm[0],
-            'name': hm[1],
-            'email': hm[2]
-        } for hm in hms])
-
-@app.route('/api/projects', methods=['GET', 'POST'])
-def projects():
-    """Handle projects"""
-    if request.method == 'POST':
-        data = request.json
-        
-        if isinstance(data, list):
-            # Bulk add
-            results = []
-            for project_name in data:
-                project_id = db.add_project(project_name)
-                results.append({'name': project_name, 'id': project_id})
-            return jsonify({'success': True, 'results': results})
-        else:
-            # Single add
-            project_id = db.add_project(data['name'])
-            return jsonify({'success': project_id is not None, 'id': project_id})
-    else:
-        projects = db.get_projects()
-        return jsonify([{
-            'id': proj[0],
-            'name': proj[1]
-        } for proj in projects])
-
-@app.route('/api/jobs', methods=['GET', 'POST'])
-def jobs():
-    """Handle jobs"""
-    if request.method == 'POST':
-        data = request.json
-        
-        if isinstance(data, list):
-            # Bulk add
-            results = []
-            for job in data:
-                job_id, message = excel_manager.add_job(job)
-                results.append({
-                    'job': job.get('Job Title'),
-                    'id': job_id,
-                    'message': message
-                })
-            return jsonify({'success': True, 'results': results})
-        else:
-            # Single add
-            job_id, message = excel_manager.add_job(data)
-            return jsonify({
-                'success': job_id is not None,
-                'id': job_id,
-                'message': message
-            })
-    else:
-        df = excel_manager.read_master_tracker()
-        return jsonify(df.to_dict('records'))
-
-@app.route('/api/cvs', methods=['GET', 'POST'])
-def cvs():
-    """Handle CVs"""
-    if request.method == 'POST':
-        data = request.json
-        cv_id, message = excel_manager.add_cv(data)
-        return jsonify({
-            'success': cv_id is not None,
-            'id': cv_id,
-            'message': message
-        })
-    else:
-        df = excel_manager.read_cv_tracker()
-        # Convert datetime objects to strings
-        df = df.fillna('')
-        for col in df.columns:
-            if df[col].dtype == 'datetime64[ns]':
-                df[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
-        return jsonify(df.to_dict('records'))
-
-@app.route('/api/jobs/<job_id>', methods=['PUT'])
-def update_job(job_id):
-    """Update job"""
-    data = request.json
-    success, message = excel_manager.update_job(job_id, data)
-    return jsonify({'success': success, 'message': message})
-
-@app.route('/api/cvs/<cv_id>', methods=['PUT'])
-def update_cv(cv_id):
-    """Update CV"""
-    data = request.json
-    success, message = excel_manager.update_cv(cv_id, data)
-    return jsonify({'success': success, 'message': message})
-
-@app.route('/api/ai/command', methods=['POST'])
-def ai_command():
-    """Process AI command"""
-    data = request.json
-    command = data.get('command')
-    
-    if not command:
-        return jsonify({'error': 'No command provided'})
-    
-    result = ai_processor.process_command(command)
-    return jsonify(result)
-
-@app.route('/api/analytics/summary')
-def analytics_summary():
-    """Get analytics summary"""
-    jobs_df = excel_manager.read_master_tracker()
-    cvs_df = excel_manager.read_cv_tracker()
-    
-    summary = {
-        'total_jobs': len(jobs_df),
-        'open_jobs': len(jobs_df[jobs_df['Job Status'] == 'Open']) if not jobs_df.empty else 0,
-        'filled_jobs': len(jobs_df[jobs_df['Job Status'] == 'Filled']) if not jobs_df.empty else 0,
-        'total_cvs': len(cvs_df),
-        'interviews_scheduled': len(cvs_df[cvs_df['Application Status'] == 'Interview Scheduled']) if not cvs_df.empty else 0,
-        'offers_extended': len(cvs_df[cvs_df['Application Status'] == 'Offer Extended']) if not cvs_df.empty else 0,
-        'hired': len(cvs_df[cvs_df['Application Status'] == 'Hired']) if not cvs_df.empty else 0
-    }
-    
-    return jsonify(summary)
-
-@app.route('/api/candidates', methods=['GET', 'POST'])
-def candidates():
-    """Handle candidates"""
-    if request.method == 'POST':
-        data = request.json
-        candidate_id = db.add_candidate(
-            name=data['name'],
-            email=data.get('email', ''),
-            mobile=data.get('mobile', ''),
-            current_location=data.get('current_location', ''),
-            nationality=data.get('nationality', ''),
-            notice_period=data.get('notice_period', '')
-        )
-        return jsonify({'success': candidate_id is not None, 'id': candidate_id})
-    else:
-        candidates = db.get_candidates()
-        return jsonify([{
-            'id': c[0],
-            'name': c[1],
-            'email': c[2],
-            'mobile': c[3],
-            'current_location': c[4],
-            'nationality': c[5],
-            'notice_period': c[6]
-        } for c in candidates])
-
-@app.route('/api/candidates/bulk', methods=['POST'])
-def bulk_add_candidates():
-    """Bulk add candidates"""
-    candidates_data = request.json
-    results = []
-    
-    for candidate in candidates_data:
-        try:
-            candidate_id = db.add_candidate(
-                name=candidate['name'],
-                email=candidate.get('email', ''),
-                mobile=candidate.get('mobile', ''),
-                current_location=candidate.get('current_location', ''),
-                nationality=candidate.get('nationality', ''),
-                notice_period=candidate.get('notice_period', '')
-            )
-            results.append({
-                'name': candidate['name'],
-                'success': candidate_id is not None,
-                'id': candidate_id
-            })
-        except Exception as e:
-            results.append({
-                'name': candidate['name'],
-                'success': False,
-                'error': str(e)
-            })
-    
-    success_count = sum(1 for r in results if r['success'])
-    return jsonify({
-        'success': True,
-        'results': results,
-        'summary': {
-            'total': len(results),
-            'success': success_count,
-            'failed': len(results) - success_count
-        }
-    })
-
-@app.route('/api/export/<tracker_type>')
-def export_tracker(tracker_type):
-    """Export tracker data"""
-    if tracker_type == 'master':
-        # Get the absolute path to the Excel file
-        file_path = Path(excel_manager.master_path).absolute()
-        
-        # Check if file exists
-        if not file_path.exists():
-            return jsonify({'error': 'Master Tracker file not found. Please add some jobs first.'}), 404
-            
-        return send_file(
-            str(file_path),
-            as_attachment=True,
-            download_name=f'MasterTracker_{datetime.now().strftime("%Y%m%d")}.xlsx'
-        )
-    elif tracker_type == 'cv':
-        # Get the absolute path to the Excel file
-        file_path = Path(excel_manager.cv_path).absolute()
-        
-        # Check if file exists
-        if not file_path.exists():
-            return jsonify({'error': 'CV Tracker file not found. Please add some CVs first.'}), 404
-            
-        return send_file(
-            str(file_path),
-            as_attachment=True,
-            download_name=f'CVTracker_{datetime.now().strftime("%Y%m%d")}.xlsx'
-        )
-    else:
-        return jsonify({'error': 'Invalid tracker type'}), 400
-
-if __name__ == '__main__':
-    # Check if AI key exists
-    api_key = db.get_config('ai_api_key', decrypt=True)
-    if api_key:
-        ai_processor.initialize_ai(api_key)
-    
-    # Run Flask app
+"""
+Flask Application for Recruitment Tracker System
+"""
+from flask import Flask, render_template, jsonify, request, send_file, Response, stream_with_context
+from flask_cors import CORS
+from datetime import datetime
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import metrics
+from components import Components
+from json_response import FastJSONProvider, compress_response, dumps, etag_variants, loads
+from tracker_export import EXPORT_FORMATS
+
+# Initialize Flask app
+app = Flask(__name__)
+app.json = FastJSONProvider(app)
+CORS(app)
+# Installed before the compression hook, so request times include compressing
+metrics.install(app)
+
+# Responses smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+
+
+
+# Components are built on first use, so importing the app stays cheap; the modules
+# behind them (pandas, openpyxl, the LLM SDK, Outlook) load only when needed
+components = Components()
+
+@components.factory('db')
+def build_db():
+    from database import Database
+    return Database()
+
+@components.factory('excel_manager')
+def build_excel_manager():
+    from excel_manager import ExcelManager
+    # Counters and the analytics cube catch up from the file stamps when they are built later
+    return ExcelManager()
+
+@components.factory('ai_processor')
+def build_ai_processor():
+    from ai_processor import AIProcessor
+    return AIProcessor(excel_manager=components.get('excel_manager'))
+
+@components.factory('email_monitor')
+def build_email_monitor():
+    from email_monitor import EmailMonitor
+    return EmailMonitor(ai_processor=components.get('ai_processor'))
+
+@components.factory('backfill_runner')
+def build_backfill_runner():
+    from backfill import BackfillRunner
+    return BackfillRunner(components.get('email_monitor'))
+
+@components.factory('monitor_supervisor')
+def build_monitor_supervisor():
+    from leader_lease import MonitorSupervisor
+    return MonitorSupervisor(components.get('email_monitor'))  # Only the lease holder runs the monitor
+
+@components.factory('tracker_view')
+def build_tracker_view():
+    from tracker_view import TrackerView
+    return TrackerView(components.get('excel_manager'))
+
+@components.factory('tracker_exporter')
+def build_tracker_exporter():
+    from tracker_export import TrackerExporter
+    return TrackerExporter(components.get('tracker_view'))
+
+@components.factory('tracker_counters')
+def build_tracker_counters():
+    from tracker_counters import TrackerCounters
+    return TrackerCounters(components.get('excel_manager'))
+
+@components.factory('analytics_cube')
+def build_analytics_cube():
+    from analytics_cube import AnalyticsCube
+    return AnalyticsCube(components.get('excel_manager'))
+
+@components.factory('bulk_importer')
+def build_bulk_importer():
+    from bulk_import import BulkImporter
+    return BulkImporter(components.get('excel_manager'), components.get('db'))
+
+@components.factory('task_runner')
+def build_task_runner():
+    from task_runner import TaskRunner
+    return TaskRunner()
+
+db = components.proxy('db')
+excel_manager = components.proxy('excel_manager')
+ai_processor = components.proxy('ai_processor')
+email_monitor = components.proxy('email_monitor')
+backfill_runner = components.proxy('backfill_runner')
+monitor_supervisor = components.proxy('monitor_supervisor')
+tracker_view = components.proxy('tracker_view')
+tracker_exporter = components.proxy('tracker_exporter')
+tracker_counters = components.proxy('tracker_counters')
+analytics_cube = components.proxy('analytics_cube')
+task_runner = components.proxy('task_runner')
+bulk_importer = components.proxy('bulk_importer')
+
+@app.after_request
+def compress(response):
+    """Gzip/brotli large JSON and text responses for clients that accept it"""
+    return compress_response(response, request.headers.get('Accept-Encoding', ''), COMPRESS_MIN_SIZE)
+
+# Routes
+@app.route('/')
+def index():
+    """Serve main page"""
+    return render_template('index.html')
+
+@app.route('/api/system/status')
+def system_status():
+    """Get system status (the same from every server process)"""
+    monitor = monitor_supervisor.status()
+    return jsonify({
+        'email_monitoring': monitor['monitoring'],
+        'monitor_leader': monitor['leader'],
+        'ai_configured': ai_processor.model is not None,
+        'pending_emails': email_monitor.work_queue.pending_count(),
+        'recent_activities': email_monitor.get_activities()[-5:]  # Last 5 activities
+    })
+
+@app.route('/api/system/start_monitoring', methods=['POST'])
+def start_monitoring():
+    """Start email monitoring in whichever process holds the monitor lease"""
+    monitor_supervisor.set_desired(True)
+    status = monitor_supervisor.wait_until_running()
+    if status['monitoring']:
+        return jsonify({'success': True, 'monitoring': True, 'leader': status['leader']})
+    if status['is_leader']:
+        return jsonify({'success': False, 'error': 'Email monitor could not start, see the activity log'}), 503
+    # Another process leads and starts the monitor on its next check
+    return jsonify({'success': True, 'monitoring': False, 'leader': status['leader']}), 202
+
+@app.route('/api/system/stop_monitoring', methods=['POST'])
+def stop_monitoring():
+    """Stop email monitoring in every process"""
+    monitor_supervisor.set_desired(False)
+    return jsonify({'success': True})
+
+@app.route('/api/email/activities')
+def get_email_activities():
+    """Get recent email monitoring activities"""
+    activities = email_monitor.get_activities()
+    return jsonify(activities)
+
+@app.route('/api/backfill', methods=['POST'])
+def start_backfill():
+    """Start a historical mailbox backfill"""
+    data = request.json
+    
+    try:
+        run_id = backfill_runner.start(data['start_date'], data['end_date'])
+    except (KeyError, ValueError) as e:
+        return jsonify({'success': False, 'error': f'Invalid date range: {e}'}), 400
+    
+    return jsonify({'success': True, 'run_id': run_id})
+
+@app.route('/api/backfill/<run_id>')
+def backfill_status(run_id):
+    """Get backfill progress, throughput and ETA"""
+    status = backfill_runner.status(run_id)
+    if not status:
+        return jsonify({'error': 'Backfill run not found'}), 404
+    return jsonify(status)
+
+@app.route('/api/backfill/<run_id>/resume', methods=['POST'])
+def resume_backfill(run_id):
+    """Resume a backfill from its checkpoints"""
+    if not backfill_runner.status(run_id):
+        return jsonify({'success': False, 'error': 'Backfill run not found'}), 404
+    success, message = backfill_runner.resume(run_id)
+    if not success:
+        return jsonify({'success': False, 'error': message}), 409
+    return jsonify({'success': True, 'run_id': run_id})
+
+@app.route('/api/backfill/<run_id>/cancel', methods=['POST'])
+def cancel_backfill(run_id):
+    """Cancel a running backfill"""
+    if not backfill_runner.status(run_id):
+        return jsonify({'success': False, 'error': 'Backfill run not found'}), 404
+    success, message = backfill_runner.cancel(run_id)
+    if not success:
+        return jsonify({'success': False, 'error': message}), 409
+    return jsonify({'success': True, 'message': message})
+
+@app.route('/api/config/ai_key', methods=['POST'])
+def set_ai_key():
+    """Set AI API key"""
+    data = request.json
+    api_key = data.get('api_key')
+    
+    if api_key:
+        # Save to database
+        db.set_config('ai_api_key', api_key, encrypt=True)
+        
+        # Initialize AI
+        success = ai_processor.initialize_ai(api_key)
+        
+        return jsonify({'success': success})
+    
+    return jsonify({'success': False, 'error': 'No API key provided'})
+
+@app.route('/api/hiring_managers', methods=['GET', 'POST'])
+def hiring_managers():
+    """Handle hiring managers"""
+    if request.method == 'POST':
+        data = request.json
+        hm_id = db.add_hiring_manager(data['name'], data['email'])
+        return jsonify({'success': hm_id is not None, 'id': hm_id})
+    else:
+        hms = db.get_hiring_managers()
+        return jsonify([{
+            'id': hm[0],
+            'name': hm[1],
+            'email': hm[2]
+        } for hm in hms])
+
+@app.route('/api/projects', methods=['GET', 'POST'])
+def projects():
+    """Handle projects"""
+    if request.method == 'POST':
+        data = request.json
+        
+        if isinstance(data, list):
+            # Bulk add in the background
+            return submit_task('projects', data, add_projects_chunk, item_type=str)
+        else:
+            # Single add
+            project_id = db.add_project(data['name'])
+            return jsonify({'success': project_id is not None, 'id': project_id})
+    else:
+        projects = db.get_projects()
+        return jsonify([{
+            'id': proj[0],
+            'name': proj[1]
+        } for proj in projects])
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+def jobs():
+    """Handle jobs"""
+    if request.method == 'POST':
+        data = request.json
+        
+        if isinstance(data, list):
+            # Bulk add in the background
+            return submit_task('jobs', data, add_jobs_chunk)
+        else:
+            # Single add
+            job_id, message = excel_manager.add_job(data)
+            return jsonify({
+                'success': job_id is not None,
+                'id': job_id,
+                'message': message
+            })
+    else:
+        return tracker_response('master')
+
+@app.route('/api/cvs', methods=['GET', 'POST'])
+def cvs():
+    """Handle CVs"""
+    if request.method == 'POST':
+        data = request.json
+        if isinstance(data, list):
+            # Bulk add in the background
+            return submit_task('cvs', data, add_cvs_chunk)
+        
+        cv_id, message = excel_manager.add_cv(data)
+        return jsonify({
+            'success': cv_id is not None,
+            'id': cv_id,
+            'message': message
+        })
+    else:
+        return tracker_response('cv')
+
+def submit_task(kind, items, handler, item_type=dict):
+    """Queue a bulk operation and answer with its task ID straight away"""
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'error': 'Expected a non-empty JSON list'}), 400
+    if not all(isinstance(item, item_type) for item in items):
+        kind_name = 'object' if item_type is dict else 'string'
+        return jsonify({'success': False, 'error': f'Every item must be a JSON {kind_name}'}), 400
+    task_id = task_runner.submit(kind, items, handler)
+    return jsonify({'success': True, 'task_id': task_id, 'total': len(items)}), 202
+
+def add_projects_chunk(names):
+    return [{'name': name, 'id': project_id, 'success': project_id is not None,
+             'error': None if project_id else 'Possibly duplicate'}
+            for name, project_id in zip(names, db.add_projects_bulk(names))]
+
+def add_jobs_chunk(jobs):
+    return [{'job': job.get('Job Title'), 'id': job_id, 'success': job_id is not None, 'message': message}
+            for job, (job_id, message) in zip(jobs, excel_manager.add_jobs_bulk(jobs))]
+
+def add_cvs_chunk(cvs):
+    return [{'candidate': cv.get('Candidate Name'), 'id': cv_id, 'success': cv_id is not None, 'message': message}
+            for cv, (cv_id, message) in zip(cvs, excel_manager.add_cvs_bulk(cvs))]
+
+def add_candidates_chunk(candidates):
+    return [{'name': candidate.get('name'), 'id': candidate_id, 'success': candidate_id is not None, 'error': error}
+            for candidate, (candidate_id, error) in zip(candidates, db.add_candidates_bulk(candidates))]
+
+@app.route('/api/import/<target>', methods=['POST'])
+def import_file(target):
+    """
+    Import jobs, cvs or candidates from an uploaded CSV or xlsx file in the background.
+    Columns are matched to fields by name; an optional "mapping" form field
+    ({"file column": "field"}) overrides that. Per-row errors and rows per second
+    are reported by /api/tasks/<task_id>.
+    """
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({'success': False, 'error': 'No file uploaded'}), 400
+    try:
+        mapping = loads(request.form.get('mapping') or '{}')
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Mapping must be a JSON object'}), 400
+    if not isinstance(mapping, dict):
+        return jsonify({'success': False, 'error': 'Mapping must be a JSON object'}), 400
+
+    plan, message = bulk_importer.prepare(target, upload, mapping)
+    if plan is None:
+        return jsonify({'success': False, 'error': message}), 400
+    try:
+        task_id = task_runner.submit_chunks(f"import-{target}", bulk_importer.chunks(plan),
+                                            bulk_importer.handler(plan), plan['total'])
+    except Exception as e:
+        # The task never started, so its chunks will not remove the uploaded file
+        bulk_importer.discard(plan)
+        print(f"Error starting import: {e}")
+        return jsonify({'success': False, 'error': f'Could not start the import: {e}'}), 500
+    return jsonify({
+        'success': True,
+        'task_id': task_id,
+        'total': plan['total'],
+        'columns': {str(index): field for index, field in plan['columns'].items()},
+        'unmapped': plan['unmapped']
+    }), 202
+
+@app.route('/api/tasks')
+def list_tasks():
+    """Recent background tasks"""
+    return jsonify(task_runner.list_tasks())
+
+@app.route('/api/tasks/<task_id>')
+def task_status(task_id):
+    """Progress of a background task: processed/total, errors, throughput; ?results=1 adds per-item results"""
+    status = task_runner.status(task_id, include_results=request.args.get('results') == '1')
+    if status is None:
+        return jsonify({'error': 'Task not found'}), 404
+    return jsonify(status)
+
+@app.route('/api/tasks/<task_id>/cancel', methods=['POST'])
+def cancel_task(task_id):
+    """Stop a background task before its next chunk"""
+    if task_runner.status(task_id) is None:
+        return jsonify({'success': False, 'error': 'Task not found'}), 404
+    return jsonify({'success': task_runner.cancel(task_id)})
+
+def parse_selection(args):
+    """Filters (repeatable "Column:text") and fields (comma-separated) of a tracker query"""
+    filters = {}
+    for item in args.getlist('filter'):
+        column, _, value = item.partition(':')
+        filters[column.strip()] = value.strip()
+    fields = [field.strip() for field in args.get('fields', '').split(',') if field.strip()]
+    return filters, fields
+
+def tracker_response(tracker):
+    """
+    Rows of a tracker with a strong ETag. With any of page, page_size, sort, filter
+    (repeatable, "Column:text") or fields (comma-separated) a page object is returned,
+    otherwise the full list of rows.
+    """
+    query_string = request.query_string.decode('utf-8')
+    etag = tracker_view.etag(tracker, query_string)
+    if any(request.if_none_match.contains(tag) for tag in etag_variants(etag)):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    
+    args = request.args
+    if any(key in args for key in ('page', 'page_size', 'sort', 'filter', 'fields')):
+        filters, fields = parse_selection(args)
+        try:
+            result = tracker_view.query(
+                tracker, page=args.get('page', 1), page_size=args.get('page_size'),
+                sort=args.get('sort'), filters=filters, fields=fields
+            )
+        except ValueError:
+            return jsonify({'error': 'page and page_size must be integers'}), 400
+        response = jsonify(result)
+    else:
+        response = app.response_class(tracker_view.all_rows_json(tracker), mimetype='application/json')
+    
+    # Clients must revalidate, which costs only a file stat when nothing changed
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['PUT'])
+def update_job(job_id):
+    """Update job"""
+    data = request.json
+    success, message = excel_manager.update_job(job_id, data)
+    return jsonify({'success': success, 'message': message})
+
+@app.route('/api/cvs/<cv_id>', methods=['PUT'])
+def update_cv(cv_id):
+    """Update CV"""
+    data = request.json
+    success, message = excel_manager.update_cv(cv_id, data)
+    return jsonify({'success': success, 'message': message})
+
+@app.route('/api/ai/command', methods=['POST'])
+def ai_command():
+    """Process AI command"""
+    data = request.json
+    command = data.get('command')
+    
+    if not command:
+        return jsonify({'error': 'No command provided'})
+    
+    result = ai_processor.process_command(command)
+    return jsonify(result)
+
+@app.route('/api/ai/command/stream', methods=['POST'])
+def ai_command_stream():
+    """Process AI command as Server-Sent Events: intent, progress, result, then rows in pages"""
+    data = request.json
+    command = data.get('command')
+    
+    if not command:
+        return jsonify({'error': 'No command provided'})
+    
+    try:
+        page_size = int(data.get('page_size', 100))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'page_size must be an integer'}), 400
+    # Same bounds as the tracker endpoints
+    page_size = min(tracker_view.max_page_size, max(1, page_size))
+    
+    def generate():
+        for event, payload in ai_processor.stream_command(command, page_size=page_size):
+            yield f"event: {event}\ndata: {dumps(payload).decode('utf-8')}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/ai/cache')
+def ai_cache_stats():
+    """Get LLM response cache metrics"""
+    return jsonify(ai_processor.cache.get_stats())
+
+@app.route('/api/ai/latency')
+def ai_latency_stats():
+    """Get LLM call counters and latency histogram"""
+    if not ai_processor.client:
+        return jsonify({'error': 'AI not initialized'}), 400
+    return jsonify(ai_processor.client.get_stats())
+
+@app.route('/api/metrics')
+def prometheus_metrics():
+    """Request, stage and LLM counters and latency histograms in Prometheus text format"""
+    if not metrics.enabled():
+        return jsonify({'error': 'Metrics are disabled (METRICS_ENABLED=0)'}), 404
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
+@metrics.registry.collector
+def llm_metrics():
+    """LLM client and cache counters, read at scrape time if the AI processor has been built"""
+    if not components.built('ai_processor'):
+        return []
+    families = []
+    if ai_processor.client:
+        stats = ai_processor.client.get_stats()
+        families.extend([
+            ('tracker_llm_calls_total', 'counter', 'LLM calls by outcome',
+             [({'outcome': outcome}, stats[outcome]) for outcome in ('succeeded', 'failed')]),
+            ('tracker_llm_retries_total', 'counter', 'LLM attempts retried', [({}, stats['retries'])]),
+            ('tracker_llm_timeouts_total', 'counter', 'LLM attempts that timed out', [({}, stats['timeouts'])]),
+            ('tracker_llm_in_flight', 'gauge', 'LLM calls waiting for the model', [({}, stats['in_flight'])]),
+            ('tracker_llm_abandoned', 'gauge', 'Timed-out LLM calls still holding a pool thread',
+             [({}, stats['abandoned'])])
+        ])
+    cache = ai_processor.cache.get_stats()
+    families.extend([
+        ('tracker_llm_cache_lookups_total', 'counter', 'LLM response cache lookups',
+         [({'result': 'hit'}, cache['hits']), ({'result': 'miss'}, cache['misses'])]),
+        ('tracker_llm_cache_entries', 'gauge', 'Responses in the LLM cache', [({}, cache['entries'])])
+    ])
+    return families
+
+@app.route('/api/ai/extraction')
+def ai_extraction_stats():
+    """Get the share of emails that bypassed the LLM"""
+    return jsonify(ai_processor.get_extraction_stats())
+
+@app.route('/api/analytics/summary')
+def analytics_summary():
+    """Get analytics summary"""
+    return jsonify(tracker_counters.summary())
+
+@app.route('/api/analytics/summary/rebuild', methods=['POST'])
+def rebuild_analytics_summary():
+    """Recount the dashboard counters from the tracker files"""
+    tracker_counters.rebuild()
+    return jsonify(tracker_counters.summary())
+
+def cube_response(metric):
+    """Run a cube query from ?by=dim1,dim2 and ?<dimension>=<value> filters"""
+    by = [name.strip() for name in request.args.get('by', '').split(',') if name.strip()]
+    from analytics_cube import DIMENSIONS
+    filters = {name: request.args[name] for name in DIMENSIONS if name in request.args}
+    try:
+        return jsonify({'by': by, 'filters': filters, 'rows': metric(by, filters)})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/analytics/funnel')
+def analytics_funnel():
+    """Funnel conversion (CV Shared -> Interview -> Offer -> Hired)"""
+    return cube_response(analytics_cube.funnel)
+
+@app.route('/api/analytics/time_to_hire')
+def analytics_time_to_hire():
+    """Average days from CV shared to onboarding"""
+    return cube_response(analytics_cube.time_to_hire)
+
+@app.route('/api/analytics/offers')
+def analytics_offers():
+    """Offer acceptance rates"""
+    return cube_response(analytics_cube.offer_acceptance)
+
+@app.route('/api/analytics/refresh', methods=['POST'])
+def analytics_refresh():
+    """Rebuild the analytics cube from the tracker files"""
+    analytics_cube.refresh(full=True)
+    return jsonify({'success': True, 'stats': analytics_cube.stats})
+
+@app.route('/api/candidates', methods=['GET', 'POST'])
+def candidates():
+    """Handle candidates"""
+    if request.method == 'POST':
+        data = request.json
+        candidate_id = db.add_candidate(
+            name=data['name'],
+            email=data.get('email', ''),
+            mobile=data.get('mobile', ''),
+            current_location=data.get('current_location', ''),
+            nationality=data.get('nationality', ''),
+            notice_period=data.get('notice_period', '')
+        )
+        return jsonify({'success': candidate_id is not None, 'id': candidate_id})
+    else:
+        candidates = db.get_candidates()
+        return jsonify([{
+            'id': c[0],
+            'name': c[1],
+            'email': c[2],
+            'mobile': c[3],
+            'current_location': c[4],
+            'nationality': c[5],
+            'notice_period': c[6]
+        } for c in candidates])
+
+@app.route('/api/candidates/bulk', methods=['POST'])
+def bulk_add_candidates():
+    """Bulk add candidates in the background"""
+    return submit_task('candidates', request.get_json(silent=True), add_candidates_chunk)
+
+@app.route('/api/export/<tracker_type>')
+def export_tracker(tracker_type):
+    """
+    Export tracker data. Without parameters the workbook on disk is sent; with format
+    (csv, ndjson or xlsx), filter, sort or fields the selected rows are streamed.
+    """
+    args = request.args
+    if tracker_type in ('master', 'cv') and any(key in args for key in ('format', 'filter', 'sort', 'fields')):
+        export_format = args.get('format', 'xlsx')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f"Invalid format, use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        filters, fields = parse_selection(args)
+        name = 'MasterTracker' if tracker_type == 'master' else 'CVTracker'
+        chunks = tracker_exporter.export(tracker_type, export_format, filters=filters,
+                                         sort=args.get('sort'), fields=fields)
+        return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[export_format], headers={
+            'Content-Disposition': f'attachment; filename={name}_{datetime.now().strftime("%Y%m%d")}.{export_format}',
+            'X-Accel-Buffering': 'no'
+        })
+    
+    if tracker_type == 'master':
+        # Get the absolute path to the Excel file
+        file_path = Path(excel_manager.master_path).absolute()
+        
+        # Check if file exists
+        if not file_path.exists():
+            return jsonify({'error': 'Master Tracker file not found. Please add some jobs first.'}), 404
+            
+        return send_file(
+            str(file_path),
+            as_attachment=True,
+            download_name=f'MasterTracker_{datetime.now().strftime("%Y%m%d")}.xlsx'
+        )
+    elif tracker_type == 'cv':
+        # Get the absolute path to the Excel file
+        file_path = Path(excel_manager.cv_path).absolute()
+        
+        # Check if file exists
+        if not file_path.exists():
+            return jsonify({'error': 'CV Tracker file not found. Please add some CVs first.'}), 404
+            
+        return send_file(
+            str(file_path),
+            as_attachment=True,
+            download_name=f'CVTracker_{datetime.now().strftime("%Y%m%d")}.xlsx'
+        )
+    else:
+        return jsonify({'error': 'Invalid tracker type'}), 400
+
+def configure_ai():
+    """Set up the LLM provider from the environment or the stored API key"""
+    from llm_providers import create_provider
+    # LLM_PROVIDER=local runs against the offline stand-in (optionally with LLM_CASSETTE)
+    if os.environ.get('LLM_PROVIDER', 'gemini') != 'gemini':
+        ai_processor.set_provider(create_provider(
+            os.environ['LLM_PROVIDER'],
+            cassette=os.environ.get('LLM_CASSETTE'),
+            cassette_mode=os.environ.get('LLM_CASSETTE_MODE', 'auto')
+        ))
+    else:
+        # Check if AI key exists
+        api_key = db.get_config('ai_api_key', decrypt=True)
+        if api_key:
+            ai_processor.initialize_ai(api_key)
+
+if __name__ == '__main__':
+    configure_ai()
+    
+    # The reloader runs the app in a child process; supervise the monitor there only
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        monitor_supervisor.start()
+    
+    # Run Flask app (development server; see serve.py for production)
     app.run(debug=True, port=5000)
\ No newline at end of file
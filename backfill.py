@@ -0,0 +1,432 @@
+"""
+Historical Mailbox Backfill with Parallel, Resumable Date Partitions
+
+Usage:
+    python backfill.py --start 2026-01-01 --end 2026-04-01 [--maildir INBOX [--sent SENT]] [--resume RUN_ID]
+"""
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from mail_backend import StagedMessage
+from rate_limit import TokenBucket
+
+class BackfillRunner:
+    """Run existing mail in a date range through the classify -> extract -> update pipeline"""
+
+    def __init__(self, email_monitor, db_path="data/email_pipeline.db", workers=4,
+                 partition_days=7, ai_requests_per_minute=30, checkpoint_every=20):
+        self.email_monitor = email_monitor
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.workers = workers
+        self.partition_days = partition_days
+        self.checkpoint_every = checkpoint_every
+        # Shared across all partitions so the AI stage stays under its quota
+        self.ai_limiter = TokenBucket(ai_requests_per_minute / 60.0, capacity=max(1, workers))
+        self._sessions = {}  # run_id -> throughput counters for the current process
+        self._cancelled = set()
+        self._active = set()  # run_ids executing in this process
+        self._threads = {}  # run_id -> background thread started by resume()
+        self._lock = threading.Lock()
+        self.init_database()
+
+    def get_connection(self):
+        """Get database connection"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        """Initialize backfill tables"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_runs (
+                run_id TEXT PRIMARY KEY,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,
+                state TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_partitions (
+                run_id TEXT NOT NULL,
+                folder TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                processed INTEGER DEFAULT 0,
+                total INTEGER,
+                recruitment INTEGER DEFAULT 0,
+                duplicates INTEGER DEFAULT 0,
+                errors INTEGER DEFAULT 0,
+                last_error TEXT,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (run_id, folder, start_date),
+                FOREIGN KEY (run_id) REFERENCES backfill_runs(run_id)
+            )
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def create_run(self, start_date, end_date):
+        """Split a date range into partitions per folder and return the run ID"""
+        start_date = self._to_datetime(start_date)
+        end_date = self._to_datetime(end_date)
+        if end_date <= start_date:
+            raise ValueError("End date must be after start date")
+
+        run_id = f"BF-{datetime.now().strftime('%y%m%d')}-{uuid.uuid4().hex[:6]}"
+
+        partitions = []
+        partition_start = start_date
+        while partition_start < end_date:
+            partition_end = min(partition_start + timedelta(days=self.partition_days), end_date)
+            for folder in self.email_monitor.backend.folders:
+                partitions.append((run_id, folder, partition_start.isoformat(), partition_end.isoformat()))
+            partition_start = partition_end
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO backfill_runs (run_id, start_date, end_date, state) VALUES (?, ?, ?, ?)",
+            (run_id, start_date.isoformat(), end_date.isoformat(), 'pending')
+        )
+        cursor.executemany(
+            "INSERT INTO backfill_partitions (run_id, folder, start_date, end_date) VALUES (?, ?, ?, ?)",
+            partitions
+        )
+        conn.commit()
+        conn.close()
+
+        return run_id
+
+    def start(self, start_date, end_date):
+        """Create a run and execute it in a background thread"""
+        run_id = self.create_run(start_date, end_date)
+        self.resume(run_id)
+        return run_id
+
+    def resume(self, run_id):
+        """Continue a run from its checkpoints in a background thread; returns (success, message)"""
+        if not self.status(run_id):
+            return False, "Backfill run not found"
+        with self._lock:
+            if run_id in self._active:
+                return False, "Backfill run is already running"
+            self._active.add(run_id)
+            # Cleared before the thread starts, so a cancel sent from now on is kept
+            self._cancelled.discard(run_id)
+            thread = threading.Thread(target=self.run, args=(run_id,))
+            thread.daemon = True
+            self._threads[run_id] = thread
+        thread.start()
+        return True, "Backfill resumed"
+
+    def is_running(self, run_id):
+        """True while the run is executing in this process"""
+        with self._lock:
+            return run_id in self._active
+
+    def wait(self, run_id, timeout=None):
+        """Wait for a run started by resume() to finish; True if it has"""
+        with self._lock:
+            thread = self._threads.get(run_id)
+        if thread is not None:
+            thread.join(timeout)
+        return not self.is_running(run_id)
+
+    def cancel(self, run_id):
+        """Stop a run after the current message of each partition; returns (success, message)"""
+        if not self.status(run_id):
+            return False, "Backfill run not found"
+        with self._lock:
+            if run_id not in self._active:
+                return False, "Backfill run is not running"
+            self._cancelled.add(run_id)
+        return True, "Backfill cancelling"
+
+    def run(self, run_id):
+        """Execute all unfinished partitions of a run on the worker pool"""
+        with self._lock:
+            self._active.add(run_id)
+        try:
+            return self._run(run_id)
+        finally:
+            with self._lock:
+                self._active.discard(run_id)
+                self._cancelled.discard(run_id)
+                self._threads.pop(run_id, None)
+
+    def _run(self, run_id):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT folder, start_date, end_date, processed FROM backfill_partitions
+            WHERE run_id = ? AND state != 'done' ORDER BY start_date, folder""",
+            (run_id,)
+        )
+        partitions = cursor.fetchall()
+        cursor.execute("UPDATE backfill_runs SET state = 'running' WHERE run_id = ?", (run_id,))
+        conn.commit()
+        conn.close()
+
+        with self._lock:
+            self._sessions[run_id] = {'started': time.time(), 'processed': 0}
+
+        self.email_monitor.add_activity("system", f"Backfill {run_id} started - {len(partitions)} partitions remaining")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(lambda partition: self._run_partition(run_id, *partition), partitions))
+
+        status = self.status(run_id)
+        if run_id in self._cancelled:
+            state = 'cancelled'
+        elif status['partitions']['failed']:
+            state = 'failed'
+        else:
+            state = 'done'
+        self._set_run_state(run_id, state)
+
+        self.email_monitor.add_activity(
+            "system",
+            f"Backfill {run_id} {state} - {status['messages']['processed']} emails, "
+            f"{status['messages']['recruitment']} recruitment, {status['messages']['duplicates']} duplicates skipped"
+        )
+        return self.status(run_id)
+
+    def _run_partition(self, run_id, folder, start_date, end_date, offset):
+        """Process one folder/date partition, checkpointing as it goes"""
+        key = (run_id, folder, start_date)
+        counts = {'recruitment': 0, 'duplicates': 0, 'errors': 0}
+        processed = offset
+
+        # Mailbox connections are not shared between threads
+        backend = self.email_monitor.backend.clone()
+        try:
+            backend.open()
+            messages = backend.messages_between(
+                folder, datetime.fromisoformat(start_date), datetime.fromisoformat(end_date)
+            )
+            self._update_partition(key, state='running', total=len(messages))
+
+            # Messages before the checkpoint were handled by an earlier attempt
+            for raw_message in messages[offset:]:
+                if run_id in self._cancelled:
+                    self._checkpoint(key, processed, counts, state='pending')
+                    return
+
+                try:
+                    outcome = self._process_message(StagedMessage(backend, raw_message, folder))
+                    if outcome in counts:
+                        counts[outcome] += 1
+                except Exception as e:
+                    counts['errors'] += 1
+                    self._update_partition(key, last_error=str(e))
+
+                processed += 1
+                with self._lock:
+                    self._sessions[run_id]['processed'] += 1
+
+                if (processed - offset) % self.checkpoint_every == 0:
+                    self._checkpoint(key, processed, counts)
+                    counts = {name: 0 for name in counts}
+
+            self._checkpoint(key, processed, counts, state='done')
+        except Exception as e:
+            self._checkpoint(key, processed, counts, state='failed')
+            self._update_partition(key, last_error=str(e))
+            self.email_monitor.add_activity("error", f"Backfill partition {folder} {start_date[:10]} failed: {str(e)}")
+        finally:
+            backend.close()
+
+    def _process_message(self, message):
+        """Classify, dedupe and extract a single message; returns the outcome"""
+        monitor = self.email_monitor
+
+        if not monitor._is_recruitment_email(message):
+            return 'skipped'
+
+        email_data = message.to_email_data()
+        # Only remember the content once it has been extracted, so a failure can be retried
+        is_duplicate, hits = monitor.deduplicator.check(email_data, record=False)
+        if is_duplicate:
+            return 'duplicates'
+
+        try:
+            email_data['recruitment_type'] = monitor._determine_recruitment_type(email_data)
+            if monitor.ai_processor:
+                self.ai_limiter.acquire()
+                monitor.ai_processor.process_email(email_data)
+        except Exception:
+            monitor.deduplicator.release(email_data)
+            raise
+        monitor.deduplicator.record(email_data)
+
+        return 'recruitment'
+
+    def _checkpoint(self, key, processed, counts, state=None):
+        """Persist partition progress and add the counts since the last checkpoint"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """UPDATE backfill_partitions SET processed = ?, recruitment = recruitment + ?,
+            duplicates = duplicates + ?, errors = errors + ?, state = COALESCE(?, state), updated_at = ?
+            WHERE run_id = ? AND folder = ? AND start_date = ?""",
+            (processed, counts['recruitment'], counts['duplicates'], counts['errors'],
+             state, datetime.now().isoformat(), *key)
+        )
+        conn.commit()
+        conn.close()
+
+    def _update_partition(self, key, **fields):
+        """Update individual partition columns"""
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            f"UPDATE backfill_partitions SET {assignments}, updated_at = ? WHERE run_id = ? AND folder = ? AND start_date = ?",
+            (*fields.values(), datetime.now().isoformat(), *key)
+        )
+        conn.commit()
+        conn.close()
+
+    def _set_run_state(self, run_id, state):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE backfill_runs SET state = ? WHERE run_id = ?", (state, run_id))
+        conn.commit()
+        conn.close()
+
+    def status(self, run_id):
+        """Progress, throughput and ETA of a run"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT start_date, end_date, state FROM backfill_runs WHERE run_id = ?", (run_id,))
+        run = cursor.fetchone()
+        cursor.execute(
+            """SELECT state, processed, total, recruitment, duplicates, errors
+            FROM backfill_partitions WHERE run_id = ?""",
+            (run_id,)
+        )
+        partitions = cursor.fetchall()
+        conn.close()
+
+        if not run:
+            return None
+
+        states = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for partition in partitions:
+            states[partition[0]] = states.get(partition[0], 0) + 1
+
+        processed = sum(p[1] or 0 for p in partitions)
+        known_totals = [p[2] for p in partitions if p[2] is not None]
+        remaining = sum((p[2] or 0) - (p[1] or 0) for p in partitions if p[2] is not None)
+
+        # Estimate partitions that have not been listed yet from the ones that have
+        total = None
+        if known_totals:
+            estimated = (len(partitions) - len(known_totals)) * sum(known_totals) / len(known_totals)
+            total = round(sum(known_totals) + estimated)
+            remaining += estimated
+
+        session = self._sessions.get(run_id)
+        throughput = None
+        eta_seconds = None
+        if session:
+            elapsed = time.time() - session['started']
+            if elapsed > 0 and session['processed']:
+                throughput = session['processed'] / elapsed
+                eta_seconds = remaining / throughput
+
+        return {
+            'run_id': run_id,
+            'start_date': run[0],
+            'end_date': run[1],
+            'state': run[2],
+            'partitions': dict(states, total=len(partitions)),
+            'messages': {
+                'processed': processed,
+                'total': total,
+                'recruitment': sum(p[3] or 0 for p in partitions),
+                'duplicates': sum(p[4] or 0 for p in partitions),
+                'errors': sum(p[5] or 0 for p in partitions)
+            },
+            'throughput_per_sec': round(throughput, 2) if throughput else None,
+            'eta_seconds': round(eta_seconds) if eta_seconds is not None else None
+        }
+
+    def _to_datetime(self, value):
+        if isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(str(value))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Backfill historical recruitment emails")
+    arg_parser.add_argument('--start', help="Start date (YYYY-MM-DD)")
+    arg_parser.add_argument('--end', help="End date, exclusive (YYYY-MM-DD)")
+    arg_parser.add_argument('--resume', help="Resume an existing run ID")
+    arg_parser.add_argument('--maildir', help="Local Maildir/mbox inbox to use instead of Outlook")
+    arg_parser.add_argument('--sent', help="Local Maildir/mbox sent folder")
+    arg_parser.add_argument('--mbox', action='store_true', help="Local mailbox paths are mbox files")
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--partition-days', type=int, default=7)
+    arg_parser.add_argument('--ai-rate', type=int, default=30, help="AI requests per minute")
+    args = arg_parser.parse_args()
+
+    if not args.resume and not (args.start and args.end):
+        arg_parser.error("--start and --end are required unless --resume is given")
+
+    from database import Database
+    from excel_manager import ExcelManager
+    from ai_processor import AIProcessor
+    from email_monitor import EmailMonitor
+    from mail_backend import OutlookBackend, LocalMailboxBackend
+
+    if args.maildir:
+        backend = LocalMailboxBackend(args.maildir, args.sent, mailbox_format="mbox" if args.mbox else "maildir")
+    else:
+        backend = OutlookBackend()
+
+    db = Database()
+    ai_processor = AIProcessor(api_key=db.get_config('ai_api_key', decrypt=True), excel_manager=ExcelManager())
+    email_monitor = EmailMonitor(ai_processor=ai_processor, backend=backend)
+    runner = BackfillRunner(
+        email_monitor, workers=args.workers, partition_days=args.partition_days,
+        ai_requests_per_minute=args.ai_rate
+    )
+
+    run_id = args.resume or runner.create_run(args.start, args.end)
+    print(f"Backfill run {run_id}")
+
+    success, message = runner.resume(run_id)
+    if not success:
+        print(message)
+        sys.exit(1)
+    try:
+        while not runner.wait(run_id, timeout=5):
+            status = runner.status(run_id)
+            messages = status['messages']
+            print(
+                f"{status['partitions']['done']}/{status['partitions']['total']} partitions, "
+                f"{messages['processed']}/{messages['total'] or '?'} emails, "
+                f"{status['throughput_per_sec'] or 0} emails/s, ETA {status['eta_seconds'] or '?'}s"
+            )
+    except KeyboardInterrupt:
+        runner.cancel(run_id)
+        runner.wait(run_id)
+        print(f"Cancelled - resume with: python backfill.py --resume {run_id}")
+
+
+if __name__ == '__main__':
+    main()
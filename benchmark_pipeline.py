@@ -0,0 +1,132 @@
+"""
+Offline Benchmark of the Email Extraction Pipeline
+
+Runs synthetic recruitment emails through AIProcessor.process_email (rule fast path,
+LLM via the local stand-in provider, and _update_trackers) against throwaway trackers.
+
+    python benchmark_pipeline.py --emails 200 --latency 0.2 --jitter 0.1
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+FIRST_NAMES = ['Ahmed', 'Priya', 'John', 'Maria', 'Omar', 'Chen', 'Fatima', 'David', 'Elena', 'Ravi']
+LAST_NAMES = ['Khan', 'Sharma', 'Smith', 'Garcia', 'Haddad', 'Wei', 'Ali', 'Brown', 'Petrova', 'Nair']
+POSITIONS = ['Site Engineer', 'QA Lead', 'Project Manager', 'Quantity Surveyor', 'HSE Officer']
+PROJECTS = ['Alpha', 'Beta', 'Gamma', 'Delta']
+
+
+def make_jobs():
+    jobs = []
+    for project in PROJECTS:
+        for position in POSITIONS:
+            jobs.append({
+                'Job Title': position, 'Project Name': project, 'Job Location (Country)': 'UAE',
+                'Hiring Manager': 'Benchmark HM', 'Job Status': 'Open'
+            })
+    return jobs
+
+
+def make_emails(count, structured_share, seed):
+    """Structured CV submissions (rule fast path) mixed with free-text feedback (LLM path)"""
+    rng = random.Random(seed)
+    emails = []
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+        position = rng.choice(POSITIONS)
+        project = rng.choice(PROJECTS)
+        if rng.random() < structured_share:
+            subject = f"CV Submission - {position}"
+            body = (f"Hi,\n\nPlease find the profile below.\n\nCandidate: {name}\nPosition: {position}\n"
+                    f"Project: {project}\nMobile: +9715{rng.randint(10000000, 99999999)}\n"
+                    f"Notice Period: {rng.choice([15, 30, 60])} days\n\nRegards,\nAgency")
+        else:
+            subject = f"RE: {position} interview"
+            body = (f"Hello,\n\nWe met the candidate yesterday and the panel was positive.\n\n"
+                    f"Candidate: {name}\nPosition: {position}\nProject: {project}\n"
+                    f"Feedback: strong technical skills, recommend next round\n\nThanks\nHM")
+        emails.append({
+            'subject': subject, 'sender': 'sender@example.com', 'sender_name': 'Sender',
+            'received_time': f"2026-01-01 09:{i % 60:02d}", 'body': body, 'attachments': []
+        })
+    return emails
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark emails/sec through process_email with a local LLM stand-in")
+    arg_parser.add_argument('--emails', type=int, default=100)
+    arg_parser.add_argument('--structured', type=float, default=0.5, help="Share of emails the rules can handle")
+    arg_parser.add_argument('--latency', type=float, default=0.0, help="Stand-in model latency in seconds")
+    arg_parser.add_argument('--jitter', type=float, default=0.0, help="Extra deterministic latency, up to this many seconds")
+    arg_parser.add_argument('--rpm', type=int, default=60000, help="LLM client request rate limit per minute")
+    arg_parser.add_argument('--concurrency', type=int, default=4, help="LLM client max concurrent calls")
+    arg_parser.add_argument('--cassette', help="Record/replay LLM responses in this JSON-lines file")
+    arg_parser.add_argument('--cassette-mode', default='auto', choices=['record', 'replay', 'auto'])
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    from excel_manager import ExcelManager
+    from ai_processor import AIProcessor
+    from llm_cache import LLMCache
+    from llm_providers import create_provider
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        excel_manager = ExcelManager(workdir / "MasterTracker.xlsx", workdir / "CVTracker.xlsx")
+        with excel_manager.transaction() as tx:
+            for job in make_jobs():
+                tx.add_job(job)
+
+        provider = create_provider('local', latency=args.latency, jitter=args.jitter,
+                                   cassette=args.cassette, cassette_mode=args.cassette_mode)
+        ai_processor = AIProcessor(excel_manager=excel_manager, cache=LLMCache(workdir / "llm_cache.db"),
+                                   provider=provider, client_options={
+                                       'requests_per_minute': args.rpm, 'tokens_per_minute': args.rpm * 5000,
+                                       'max_concurrency': args.concurrency
+                                   })
+
+        # Time the tracker-update stage separately from the whole email
+        update_times = []
+        update_trackers = ai_processor._update_trackers
+
+        def timed_update(extracted_data, email_data):
+            started = time.perf_counter()
+            try:
+                return update_trackers(extracted_data, email_data)
+            finally:
+                update_times.append(time.perf_counter() - started)
+
+        ai_processor._update_trackers = timed_update
+
+        emails = make_emails(args.emails, args.structured, args.seed)
+        email_times = []
+        started = time.perf_counter()
+        for email_data in emails:
+            email_started = time.perf_counter()
+            ai_processor.process_email(email_data)
+            email_times.append(time.perf_counter() - email_started)
+        elapsed = time.perf_counter() - started
+
+        extraction = ai_processor.get_extraction_stats()
+        cvs = len(excel_manager.read_cv_tracker())
+        ai_processor.client.shutdown()
+
+    def ms(values, fraction):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(fraction * len(values)))] * 1000 if values else 0.0
+
+    print(f"Emails:            {len(emails)} in {elapsed:.2f}s -> {len(emails) / elapsed:.1f} emails/s")
+    print(f"Fast path share:   {extraction['fast_path_share']} ({extraction['fast_path']} rules, {extraction['llm']} LLM)")
+    print(f"Per email:         p50 {ms(email_times, 0.5):.1f} ms, p95 {ms(email_times, 0.95):.1f} ms")
+    print(f"_update_trackers:  p50 {ms(update_times, 0.5):.1f} ms, p95 {ms(update_times, 0.95):.1f} ms, "
+          f"total {sum(update_times):.2f}s ({sum(update_times) / elapsed:.0%} of run)")
+    print(f"Prompt bytes saved: {extraction['prompts']['bytes_saved']} ({extraction['prompts']['saved_ratio']})")
+    print(f"CV rows written:   {cvs}")
+    if getattr(provider, 'stats', None):
+        print(f"Cassette:          {provider.stats}")
+
+
+if __name__ == '__main__':
+    main()
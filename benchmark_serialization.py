@@ -0,0 +1,124 @@
+"""
+Benchmark of Tracker Serialisation and Compression
+
+Compares the old path (per-cell strftime loop, to_dict('records'), Flask's default
+json encoder) with the column-wise orjson path in json_response, and the size and
+cost of gzip/brotli on the result, for a synthetic CV tracker.
+
+    python benchmark_serialization.py --rows 20000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from json_response import brotli, compress, dumps, frame_records, orjson
+from tracker_view import to_display
+
+STATUSES = ['CV Shared', 'Interview Scheduled', 'Interview Passed', 'Offer Extended', 'Hired', 'Rejected']
+NAMES = ['Ahmed Khan', 'Priya Sharma', 'John Smith', 'Maria Garcia', 'Omar Haddad', 'Chen Wei']
+
+
+def make_cv_tracker(rows, seed):
+    """CV tracker frame shaped like the workbook: datetime columns with gaps, text, numbers"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+
+    def maybe_date(share):
+        return [start + timedelta(days=rng.randint(0, 600)) if rng.random() < share else pd.NaT for _ in range(rows)]
+
+    df = pd.DataFrame({
+        'CVID': [f"CV-250101-{i:05d}" for i in range(rows)],
+        'JobID': [f"JOB-250101-{rng.randint(1, 300):03d}" for _ in range(rows)],
+        'Position': [rng.choice(['Site Engineer', 'QA Lead', 'Project Manager']) for _ in range(rows)],
+        'Hiring Manager': [rng.choice(['Bob', 'Sara', 'Ali']) for _ in range(rows)],
+        'Project': [rng.choice(['Alpha', 'Beta', 'Gamma']) for _ in range(rows)],
+        'Candidate Name': [f"{rng.choice(NAMES)} {i}" for i in range(rows)],
+        'Application Status': [rng.choice(STATUSES) for _ in range(rows)],
+        'CV Source': [rng.choice(['Agency', 'LinkedIn', None]) for _ in range(rows)],
+        'Date CV Shared': pd.to_datetime(maybe_date(1.0)),
+        'HM Feedback': [rng.choice(['Positive', 'Negative', None]) for _ in range(rows)],
+        'Interview Date': pd.to_datetime(maybe_date(0.4)),
+        'Package': [rng.choice([12000.0, 18500.0, float('nan')]) for _ in range(rows)],
+        'Date Offer Issued': pd.to_datetime(maybe_date(0.15)),
+        'Offer Status': [rng.choice(['Accepted', 'Rejected', None, None]) for _ in range(rows)],
+        'Date Onboard': pd.to_datetime(maybe_date(0.1)),
+        'Email': [f"candidate{i}@example.com" for i in range(rows)],
+        'Mobile': [f"+9715{rng.randint(10000000, 99999999)}" for _ in range(rows)],
+        'Notice Period': [rng.choice(['30 days', '60 days', None]) for _ in range(rows)],
+        'Remarks': [rng.choice(['', 'Follow up next week', None]) for _ in range(rows)],
+        'Last Modified': pd.to_datetime(maybe_date(1.0)),
+    })
+    # Cells edited through the app hold datetime objects inside text columns
+    df['Remarks'] = df['Remarks'].astype(object)
+    df.loc[df.index[::50], 'Remarks'] = datetime(2026, 1, 5, 9, 30)
+    return df
+
+
+def legacy_display(df):
+    """The former per-cell conversion"""
+    display = df.copy()
+    for column in display.columns:
+        if pd.api.types.is_datetime64_any_dtype(display[column]):
+            display[column] = display[column].dt.strftime('%Y-%m-%d %H:%M:%S')
+        elif display[column].dtype == object:
+            display[column] = display[column].map(
+                lambda value: value.strftime('%Y-%m-%d %H:%M:%S') if hasattr(value, 'strftime') else value
+            )
+    return display.astype(object).where(display.notna(), '')
+
+
+def timed(function, repeat):
+    """Best of `repeat` runs in milliseconds, and the last result"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare tracker JSON encoding and compression")
+    arg_parser.add_argument('--rows', type=int, default=20000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    df = make_cv_tracker(args.rows, args.seed)
+    print(f"CV tracker: {len(df)} rows x {len(df.columns)} columns "
+          f"(encoder: {'orjson' if orjson else 'json'}, brotli: {'yes' if brotli else 'not installed'})\n")
+
+    # Flask's DefaultJSONProvider: json.dumps with sorted keys and ASCII escaping
+    old_display_ms, old_display = timed(lambda: legacy_display(df), args.repeat)
+    old_records_ms, old_records = timed(lambda: old_display.to_dict('records'), args.repeat)
+    old_encode_ms, old_body = timed(lambda: json.dumps(old_records, sort_keys=True).encode('utf-8'), args.repeat)
+
+    new_display_ms, new_display = timed(lambda: to_display(df), args.repeat)
+    new_records_ms, new_records = timed(lambda: frame_records(new_display), args.repeat)
+    new_encode_ms, new_body = timed(lambda: dumps(new_records), args.repeat)
+
+    assert json.loads(old_body) == json.loads(new_body), "Both paths must produce the same rows"
+
+    print(f"{'stage':<22}{'old ms':>10}{'new ms':>10}")
+    print(f"{'display conversion':<22}{old_display_ms:>10.1f}{new_display_ms:>10.1f}")
+    print(f"{'records':<22}{old_records_ms:>10.1f}{new_records_ms:>10.1f}")
+    print(f"{'encode':<22}{old_encode_ms:>10.1f}{new_encode_ms:>10.1f}")
+    old_total = old_display_ms + old_records_ms + old_encode_ms
+    new_total = new_display_ms + new_records_ms + new_encode_ms
+    print(f"{'total':<22}{old_total:>10.1f}{new_total:>10.1f}   ({old_total / new_total:.1f}x)")
+    print(f"{'body bytes':<22}{len(old_body):>10}{len(new_body):>10}\n")
+
+    print(f"{'encoding':<22}{'bytes':>10}{'ms':>10}{'ratio':>10}")
+    print(f"{'identity':<22}{len(new_body):>10}{0.0:>10.1f}{1.0:>10.2f}")
+    for encoding in ['gzip'] + (['br'] if brotli else []):
+        compress_ms, compressed = timed(lambda: compress(new_body, encoding), args.repeat)
+        print(f"{encoding:<22}{len(compressed):>10}{compress_ms:>10.1f}{len(new_body) / len(compressed):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Cold-Start Benchmark for the Flask App
+
+Imports app.py in fresh interpreters with `python -X importtime`, reports the slowest
+imports and the time to the first /api/system/status response, and fails when the
+import exceeds the budget or pulls in modules that should only load on first use.
+
+    python benchmark_startup.py --runs 5 --budget-ms 500
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Loaded by the components on first use, never by importing the app
+DEFERRED_MODULES = ['pandas', 'numpy', 'openpyxl', 'google.generativeai', 'win32com', 'cryptography']
+
+APP_DIR = Path(__file__).resolve().parent
+
+IMPORT_SCRIPT = """
+import sys
+sys.path.insert(0, {app_dir!r})
+import app
+print('LOADED', ','.join(name for name in {deferred!r} if name in sys.modules))
+"""
+
+REQUEST_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, {app_dir!r})
+import app
+response = app.app.test_client().get('/api/system/status')
+print('FIRST_RESPONSE', response.status_code, (time.perf_counter() - started) * 1000)
+"""
+
+
+def parse_importtime(stderr):
+    """(self_us, cumulative_us, depth, module) per line of -X importtime output"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return imports
+
+
+def run(script, workdir):
+    """Run a script in a fresh interpreter; returns (stdout, stderr, wall ms)"""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], cwd=workdir,
+                               capture_output=True, text=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr[-2000:])
+    return completed.stdout, completed.stderr, elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Measure and budget the app's cold start")
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--budget-ms', type=float, default=500.0, help="Maximum median import time of app")
+    arg_parser.add_argument('--top', type=int, default=15, help="Slowest imports to list")
+    args = arg_parser.parse_args()
+
+    import_ms = []
+    wall_ms = []
+    first_response_ms = []
+    loaded = set()
+    last_imports = []
+    for _ in range(args.runs):
+        # A fresh working directory each time, so data/ starts empty as on a new install
+        with tempfile.TemporaryDirectory() as workdir:
+            stdout, stderr, elapsed = run(IMPORT_SCRIPT.format(app_dir=str(APP_DIR), deferred=DEFERRED_MODULES), workdir)
+            imports = parse_importtime(stderr)
+            import_ms.append(next(cumulative for _, cumulative, _, name in imports if name == 'app') / 1000)
+            wall_ms.append(elapsed)
+            loaded.update(name for name in stdout.split('LOADED', 1)[1].strip().split(',') if name)
+            last_imports = imports
+
+            stdout, _, _ = run(REQUEST_SCRIPT.format(app_dir=str(APP_DIR)), workdir)
+            first_response_ms.append(float(stdout.split('FIRST_RESPONSE', 1)[1].split()[1]))
+
+    median_import = statistics.median(import_ms)
+    print(f"import app:          median {median_import:.0f} ms (min {min(import_ms):.0f}, max {max(import_ms):.0f}) "
+          f"over {args.runs} runs")
+    print(f"interpreter + import: median {statistics.median(wall_ms):.0f} ms wall")
+    print(f"first status reply:  median {statistics.median(first_response_ms):.0f} ms after interpreter start\n")
+
+    print(f"Slowest top-level imports of app (cumulative ms, last run):")
+    app_depth = next(depth for _, _, depth, name in last_imports if name == 'app')
+    direct = [(cumulative, name) for _, cumulative, depth, name in last_imports if depth == app_depth + 1]
+    for cumulative, name in sorted(direct, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+
+    failed = False
+    if loaded:
+        print(f"\nFAIL: importing app loaded deferred modules: {', '.join(sorted(loaded))}")
+        failed = True
+    if median_import > args.budget_ms:
+        print(f"\nFAIL: median import {median_import:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print(f"\nOK: under the {args.budget_ms:.0f} ms budget, no deferred modules loaded")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
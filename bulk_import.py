@@ -0,0 +1,352 @@
+"""
+Bulk Import of Jobs, CVs and Candidates from Uploaded CSV or xlsx Files
+"""
+import codecs
+import csv
+import os
+import re
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+import openpyxl
+
+from excel_manager import CV_COLUMNS, MASTER_COLUMNS
+
+FILE_FORMATS = {'.csv': 'csv', '.txt': 'csv', '.tsv': 'csv', '.xlsx': 'xlsx', '.xlsm': 'xlsx'}
+
+# Fields each target accepts, the ones a row must have, the field that names a row in
+# results, and common job-board headers for them (headers are compared normalised)
+IMPORT_TARGETS = {
+    'jobs': {
+        'fields': MASTER_COLUMNS,
+        'required': ['Job Title'],
+        'label': 'Job Title',
+        'aliases': {
+            'title': 'Job Title', 'position': 'Job Title', 'positiontitle': 'Job Title', 'role': 'Job Title',
+            'location': 'Job Location (Country)', 'country': 'Job Location (Country)',
+            'joblocation': 'Job Location (Country)',
+            'project': 'Project Name',
+            'salary': 'Max Budgeted Salary', 'maxsalary': 'Max Budgeted Salary', 'budget': 'Max Budgeted Salary',
+            'manager': 'Hiring Manager',
+            'status': 'Job Status',
+            'dateposted': 'Position Created Date', 'posteddate': 'Position Created Date',
+            'createddate': 'Position Created Date', 'datecreated': 'Position Created Date'
+        }
+    },
+    'cvs': {
+        'fields': [column for column in CV_COLUMNS if column != 'Last Modified'],
+        'required': ['JobID', 'Candidate Name'],
+        'label': 'Candidate Name',
+        'aliases': {
+            'name': 'Candidate Name', 'candidate': 'Candidate Name', 'fullname': 'Candidate Name',
+            'applicant': 'Candidate Name', 'applicantname': 'Candidate Name',
+            'emailaddress': 'Email',
+            'phone': 'Mobile', 'phonenumber': 'Mobile', 'mobilenumber': 'Mobile', 'contactnumber': 'Mobile',
+            'location': 'Current Location', 'city': 'Current Location',
+            'source': 'CV Source',
+            'status': 'Application Status',
+            'notice': 'Notice Period',
+            'dateapplied': 'Date CV Shared', 'applieddate': 'Date CV Shared', 'applicationdate': 'Date CV Shared'
+        }
+    },
+    'candidates': {
+        'fields': ['name', 'email', 'mobile', 'current_location', 'nationality', 'notice_period'],
+        'required': ['name'],
+        'label': 'name',
+        'aliases': {
+            'candidate': 'name', 'candidatename': 'name', 'fullname': 'name', 'applicant': 'name',
+            'applicantname': 'name',
+            'emailaddress': 'email',
+            'phone': 'mobile', 'phonenumber': 'mobile', 'mobilenumber': 'mobile', 'contactnumber': 'mobile',
+            'location': 'current_location', 'city': 'current_location', 'country': 'current_location',
+            'citizenship': 'nationality',
+            'notice': 'notice_period', 'availability': 'notice_period'
+        }
+    }
+}
+
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%d-%b-%Y', '%d %b %Y', '%d %B %Y', '%b %d, %Y']
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def normalise_header(name):
+    """Header text compared without case, spaces or punctuation"""
+    return re.sub(r'[^a-z0-9]', '', str(name or '').lower())
+
+
+def map_columns(header, target, mapping=None):
+    """
+    Match file columns to the target's fields, by explicit mapping first
+    ({"file column": "field"}, a blank field skips the column), then by name or alias.
+    Returns (columns, unmapped, message); columns is {column index: field}, or None
+    when the mapping is invalid or a required field has no column.
+    """
+    spec = IMPORT_TARGETS[target]
+    known = {normalise_header(field): field for field in spec['fields']}
+    for alias, field in spec['aliases'].items():
+        known.setdefault(alias, field)
+
+    explicit = {}
+    for source, field in (mapping or {}).items():
+        if field and field not in spec['fields']:
+            return None, [], f"Unknown {target} field in mapping: {field}"
+        explicit[normalise_header(source)] = field
+
+    columns = {}
+    unmapped = []
+    for index, name in enumerate(header):
+        key = normalise_header(name)
+        field = explicit[key] if key in explicit else known.get(key)
+        if field and field not in columns.values():
+            columns[index] = field
+        elif key:
+            unmapped.append(str(name))
+
+    missing = [field for field in spec['required'] if field not in columns.values()]
+    if missing:
+        return None, unmapped, f"No column for required field(s): {', '.join(missing)}"
+    return columns, unmapped, "Columns mapped"
+
+
+def clean_value(value):
+    """Cell value with blanks as None and whole-number floats (phone numbers, IDs) as ints"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def parse_date(value):
+    """Date from a date cell or common date text, or None if it is not one"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value)
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def validate_row(values, columns, target):
+    """Record for one file row, or (None, error) listing every problem in it"""
+    spec = IMPORT_TARGETS[target]
+    record = {}
+    problems = []
+    for index, field in columns.items():
+        value = clean_value(values[index]) if index < len(values) else None
+        if value is None:
+            continue
+        if 'Date' in field:
+            parsed = parse_date(value)
+            if parsed is None:
+                problems.append(f"Invalid date in {field}: {value}")
+                continue
+            value = parsed
+        elif field.lower() == 'email' and not EMAIL_PATTERN.match(str(value)):
+            problems.append(f"Invalid email: {value}")
+            continue
+        elif target == 'candidates' or field in ('JobID', 'Mobile'):
+            value = str(value)
+        record[field] = value
+
+    problems.extend(f"Missing {field}" for field in spec['required'] if field not in record)
+    if problems:
+        return None, '; '.join(problems)
+    return record, None
+
+
+def detect_encoding(path, block_size=1024 * 1024):
+    """utf-8 (with or without BOM) when the whole file decodes as it, else cp1252 as Excel writes"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open(path, 'rb') as handle:
+            while True:
+                block = handle.read(block_size)
+                decoder.decode(block, final=not block)
+                if not block:
+                    return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def count_lines(path, block_size=1024 * 1024):
+    """Line count of a text file, read in blocks"""
+    lines = 0
+    last = b''
+    with open(path, 'rb') as handle:
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                break
+            lines += block.count(b'\n')
+            last = block
+    return lines + (1 if last and not last.endswith(b'\n') else 0)
+
+
+def read_rows(path, file_format):
+    """(row number, values) for every row of the file, header first, without loading it whole"""
+    if file_format == 'xlsx':
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            for number, values in enumerate(workbook.active.iter_rows(values_only=True), start=1):
+                yield number, values
+        finally:
+            workbook.close()
+        return
+
+    with open(path, newline='', encoding=detect_encoding(path)) as handle:
+        sample = handle.read(64 * 1024)
+        handle.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t|')
+        except csv.Error:
+            dialect = csv.excel
+        for number, values in enumerate(csv.reader(handle, dialect), start=1):
+            yield number, values
+
+
+class BulkImporter:
+    """
+    Imports jobs, CVs or candidates from an uploaded file. The upload is saved and its
+    header mapped while the request waits; the rows are then read in chunks, validated
+    and passed to the batched insert of each target by a background task.
+    """
+
+    def __init__(self, excel_manager, db, chunk_size=500):
+        self.excel_manager = excel_manager
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def prepare(self, target, upload, mapping=None):
+        """
+        Save an uploaded file and map its columns. Returns (plan, message); plan is
+        None when the file cannot be imported.
+        """
+        if target not in IMPORT_TARGETS:
+            return None, f"Invalid import target, use one of: {', '.join(IMPORT_TARGETS)}"
+        extension = Path(upload.filename or '').suffix.lower()
+        if extension not in FILE_FORMATS:
+            return None, "Unsupported file type, upload a .csv or .xlsx file"
+
+        handle, path = tempfile.mkstemp(prefix='import-', suffix=extension)
+        os.close(handle)
+        upload.save(path)
+        file_format = FILE_FORMATS[extension]
+        try:
+            rows = read_rows(path, file_format)
+            try:
+                header = next(rows, (None, None))[1]
+            finally:
+                rows.close()
+            if not header or not any(clean_value(name) for name in header):
+                raise ValueError("File has no header row")
+            columns, unmapped, message = map_columns(header, target, mapping)
+            if columns is None:
+                raise ValueError(message)
+
+            if file_format == 'xlsx':
+                workbook = openpyxl.load_workbook(path, read_only=True)
+                total = max((workbook.active.max_row or 1) - 1, 0)
+                workbook.close()
+            else:
+                total = max(count_lines(path) - 1, 0)
+        except Exception as e:
+            os.remove(path)
+            return None, f"Could not import {upload.filename}: {e}"
+
+        return {
+            'target': target,
+            'path': path,
+            'format': file_format,
+            'columns': columns,
+            'unmapped': unmapped,
+            'total': total
+        }, message
+
+    def chunks(self, plan):
+        """
+        Non-blank rows of a prepared file in chunks of (row number, values); removes the file when done.
+        Jobs and CVs are staged on one tracker transaction for the whole import and written once at
+        the end, rather than rewriting the workbook for every chunk.
+        """
+        rows = read_rows(plan['path'], plan['format'])
+        transaction = None
+        try:
+            if plan['target'] in ('jobs', 'cvs'):
+                transaction = self.excel_manager.transaction()
+                plan['transaction'] = transaction.__enter__()
+            next(rows, None)  # Header
+            chunk = []
+            for number, values in rows:
+                if not any(clean_value(value) is not None for value in values):
+                    continue
+                chunk.append((number, values))
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            rows.close()
+            os.remove(plan['path'])
+            if transaction is not None:
+                plan.pop('transaction', None)
+                # Committed on errors and cancels too, so the rows already reported as added are kept
+                transaction.__exit__(None, None, None)
+
+    def discard(self, plan):
+        """Remove the file of a plan that will not be imported"""
+        Path(plan['path']).unlink(missing_ok=True)
+
+    def handler(self, plan):
+        """Task handler validating a chunk of rows and adding the valid ones in one batch"""
+        target = plan['target']
+        columns = plan['columns']
+        label = IMPORT_TARGETS[target]['label']
+        label_index = next(index for index, field in columns.items() if field == label)
+
+        def insert(records):
+            if target == 'candidates':
+                return self.db.add_candidates_bulk(records)
+            transaction = plan.get('transaction')
+            if transaction is None:
+                add = self.excel_manager.add_jobs_bulk if target == 'jobs' else self.excel_manager.add_cvs_bulk
+                return add(records)
+            return transaction.add_jobs(records) if target == 'jobs' else transaction.add_cvs(records)
+
+        def import_chunk(rows):
+            results = []
+            records = []
+            for number, values in rows:
+                record, error = validate_row(values, columns, target)
+                name = clean_value(values[label_index]) if label_index < len(values) else None
+                result = {'row': number, 'name': name, 'id': None, 'success': False}
+                if record is None:
+                    result['error'] = error
+                else:
+                    records.append((record, result))
+                results.append(result)
+
+            if records:
+                added = insert([record for record, _ in records])
+                for (record, result), (record_id, message) in zip(records, added):
+                    result['id'] = record_id
+                    result['success'] = record_id is not None
+                    result['message' if record_id else 'error'] = message
+            return results
+
+        return import_chunk
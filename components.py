@@ -0,0 +1,66 @@
+"""
+Lazily Built Application Components
+"""
+import threading
+
+
+class Components:
+    """
+    Registry of named factories. Each component is built on first use, once, even
+    when several request threads ask for it together; factories may use other
+    components through get().
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._lock = threading.RLock()
+
+    def factory(self, name):
+        """Decorator registering the function that builds `name`"""
+        def register(function):
+            self._factories[name] = function
+            return function
+        return register
+
+    def get(self, name):
+        """The component, built now if this is its first use"""
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._instances:
+                if name not in self._factories:
+                    raise KeyError(f"No factory for component: {name}")
+                self._instances[name] = self._factories[name]()
+            return self._instances[name]
+
+    def built(self, name):
+        """Whether the component exists yet, without building it"""
+        return name in self._instances
+
+    def proxy(self, name):
+        """Stand-in that builds the component when an attribute is first used"""
+        return LazyProxy(self, name)
+
+
+class LazyProxy:
+    """Forwards attribute access to a component, so module globals can name it before it exists"""
+
+    def __init__(self, components, name):
+        object.__setattr__(self, '_components', components)
+        object.__setattr__(self, '_name', name)
+
+    def _target(self):
+        return self._components.get(self._name)
+
+    def __getattr__(self, attribute):
+        return getattr(self._target(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._target(), attribute, value)
+
+    def __repr__(self):
+        state = 'built' if self._components.built(self._name) else 'not built'
+        return f"<lazy {self._name} ({state})>"
@@ -0,0 +1,96 @@
+"""
+Conversation-level batching of recruitment emails for AI extraction
+"""
+import threading
+import time
+from datetime import datetime
+
+from dateutil import parser
+
+from email_text import normalise_subject
+
+
+def conversation_key(email_data):
+    """Group key for an email: conversation ID if known, else normalised subject"""
+    conversation_id = email_data.get('conversation_id')
+    if conversation_id:
+        return f"conv:{conversation_id}"
+
+    return f"subj:{normalise_subject(email_data.get('subject'))}"
+
+
+def received_at(email_data):
+    """
+    Received time as a naive local datetime, whether it is a datetime or the text it
+    became in the work queue's JSON; datetime.min when missing or unreadable
+    """
+    value = email_data.get('received_time')
+    if not isinstance(value, datetime):
+        try:
+            value = parser.parse(str(value)) if value else None
+        except (ValueError, OverflowError):
+            value = None
+    if value is None:
+        return datetime.min
+    # Compare offsets on one clock: convert aware times to local, as naive ones already are
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+class ConversationBatcher:
+    """Debounce emails per conversation and release each thread as one batch"""
+
+    def __init__(self, window_seconds=120, max_wait_seconds=600, max_batch=10):
+        self.window_seconds = window_seconds      # Quiet period before a thread is released
+        self.max_wait_seconds = max_wait_seconds  # Release busy threads after this long anyway
+        self.max_batch = max_batch                # Release threads that reach this many messages
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def add(self, email_data, now=None):
+        """Add an email to its conversation and return the conversation key"""
+        now = time.time() if now is None else now
+        key = conversation_key(email_data)
+
+        with self._lock:
+            batch = self._pending.setdefault(key, {'emails': [], 'first_seen': now, 'last_seen': now})
+            batch['emails'].append(email_data)
+            batch['last_seen'] = now
+
+        return key
+
+    def pop_due(self, now=None):
+        """Remove and return the conversations that are ready to be processed"""
+        now = time.time() if now is None else now
+        due = []
+
+        with self._lock:
+            for key, batch in list(self._pending.items()):
+                if (now - batch['last_seen'] >= self.window_seconds or
+                        now - batch['first_seen'] >= self.max_wait_seconds or
+                        len(batch['emails']) >= self.max_batch):
+                    due.append(self._release(key))
+
+        return due
+
+    def pop_all(self):
+        """Remove and return every pending conversation"""
+        with self._lock:
+            return [self._release(key) for key in list(self._pending)]
+
+    def held(self):
+        """Emails waiting in open conversations"""
+        with self._lock:
+            return [email_data for batch in self._pending.values() for email_data in batch['emails']]
+
+    def pending_count(self):
+        """Number of emails waiting in open conversations"""
+        with self._lock:
+            return sum(len(batch['emails']) for batch in self._pending.values())
+
+    def _release(self, key):
+        emails = self._pending.pop(key)['emails']
+        # Oldest first so the latest message wins when merging
+        emails.sort(key=received_at)
+        return emails
@@ -0,0 +1,168 @@
+"""
+Content-hash deduplication of recruitment emails across folders
+"""
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from email_text import is_forward, message_segments, normalise_subject, normalise_whitespace
+
+class EmailDeduplicator:
+    """Persistent, size-bounded LRU of email content fingerprints"""
+
+    def __init__(self, db_path="data/email_pipeline.db", capacity=5000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.capacity = capacity
+        self.skipped = 0  # Duplicates skipped since start
+        self._pending = {}  # Checked but not yet recorded (still being analysed): fingerprint -> (hits, folders)
+        self._lock = threading.Lock()
+        self.init_database()
+
+    def get_connection(self):
+        """Get database connection"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        """Initialize fingerprint table"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS email_fingerprints (
+                fingerprint TEXT PRIMARY KEY,
+                subject TEXT,
+                folders TEXT,
+                hits INTEGER DEFAULT 1,
+                first_seen TIMESTAMP,
+                last_seen TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fingerprints_last_seen
+            ON email_fingerprints (last_seen)
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def fingerprint(self, email_data):
+        """
+        Hash the normalised subject and body plus attachment names and sizes. Reply history
+        is stripped but forwarded messages are kept, so two forwards with the same covering
+        note are told apart by what they forward.
+        """
+        subject = email_data.get('subject', '')
+        segments = message_segments(email_data.get('body', ''), forwarded=is_forward(subject))
+        body = normalise_whitespace('\n'.join(segments)).lower()
+        attachments = sorted(
+            (str(att.get('filename', '')).lower(), int(att.get('size') or 0))
+            for att in email_data.get('attachments') or []
+        )
+
+        # Nothing to compare on, so never treat it as a duplicate
+        if not body and not attachments:
+            return None
+
+        content = '\n'.join([normalise_subject(subject), body] + [f"{name}:{size}" for name, size in attachments])
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def check(self, email_data, record=True):
+        """
+        Return (is_duplicate, hits) for an email's content. With record=False the
+        fingerprint is only held as pending, so copies seen meanwhile are skipped,
+        until record() (once analysed) or release() (failed, may be seen again).
+        """
+        fingerprint = self.fingerprint(email_data)
+        if not fingerprint:
+            return False, 0
+        email_data['fingerprint'] = fingerprint
+
+        now = datetime.now().isoformat()
+        folder = email_data.get('folder', '')
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                "SELECT folders, hits FROM email_fingerprints WHERE fingerprint = ?",
+                (fingerprint,)
+            )
+            row = cursor.fetchone()
+
+            if row:
+                # Merge this sighting into the existing entry
+                folders = set(filter(None, (row[0] or '').split(',')))
+                folders.add(folder)
+                hits = row[1] + 1
+                cursor.execute(
+                    "UPDATE email_fingerprints SET folders = ?, hits = ?, last_seen = ? WHERE fingerprint = ?",
+                    (','.join(sorted(folders)), hits, now, fingerprint)
+                )
+                conn.commit()
+                self.skipped += 1
+                return True, hits
+
+            with self._lock:
+                if fingerprint in self._pending:
+                    # Counted here and stored with the fingerprint when it is recorded
+                    hits, folders = self._pending[fingerprint]
+                    self._pending[fingerprint] = (hits + 1, folders | {folder})
+                    self.skipped += 1
+                    return True, hits + 1
+                if not record:
+                    self._pending[fingerprint] = (1, {folder})
+                    return False, 1
+
+            self._insert(cursor, fingerprint, email_data.get('subject', ''), {folder}, now)
+            conn.commit()
+            return False, 1
+        finally:
+            conn.close()
+
+    def record(self, email_data):
+        """Store the fingerprint of an email that has been analysed"""
+        fingerprint = email_data.get('fingerprint') or self.fingerprint(email_data)
+        if not fingerprint:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            hits, folders = self._pending.get(fingerprint, (1, {email_data.get('folder', '')}))
+        conn = self.get_connection()
+        try:
+            self._insert(conn.cursor(), fingerprint, email_data.get('subject', ''), folders, now, hits)
+            conn.commit()
+        finally:
+            conn.close()
+            self.release(email_data)
+
+    def release(self, email_data):
+        """Forget a pending fingerprint, so the email is analysed again when next seen"""
+        with self._lock:
+            self._pending.pop(email_data.get('fingerprint'), None)
+
+    def _insert(self, cursor, fingerprint, subject, folders, now, hits=1):
+        cursor.execute(
+            """INSERT OR IGNORE INTO email_fingerprints (fingerprint, subject, folders, hits, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?)""",
+            (fingerprint, subject, ','.join(sorted(filter(None, folders))), hits, now, now)
+        )
+
+        # Evict least recently seen entries beyond capacity
+        cursor.execute("""
+            DELETE FROM email_fingerprints WHERE fingerprint IN (
+                SELECT fingerprint FROM email_fingerprints
+                ORDER BY last_seen DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.capacity,))
+
+    def count(self):
+        """Number of fingerprints stored"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM email_fingerprints")
+        result = cursor.fetchone()[0]
+        conn.close()
+        return result
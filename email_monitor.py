@@ -1,236 +1,335 @@
-"""
-Email Monitor for Outlook Integration with Activity Tracking
-"""
-import win32com.client
-import pythoncom
-import threading
-import queue
-import time
-from datetime import datetime
-import re
-
-class EmailMonitor:
-    def __init__(self, ai_processor=None):
-        self.ai_processor = ai_processor
-        self.monitoring = False
-        self.email_queue = queue.Queue()
-        self.monitor_thread = None
-        self.activity_log = []  # Store email activity
-        self.max_activities = 50  # Keep last 50 activities
-        
-    def start_monitoring(self):
-        """Start email monitoring"""
-        if not self.monitoring:
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self._monitor_emails)
-            self.monitor_thread.daemon = True
-            self.monitor_thread.start()
-            self.add_activity("system", "Email monitoring started")
-            return True
-        return False
-    
-    def stop_monitoring(self):
-        """Stop email monitoring"""
-        self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
-        self.add_activity("system", "Email monitoring stopped")
-        return True
-    
-    def add_activity(self, activity_type, message, email_subject=None):
-        """Add activity to the log"""
-        activity = {
-            'timestamp': datetime.now().isoformat(),
-            'type': activity_type,
-            'message': message,
-            'subject': email_subject
-        }
-        
-        self.activity_log.append(activity)
-        
-        # Keep only last N activities
-        if len(self.activity_log) > self.max_activities:
-            self.activity_log = self.activity_log[-self.max_activities:]
-    
-    def get_activities(self):
-        """Get recent activities"""
-        return self.activity_log[-20:]  # Return last 20 activities
-    
-    def _monitor_emails(self):
-        """Monitor emails in background thread"""
-        pythoncom.CoInitialize()
-        
-        try:
-            outlook = win32com.client.Dispatch("Outlook.Application")
-            namespace = outlook.GetNamespace("MAPI")
-            
-            # Monitor Inbox
-            inbox = namespace.GetDefaultFolder(6)  # 6 = Inbox
-            sent = namespace.GetDefaultFolder(5)   # 5 = Sent Items
-            
-            self.add_activity("system", "Connected to Outlook successfully")
-            
-            # Get initial message counts
-            inbox_count = inbox.Items.Count
-            sent_count = sent.Items.Count
-            
-            self.add_activity("system", f"Monitoring started - Inbox: {inbox_count} emails, Sent: {sent_count} emails")
-            
-            while self.monitoring:
-                try:
-                    # Check for new emails in Inbox
-                    current_inbox_count = inbox.Items.Count
-                    if current_inbox_count > inbox_count:
-                        # Process new emails
-                        for i in range(inbox_count + 1, current_inbox_count + 1):
-                            try:
-                                message = inbox.Items[i]
-                                self.add_activity("inbox", f"New email from {message.SenderName}", message.Subject)
-                                self._process_email(message, "Inbox")
-                            except Exception as e:
-                                self.add_activity("error", f"Error processing inbox email: {str(e)}")
-                        inbox_count = current_inbox_count
-                    
-                    # Check for new emails in Sent Items
-                    current_sent_count = sent.Items.Count
-                    if current_sent_count > sent_count:
-                        # Process new emails
-                        for i in range(sent_count + 1, current_sent_count + 1):
-                            try:
-                                message = sent.Items[i]
-                                # Get first recipient name
-                                to_name = message.Recipients[1].Name if message.Recipients.Count > 0 else "Unknown"
-                                self.add_activity("sent", f"Email sent to {to_name}", message.Subject)
-                                self._process_email(message, "Sent")
-                            except Exception as e:
-                                self.add_activity("error", f"Error processing sent email: {str(e)}")
-                        sent_count = current_sent_count
-                    
-                    time.sleep(5)  # Check every 5 seconds
-                    
-                except Exception as e:
-                    self.add_activity("error", f"Monitoring error: {str(e)}")
-                    time.sleep(10)
-                    
-        except Exception as e:
-            self.add_activity("error", f"Failed to connect to Outlook: {str(e)}")
-        finally:
-            pythoncom.CoUninitialize()
-    
-    def _process_email(self, message, folder):
-        """Process individual email"""
-        try:
-            email_data = {
-                'folder': folder,
-                'subject': message.Subject,
-                'sender': message.SenderEmailAddress,
-                'sender_name': message.SenderName,
-                'recipients': self._get_recipients(message),
-                'body': message.Body,
-                'received_time': message.ReceivedTime,
-                'attachments': self._get_attachments(message)
-            }
-            
-            # Check if recruitment related
-            if self._is_recruitment_email(email_data):
-                self.email_queue.put(email_data)
-                
-                # Determine what type of recruitment email
-                recruitment_type = self._determine_recruitment_type(email_data)
-                self.add_activity("recruitment", f"Recruitment email detected: {recruitment_type}", email_data['subject'])
-                
-                # Process with AI if processor available
-                if self.ai_processor:
-                    self.add_activity("ai", f"Starting AI analysis for {recruitment_type}", email_data['subject'])
-                    result = self.ai_processor.process_email(email_data)
-                    if result:
-                        # Add specific processing results
-                        if result.get('candidate_name'):
-                            self.add_activity("ai", f"Extracted candidate: {result['candidate_name']}", email_data['subject'])
-                        if result.get('position'):
-                            self.add_activity("ai", f"Position identified: {result['position']}", email_data['subject'])
-                        if result.get('interview_date'):
-                            self.add_activity("ai", f"Interview scheduled: {result['interview_date']}", email_data['subject'])
-                        if result.get('action_taken'):
-                            self.add_activity("ai", f"Action: {result['action_taken']}", email_data['subject'])
-                        else:
-                            self.add_activity("ai", "AI processing completed", email_data['subject'])
-                    else:
-                        self.add_activity("ai", "AI processing completed - no action needed", email_data['subject'])
-            else:
-                # Show why it was skipped
-                self.add_activity("skip", f"Non-recruitment email (no keywords matched)", email_data['subject'][:50] + "...")
-                    
-        except Exception as e:
-            self.add_activity("error", f"Error processing email: {str(e)}")
-    
-    def _determine_recruitment_type(self, email_data):
-        """Determine the type of recruitment email"""
-        text = f"{email_data['subject']} {email_data['body']}".lower()
-        
-        if any(word in text for word in ['cv', 'resume', 'profile', 'candidate']):
-            if 'attached' in text or email_data['attachments']:
-                return "CV Submission"
-            return "Candidate Information"
-        elif 'interview' in text:
-            if any(word in text for word in ['schedule', 'confirm', 'arrange']):
-                return "Interview Scheduling"
-            elif any(word in text for word in ['feedback', 'result', 'decision']):
-                return "Interview Feedback"
-            return "Interview Related"
-        elif 'offer' in text:
-            return "Job Offer"
-        elif 'feedback' in text:
-            return "Feedback"
-        elif any(word in text for word in ['job', 'position', 'vacancy', 'opening']):
-            return "Job Posting"
-        else:
-            return "General Recruitment"
-    
-    def _get_recipients(self, message):
-        """Extract email recipients"""
-        recipients = []
-        try:
-            for recipient in message.Recipients:
-                recipients.append({
-                    'name': recipient.Name,
-                    'email': recipient.Address
-                })
-        except:
-            pass
-        return recipients
-    
-    def _get_attachments(self, message):
-        """Extract attachment information"""
-        attachments = []
-        try:
-            for attachment in message.Attachments:
-                attachments.append({
-                    'filename': attachment.FileName,
-                    'size': attachment.Size
-                })
-        except:
-            pass
-        return attachments
-    
-    def _is_recruitment_email(self, email_data):
-        """Check if email is recruitment related"""
-        keywords = [
-            'cv', 'resume', 'candidate', 'interview', 'recruitment',
-            'hiring', 'job', 'position', 'application', 'offer',
-            'feedback', 'shortlist', 'profile', 'vacancy'
-        ]
-        
-        text = f"{email_data['subject']} {email_data['body']}".lower()
-        
-        return any(keyword in text for keyword in keywords)
-    
-    def get_pending_emails(self):
-        """Get pending emails from queue"""
-        emails = []
-        while not self.email_queue.empty():
-            try:
-                emails.append(self.email_queue.get_nowait())
-            except:
-                break
-        return emails
\ No newline at end of file
+"""
+Email Monitor for Outlook Integration with Activity Tracking
+"""
+import os
+import socket
+import threading
+import time
+
+from mail_backend import OutlookBackend, StagedMessage
+from email_dedupe import EmailDeduplicator
+from conversation_batcher import ConversationBatcher
+from work_queue import FAILED, WorkQueue
+from activity_log import ActivityLog
+import metrics
+
+RECRUITMENT_KEYWORDS = [
+    'cv', 'resume', 'candidate', 'interview', 'recruitment',
+    'hiring', 'job', 'position', 'application', 'offer',
+    'feedback', 'shortlist', 'profile', 'vacancy'
+]
+
+class EmailMonitor:
+    def __init__(self, ai_processor=None, backend=None, scan_body=True, deduplicator=None,
+                 conversation_window=120, work_queue=None, activity_log=None, ignored_senders=None):
+        self.ai_processor = ai_processor
+        # Sender address fragments to skip unread (e.g. 'mailer-daemon'); none by default, since
+        # job boards send application notifications from no-reply addresses
+        self.ignored_senders = [pattern.lower() for pattern in (ignored_senders or [])]
+        self.backend = backend or OutlookBackend()
+        self.deduplicator = deduplicator or EmailDeduplicator()
+        # Messages in one thread are held for this many seconds and analysed together
+        self.conversation_batcher = ConversationBatcher(window_seconds=conversation_window)
+        self.scan_body = scan_body  # Fall back to a body keyword scan when the subject has no match
+        self.monitoring = False
+        self.connected = False  # The monitor thread has the mail backend open
+        self.work_queue = work_queue or WorkQueue()  # Durable queue of emails awaiting AI analysis
+        self.monitor_thread = None
+        self.worker_thread = None
+        self.activity_log = activity_log or ActivityLog()  # Shared with other server processes
+        
+    def start_monitoring(self):
+        """Start email monitoring"""
+        if not self.monitoring:
+            self.monitoring = True
+            self.monitor_thread = threading.Thread(target=self._monitor_emails)
+            self.monitor_thread.daemon = True
+            self.monitor_thread.start()
+            
+            # Drain the work queue in this process as well
+            if self.ai_processor:
+                self.worker_thread = threading.Thread(target=self.run_worker, args=(lambda: self.monitoring,))
+                self.worker_thread.daemon = True
+                self.worker_thread.start()
+            self.add_activity("system", "Email monitoring started")
+            return True
+        return False
+    
+    def stop_monitoring(self):
+        """Stop email monitoring"""
+        self.monitoring = False
+        if self.monitor_thread:
+            self.monitor_thread.join(timeout=5)
+        if self.worker_thread:
+            self.worker_thread.join(timeout=5)
+        self.add_activity("system", "Email monitoring stopped")
+        return True
+    
+    def is_running(self):
+        """True while monitoring is on and the monitor thread is connected to the mail backend"""
+        return self.monitoring and self.connected and bool(self.monitor_thread and self.monitor_thread.is_alive())
+    
+    def add_activity(self, activity_type, message, email_subject=None):
+        """Add activity to the log"""
+        self.activity_log.add(activity_type, message, email_subject)
+    
+    def get_activities(self):
+        """Get recent activities"""
+        return self.activity_log.recent(20)  # Return last 20 activities
+    
+    def _monitor_emails(self):
+        """Monitor emails in background thread"""
+        try:
+            self.backend.open()
+            self.connected = True
+            
+            self.add_activity("system", f"Connected to {self.backend.name} successfully")
+            
+            # Get initial message counts
+            counts = {folder: self.backend.count(folder) for folder in self.backend.folders}
+            
+            self.add_activity("system", "Monitoring started - " + ", ".join(
+                f"{folder}: {count} emails" for folder, count in counts.items()
+            ))
+            
+            while self.monitoring:
+                try:
+                    for folder in self.backend.folders:
+                        # Check for new emails in folder
+                        current_count = self.backend.count(folder)
+                        if current_count > counts[folder]:
+                            # Process new emails
+                            for i in range(counts[folder] + 1, current_count + 1):
+                                try:
+                                    message = StagedMessage(self.backend, self.backend.get_message(folder, i), folder)
+                                    # Sent items are logged once the prefilter keeps them, so the rest cost no recipient fetch
+                                    if folder != "Sent":
+                                        self.add_activity("inbox", f"New email from {message.sender_name}", message.subject)
+                                    self._process_email(message, folder)
+                                except Exception as e:
+                                    self.add_activity("error", f"Error processing {folder.lower()} email: {str(e)}")
+                            counts[folder] = current_count
+                    
+                    time.sleep(5)  # Check every 5 seconds
+                    
+                except Exception as e:
+                    self.add_activity("error", f"Monitoring error: {str(e)}")
+                    time.sleep(10)
+                    
+        except Exception as e:
+            self.add_activity("error", f"Failed to connect to {self.backend.name}: {str(e)}")
+        finally:
+            self.connected = False
+            self.backend.close()
+    
+    @metrics.timed('email_monitor', 'process_email')
+    def _process_email(self, message, folder):
+        """Process individual email"""
+        try:
+            # Check if recruitment related, loading the body only if the headers are inconclusive
+            if self._is_recruitment_email(message):
+                # Only candidates pay for recipients and attachments
+                email_data = message.to_email_data()
+                if folder == "Sent":
+                    recipients = email_data.get('recipients') or []
+                    to_name = recipients[0]['name'] if recipients else "Unknown"
+                    self.add_activity("sent", f"Email sent to {to_name}", email_data['subject'])
+                
+                # Skip content already analysed, or being analysed, from another folder; the
+                # fingerprint is only stored once the analysis succeeds
+                with metrics.timer('email_monitor', 'dedupe'):
+                    is_duplicate, hits = self.deduplicator.check(email_data, record=False)
+                if is_duplicate:
+                    self.add_activity(
+                        "skip",
+                        f"Duplicate content skipped (seen {hits} times, {self.deduplicator.skipped} duplicates skipped so far)",
+                        email_data['subject']
+                    )
+                    return
+                
+                # Determine what type of recruitment email
+                recruitment_type = self._determine_recruitment_type(email_data)
+                email_data['recruitment_type'] = recruitment_type
+                self.add_activity("recruitment", f"Recruitment email detected: {recruitment_type}", email_data['subject'])
+                
+                # Persist for the AI workers, so a crash doesn't lose it
+                try:
+                    with metrics.timer('email_monitor', 'enqueue'):
+                        self.work_queue.enqueue(email_data)
+                except Exception:
+                    self.deduplicator.release(email_data)
+                    raise
+            else:
+                # Show why it was skipped
+                self.add_activity("skip", f"Non-recruitment email (no keywords matched)", message.subject[:50] + "...")
+                    
+        except Exception as e:
+            self.add_activity("error", f"Error processing email: {str(e)}")
+    
+    def run_worker(self, should_run=None, poll_interval=2, batch_size=10):
+        """Drain the email work queue; runs in the monitor process or a separate worker process"""
+        should_run = should_run or (lambda: True)
+        worker_id = f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+        
+        try:
+            while should_run():
+                try:
+                    self._drain_queue(worker_id, batch_size)
+                except Exception as e:
+                    self.add_activity("error", f"Email worker error: {str(e)}")
+                    time.sleep(10)
+                time.sleep(poll_interval)
+        finally:
+            # Don't leave threads waiting for the debounce window
+            self._flush_conversations(force=True)
+    
+    def _drain_queue(self, worker_id, batch_size=10):
+        """Claim a batch of queued emails and analyse conversations that are ready"""
+        # Leave the queue alone until a model is configured, rather than burn attempts
+        if not self.ai_processor or not self.ai_processor.model:
+            return
+        
+        for queue_id, email_data, attempts in self.work_queue.claim(limit=batch_size, worker_id=worker_id):
+            email_data['queue_id'] = queue_id
+            self.conversation_batcher.add(email_data)
+        
+        # Keep emails held for their conversation invisible to other workers
+        self.work_queue.extend([email_data['queue_id'] for email_data in self.conversation_batcher.held()])
+        
+        # Analyse conversations that have gone quiet
+        self._flush_conversations()
+    
+    def _flush_conversations(self, force=False):
+        """Run AI analysis for conversations whose debounce window has passed"""
+        batches = self.conversation_batcher.pop_all() if force else self.conversation_batcher.pop_due()
+        
+        # Threads get one consolidated prompt each; lone emails share batched prompts
+        for emails in batches:
+            if len(emails) > 1:
+                self._settle(emails, self._analyse_conversation)
+        
+        singles = [emails[0] for emails in batches if len(emails) == 1]
+        if singles:
+            self._settle(singles, self._analyse_batch)
+    
+    def _settle(self, emails, analyse):
+        """
+        Run an analysis step and acknowledge or retry the queued emails it covered;
+        the step may return one error (or None) per email when only some failed
+        """
+        try:
+            errors = analyse(emails) or [None] * len(emails)
+        except Exception as e:
+            self.add_activity("error", f"Error analysing emails: {str(e)}", emails[-1]['subject'])
+            errors = [e] * len(emails)
+        
+        done = []
+        for email_data, error in zip(emails, errors):
+            if error is None:
+                done.append(email_data)
+            # A dead-lettered email may be analysed again if it turns up once more
+            elif not email_data.get('queue_id') or self.work_queue.fail(email_data['queue_id'], str(error)) == FAILED:
+                self.deduplicator.release(email_data)
+        
+        self.work_queue.ack([email_data['queue_id'] for email_data in done if email_data.get('queue_id')])
+        for email_data in done:
+            self.deduplicator.record(email_data)
+    
+    @metrics.timed('email_monitor', 'analyse_batch')
+    def _analyse_batch(self, emails):
+        """Send independent emails to the AI processor as a batch and log the outcomes"""
+        for email_data in emails:
+            self.add_activity("ai", f"Starting AI analysis for {email_data['recruitment_type']}", email_data['subject'])
+        
+        results = self.ai_processor.process_email_batch(emails)
+        errors = []
+        for email_data, result in zip(emails, results):
+            if isinstance(result, Exception):
+                self.add_activity("error", f"Error analysing email: {str(result)}", email_data['subject'])
+                errors.append(result)
+            else:
+                self._report_ai_result(result, email_data['subject'])
+                errors.append(None)
+        return errors
+    
+    @metrics.timed('email_monitor', 'analyse_conversation')
+    def _analyse_conversation(self, emails):
+        """Send one conversation to the AI processor and log the outcome"""
+        latest = emails[-1]
+        subject = latest['subject']
+        
+        if len(emails) > 1:
+            self.add_activity("ai", f"Starting AI analysis for {latest['recruitment_type']} ({len(emails)} messages in thread)", subject)
+        else:
+            self.add_activity("ai", f"Starting AI analysis for {latest['recruitment_type']}", subject)
+        
+        result = self.ai_processor.process_conversation(emails)
+        self._report_ai_result(result, subject)
+    
+    def _report_ai_result(self, result, subject):
+        """Add activities describing the AI processing result"""
+        if result:
+            # Add specific processing results
+            if result.get('candidate_name'):
+                self.add_activity("ai", f"Extracted candidate: {result['candidate_name']}", subject)
+            if result.get('position'):
+                self.add_activity("ai", f"Position identified: {result['position']}", subject)
+            if result.get('interview_date'):
+                self.add_activity("ai", f"Interview scheduled: {result['interview_date']}", subject)
+            if result.get('extraction_method') == 'rules':
+                self.add_activity("ai", "Extracted with rules - LLM skipped", subject)
+            if result.get('action_taken'):
+                self.add_activity("ai", f"Action: {result['action_taken']}", subject)
+            else:
+                self.add_activity("ai", "AI processing completed", subject)
+        else:
+            self.add_activity("ai", "AI processing completed - no action needed", subject)
+    
+    def _determine_recruitment_type(self, email_data):
+        """Determine the type of recruitment email"""
+        text = f"{email_data['subject']} {email_data['body']}".lower()
+        
+        if any(word in text for word in ['cv', 'resume', 'profile', 'candidate']):
+            if 'attached' in text or email_data['attachments']:
+                return "CV Submission"
+            return "Candidate Information"
+        elif 'interview' in text:
+            if any(word in text for word in ['schedule', 'confirm', 'arrange']):
+                return "Interview Scheduling"
+            elif any(word in text for word in ['feedback', 'result', 'decision']):
+                return "Interview Feedback"
+            return "Interview Related"
+        elif 'offer' in text:
+            return "Job Offer"
+        elif 'feedback' in text:
+            return "Feedback"
+        elif any(word in text for word in ['job', 'position', 'vacancy', 'opening']):
+            return "Job Posting"
+        else:
+            return "General Recruitment"
+    
+    def _prefilter_headers(self, message):
+        """Header-only prefilter: True/False when decided, None when the body is needed"""
+        sender = (message.sender or '').lower()
+        if any(pattern in sender for pattern in self.ignored_senders):
+            return False
+        
+        subject = message.subject.lower()
+        if any(keyword in subject for keyword in RECRUITMENT_KEYWORDS):
+            return True
+        
+        return None
+    
+    @metrics.timed('email_monitor', 'classify')
+    def _is_recruitment_email(self, message):
+        """Check if email is recruitment related"""
+        decision = self._prefilter_headers(message)
+        if decision is not None:
+            return decision
+        
+        if not self.scan_body:
+            return False
+        
+        text = message.body.lower()
+        
+        return any(keyword in text for keyword in RECRUITMENT_KEYWORDS)
@@ -0,0 +1,157 @@
+"""
+Text helpers for recruitment email bodies
+"""
+import re
+
+# Lines that start the quoted history of a reply
+QUOTE_MARKERS = [
+    re.compile(r'^-{2,}\s*Original Message\s*-{2,}', re.IGNORECASE),
+    re.compile(r'^On .{1,200} wrote:$', re.IGNORECASE),
+]
+
+# Lines that start a forwarded message, followed by its header lines
+FORWARD_MARKERS = [
+    re.compile(r'^-{2,}\s*Forwarded message\s*-{2,}', re.IGNORECASE),
+    re.compile(r'^Begin forwarded message:', re.IGNORECASE),
+]
+
+# Outlook draws a rule above the header block of a reply or forward
+SEPARATOR = re.compile(r'^_{10,}$')
+
+# Outlook style quoted header block ("From: ... / Sent: ... / To: ...")
+FROM_HEADER = re.compile(r'^From:\s*\S', re.IGNORECASE)
+HEADER_CONTINUATION = re.compile(r'^(Sent|Date|To|Cc|Subject):', re.IGNORECASE)
+HEADER_LINE = re.compile(r'^(From|Sent|Date|To|Cc|Subject):', re.IGNORECASE)
+
+# Reply/forward prefixes stripped when comparing subjects
+SUBJECT_PREFIX = re.compile(r'^\s*((re|fw|fwd|aw|sv|tr)\s*(\[\d+\])?\s*:\s*)+', re.IGNORECASE)
+
+# Subject of a forwarded email
+FORWARD_SUBJECT = re.compile(r'^\s*(?:fw|fwd)\s*:', re.IGNORECASE)
+
+
+def _starts_header_block(lines, index):
+    """Check if a From: line is followed by other quoted header lines"""
+    for line in lines[index + 1:index + 4]:
+        if HEADER_CONTINUATION.match(line.strip()):
+            return True
+    return False
+
+
+def _skip_headers(lines, index):
+    """Index of the first line after a forwarded header block (and the blank lines around it)"""
+    while index < len(lines) and (not lines[index].strip() or HEADER_LINE.match(lines[index].strip())):
+        index += 1
+    return index
+
+
+def is_forward(subject):
+    return bool(FORWARD_SUBJECT.match(subject or ''))
+
+
+def normalise_subject(subject):
+    """Subject without reply/forward prefixes, whitespace collapsed and lower-cased"""
+    return normalise_whitespace(SUBJECT_PREFIX.sub('', subject or '')).lower()
+
+
+def message_segments(body, forwarded=False):
+    """
+    The new text of an email followed by the text of each message it forwards, without
+    the forwarded header lines. Reply history ends the last segment. An Outlook header
+    block (From:/Sent:/To:) is ambiguous, so it starts a forwarded segment only when
+    `forwarded` is set (the subject is FW:) and is treated as reply history otherwise.
+    """
+    lines = (body or '').splitlines()
+    segments = [[]]
+    i = 0
+    while i < len(lines):
+        stripped = lines[i].strip()
+        if any(marker.match(stripped) for marker in QUOTE_MARKERS):
+            break
+        if any(marker.match(stripped) for marker in FORWARD_MARKERS):
+            segments.append([])
+            i = _skip_headers(lines, i + 1)
+            continue
+        header_block = FROM_HEADER.match(stripped) and _starts_header_block(lines, i)
+        if header_block or SEPARATOR.match(stripped):
+            if not forwarded:
+                break
+            segments.append([])
+            i = _skip_headers(lines, i + 1 if SEPARATOR.match(stripped) else i)
+            continue
+        if not stripped.startswith('>'):
+            segments[-1].append(lines[i])
+        i += 1
+    return ['\n'.join(segment).strip() for segment in segments]
+
+
+def strip_quoted_history(body, keep_forwarded=False):
+    """
+    Remove quoted replies and forwarded history, keeping only the new text; with
+    keep_forwarded, forwarded messages are kept without their header lines
+    """
+    segments = message_segments(body, forwarded=keep_forwarded)
+    if not keep_forwarded:
+        return segments[0]
+    return '\n\n'.join(segment for segment in segments if segment)
+
+
+def normalise_whitespace(text):
+    """Collapse runs of whitespace into single spaces"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+# Standalone sign-off lines that start a signature block
+SIGN_OFF = re.compile(
+    r'^(?:--|(?:best|kind|warm|many)?\s*(?:regards|thanks|thank you|cheers|sincerely|rgds|br)[,.!]*'
+    r'|sent from my \w+.*)$',
+    re.IGNORECASE
+)
+
+# Legal boilerplate appended by mail gateways; a recruiter writing "confidential" or
+# "disclaimer" in their own text must not lose the paragraph
+DISCLAIMER_MARKERS = [
+    re.compile(r'\bthis (?:e-?mail|message)\b.{0,80}\b(?:intended (?:solely|only) for'
+               r'|confidential and (?:may be |is |are )?(?:legally )?privileged)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'\bif you (?:are not the intended recipient|have received this (?:e-?mail|message) in error)\b',
+               re.IGNORECASE),
+    re.compile(r'^\W*disclaimer\s*(?:[:\-]|\n|$)', re.IGNORECASE),
+    re.compile(r'\bplease consider the environment before printing\b', re.IGNORECASE),
+]
+
+
+def strip_signature(body):
+    """Remove the sign-off and everything after it"""
+    lines = body.splitlines()
+    for i, line in enumerate(lines):
+        # The first line is never a signature, even if it's just "Thanks"
+        if i > 0 and SIGN_OFF.match(line.strip()):
+            return '\n'.join(lines[:i]).strip()
+    return body.strip()
+
+
+def split_paragraphs(text):
+    """Blank-line separated paragraphs with whitespace collapsed inside each line"""
+    paragraphs = []
+    for block in re.split(r'\n\s*\n', text or ''):
+        lines = [re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in block.splitlines()]
+        paragraph = '\n'.join(line for line in lines if line)
+        if paragraph:
+            paragraphs.append(paragraph)
+    return paragraphs
+
+
+def is_disclaimer(paragraph):
+    return any(marker.search(paragraph) for marker in DISCLAIMER_MARKERS)
+
+
+def clean_body(body, forwarded=False):
+    """
+    New text of an email and of the messages it forwards as paragraphs: no reply
+    history, forwarded headers, signatures, disclaimers or extra whitespace
+    """
+    paragraphs = []
+    # Each message has its own sign-off; the forwarder's "Thanks" mustn't cut the rest
+    for segment in message_segments(body, forwarded=forwarded):
+        paragraphs.extend(p for p in split_paragraphs(strip_signature(segment)) if not is_disclaimer(p))
+    return paragraphs
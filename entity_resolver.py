@@ -0,0 +1,197 @@
+"""
+Entity Resolution of Candidates and Jobs against the Trackers
+"""
+import re
+import threading
+import unicodedata
+import pandas as pd
+
+# Words that don't identify a person or a role
+NAME_STOPWORDS = {'mr', 'mrs', 'ms', 'miss', 'dr', 'eng', 'engr', 'prof', 'sir'}
+TITLE_STOPWORDS = {'a', 'an', 'the', 'of', 'for', 'and', 'in', 'at', 'to', 'with'}
+
+# Score of each kind of evidence
+EMAIL_SCORE = 1.0
+PHONE_SCORE = 0.95
+CONTEXT_BONUS = 0.15  # Position/project also agrees; larger than the ambiguity margin so it can break ties
+
+
+def normalise_tokens(value, stopwords=NAME_STOPWORDS):
+    """Lowercase, accent-free word tokens without honorifics"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return frozenset()
+    text = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode('ascii').lower()
+    return frozenset(t for t in re.findall(r'[a-z0-9]+', text) if t not in stopwords)
+
+
+def normalise_email(value):
+    if not isinstance(value, str):
+        return None
+    value = value.strip().lower()
+    return value if '@' in value else None
+
+
+def normalise_phone(value):
+    """Last 9 digits, so country-code and leading-zero variants of a number match"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    # Excel hands back numeric cells as floats, e.g. 971501234567.0
+    text = str(int(value)) if isinstance(value, float) else str(value)
+    digits = re.sub(r'\D', '', text)
+    return digits[-9:] if len(digits) >= 7 else None
+
+
+def token_score(query, tokens):
+    """Dice overlap of two token sets (1.0 for the same words in any order)"""
+    if not query or not tokens:
+        return 0.0
+    return 2 * len(query & tokens) / (len(query) + len(tokens))
+
+
+class TrackerIndex:
+    """In-memory lookup tables over one snapshot of a tracker"""
+
+    def __init__(self, df, id_column, name_column, context_column, recency_columns,
+                 stopwords=NAME_STOPWORDS, email_column=None, phone_column=None):
+        self.records = []
+        self.by_token = {}
+        self.by_email = {}
+        self.by_phone = {}
+        self.stopwords = stopwords
+
+        if df.empty or id_column not in df.columns:
+            return
+
+        # Most recent of the given date columns, as a tie-breaker between equal scores
+        recency = pd.Series(0.0, index=df.index)
+        for column in recency_columns:
+            if column in df.columns:
+                stamps = pd.to_datetime(df[column], errors='coerce')
+                values = stamps.map(lambda t: t.timestamp() if pd.notna(t) else 0.0)
+                recency = recency.where(recency > 0, values)
+
+        for position, (row, stamp) in enumerate(zip(df.to_dict('records'), recency)):
+            record = {
+                'id': row[id_column],
+                'name': row.get(name_column),
+                'tokens': normalise_tokens(row.get(name_column), stopwords),
+                'context': normalise_tokens(row.get(context_column), TITLE_STOPWORDS),
+                'recency': stamp
+            }
+            self.records.append(record)
+            for token in record['tokens']:
+                self.by_token.setdefault(token, []).append(position)
+            if email_column:
+                email = normalise_email(row.get(email_column))
+                if email:
+                    self.by_email.setdefault(email, []).append(position)
+            if phone_column:
+                phone = normalise_phone(row.get(phone_column))
+                if phone:
+                    self.by_phone.setdefault(phone, []).append(position)
+
+    def score(self, name=None, email=None, phone=None, context=None):
+        """Score every record sharing a key with the query; returns [(score, recency, record)]"""
+        query = normalise_tokens(name, self.stopwords)
+        email = normalise_email(email)
+        phone = normalise_phone(phone)
+        context = normalise_tokens(context, TITLE_STOPWORDS)
+
+        candidates = set()
+        for token in query:
+            candidates.update(self.by_token.get(token, ()))
+        if email:
+            candidates.update(self.by_email.get(email, ()))
+        if phone:
+            candidates.update(self.by_phone.get(phone, ()))
+
+        scored = []
+        for position in candidates:
+            record = self.records[position]
+            score = token_score(query, record['tokens'])
+            if email and position in self.by_email.get(email, ()):
+                score = max(score, EMAIL_SCORE)
+            if phone and position in self.by_phone.get(phone, ()):
+                score = max(score, PHONE_SCORE)
+            if context and record['context'] and context <= record['context']:
+                score += CONTEXT_BONUS
+            scored.append((round(score, 3), record['recency'], record))
+
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return scored
+
+
+class EntityResolver:
+    """Resolves candidate and job references to tracker IDs, flagging ambiguous matches"""
+
+    def __init__(self, excel_manager, min_confidence=0.75, ambiguity_margin=0.1):
+        self.excel_manager = excel_manager
+        self.min_confidence = min_confidence
+        self.ambiguity_margin = ambiguity_margin
+        self._indexes = {}  # tracker -> (file stamp, TrackerIndex)
+        self._lock = threading.Lock()
+
+    def resolve_cv(self, name=None, email=None, phone=None, position=None, tx=None):
+        """Best-matching CV for a candidate; see _resolve for the result shape"""
+        index = self._index('cv', tx)
+        return self._resolve(index.score(name, email, phone, position))
+
+    def resolve_job(self, title, project=None, tx=None):
+        """Best-matching job for a position title, preferring the given project"""
+        index = self._index('master', tx)
+        return self._resolve(index.score(title, context=project))
+
+    def refresh(self):
+        """Drop the cached indexes so the next lookup rebuilds them"""
+        with self._lock:
+            self._indexes = {}
+
+    def _index(self, tracker, tx=None):
+        # A transaction with staged changes is searched as-is; otherwise use the cached index
+        if tx is not None and tx.modified(tracker):
+            return self._build(tracker, tx.cvs if tracker == 'cv' else tx.jobs)
+
+        with self._lock:
+            # Each tracker is indexed on its own, so a lookup only reads the workbook it needs
+            stamp = self.excel_manager.tracker_version()[0 if tracker == 'master' else 1]
+            cached = self._indexes.get(tracker)
+            if cached is None or cached[0] != stamp:
+                # Reuse the transaction's frame so the tracker is still read only once
+                if tx is not None:
+                    df = tx.cvs if tracker == 'cv' else tx.jobs
+                else:
+                    df = self.excel_manager.read_cv_tracker() if tracker == 'cv' else self.excel_manager.read_master_tracker()
+                cached = (stamp, self._build(tracker, df))
+                self._indexes[tracker] = cached
+            return cached[1]
+
+    def _build(self, tracker, df):
+        if tracker == 'cv':
+            return TrackerIndex(df, 'CVID', 'Candidate Name', 'Position', ['Last Modified', 'Date CV Shared'],
+                                email_column='Email', phone_column='Mobile')
+        return TrackerIndex(df, 'JobID', 'Job Title', 'Project Name', ['Position Created Date'],
+                            stopwords=TITLE_STOPWORDS)
+
+    def _resolve(self, scored):
+        """
+        Returns {'id', 'confidence', 'ambiguous', 'candidates'}. `id` is None when nothing
+        clears the threshold or when another record scores within the ambiguity margin;
+        `candidates` then holds the closest records as suggestions.
+        """
+        best = scored[0][0] if scored else 0.0
+        result = {'id': None, 'confidence': min(1.0, best), 'ambiguous': False,
+                  'candidates': self._summarise(scored[:5])}
+
+        if best < self.min_confidence:
+            return result
+
+        if len(scored) > 1 and best - scored[1][0] < self.ambiguity_margin:
+            result['ambiguous'] = True
+            result['candidates'] = self._summarise([item for item in scored[:5] if best - item[0] < self.ambiguity_margin])
+            return result
+
+        result['id'] = scored[0][2]['id']
+        return result
+
+    def _summarise(self, scored):
+        return [{'id': record['id'], 'name': record['name'], 'score': min(1.0, score)} for score, _, record in scored]
@@ -1,237 +1,511 @@
-"""
-Excel Manager for Recruitment Tracker System
-"""
-import pandas as pd
-from datetime import datetime
-from pathlib import Path
-import openpyxl
-from openpyxl.styles import PatternFill, Font, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
-
-class ExcelManager:
-    def __init__(self, master_path="data/MasterTracker.xlsx", cv_path="data/CVTracker.xlsx"):
-        self.master_path = Path(master_path)
-        self.cv_path = Path(cv_path)
-        self.init_excel_files()
-    
-    def init_excel_files(self):
-        """Initialize Excel files if they don't exist"""
-        # Master Tracker columns
-        master_columns = [
-            "JobID", "Position Created Date", "Job Title", "Job Location (Country)",
-            "Project Name", "Max Budgeted Salary", "Accepted Salary", "Is Job Ad Published?",
-            "TA Partner", "Sourcing Partner", "Hiring Manager", "Job Status",
-            "Business Line", "Service Line"
-        ]
-        
-        # CV Tracker columns
-        cv_columns = [
-            "CVID", "JobID", "Position", "Hiring Manager", "Project", "Candidate Name",
-            "Application Status", "CV Source", "Date CV Shared", "HM Feedback",
-            "HM Feedback Date", "HM Comments", "Interview Date", "Interview Results",
-            "Date Interview Result", "Package", "Date Offer Requested", "Date Offer Issued",
-            "Offer Status", "Date Offer Accepted or Rejected", "Remarks", "ETA",
-            "Date Onboard", "Email", "Mobile", "Current Location", "Notice Period",
-            "Agreed Start Date", "Nationality", "Last Modified"
-        ]
-        
-        # Create Master Tracker if not exists
-        if not self.master_path.exists():
-            df = pd.DataFrame(columns=master_columns)
-            self.save_with_formatting(df, self.master_path, "Master Tracker")
-        
-        # Create CV Tracker if not exists
-        if not self.cv_path.exists():
-            df = pd.DataFrame(columns=cv_columns)
-            self.save_with_formatting(df, self.cv_path, "CV Tracker")
-    
-    def save_with_formatting(self, df, path, sheet_name):
-        """Save DataFrame with formatting"""
-        with pd.ExcelWriter(path, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
-            
-            # Get the workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets[sheet_name]
-            
-            # Format headers
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(color="FFFFFF", bold=True)
-            
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-    
-    def generate_job_id(self):
-        """Generate unique JobID"""
-        df = self.read_master_tracker()
-        date_part = datetime.now().strftime("%y%m%d")
-        prefix = f"JOB-{date_part}"
-        
-        # Find existing IDs for today
-        existing = df[df['JobID'].str.startswith(prefix)] if not df.empty else pd.DataFrame()
-        
-        if existing.empty:
-            return f"{prefix}-001"
-        else:
-            # Extract numbers and find max
-            numbers = existing['JobID'].str.extract(r'(\d{3})$')[0].astype(int)
-            next_num = numbers.max() + 1
-            return f"{prefix}-{next_num:03d}"
-    
-    def generate_cv_id(self):
-        """Generate unique CVID"""
-        df = self.read_cv_tracker()
-        date_part = datetime.now().strftime("%y%m%d")
-        prefix = f"CV-{date_part}"
-        
-        # Find existing IDs for today
-        existing = df[df['CVID'].str.startswith(prefix)] if not df.empty else pd.DataFrame()
-        
-        if existing.empty:
-            return f"{prefix}-001"
-        else:
-            # Extract numbers and find max
-            numbers = existing['CVID'].str.extract(r'(\d{3})$')[0].astype(int)
-            next_num = numbers.max() + 1
-            return f"{prefix}-{next_num:03d}"
-    
-    def read_master_tracker(self):
-        """Read Master Tracker"""
-        try:
-            return pd.read_excel(self.master_path, sheet_name="Master Tracker")
-        except:
-            return pd.DataFrame()
-    
-    def read_cv_tracker(self):
-        """Read CV Tracker"""
-        try:
-            return pd.read_excel(self.cv_path, sheet_name="CV Tracker")
-        except:
-            return pd.DataFrame()
-    
-    def add_job(self, job_data):
-        """Add new job to Master Tracker"""
-        df = self.read_master_tracker()
-        
-        # Check for duplicates
-        if not df.empty:
-            duplicate = df[
-                (df['Job Title'] == job_data.get('Job Title')) &
-                (df['Project Name'] == job_data.get('Project Name')) &
-                (df['Job Location (Country)'] == job_data.get('Job Location (Country)'))
-            ]
-            if not duplicate.empty:
-                return None, "Duplicate job found"
-        
-        # Generate JobID if not provided
-        if 'JobID' not in job_data or not job_data['JobID']:
-            job_data['JobID'] = self.generate_job_id()
-        
-        # Add default values
-        if 'Position Created Date' not in job_data:
-            job_data['Position Created Date'] = datetime.now().date()
-        
-        # Append to dataframe
-        df = pd.concat([df, pd.DataFrame([job_data])], ignore_index=True)
-        self.save_with_formatting(df, self.master_path, "Master Tracker")
-        
-        return job_data['JobID'], "Job added successfully"
-    
-    def add_cv(self, cv_data):
-        """Add new CV to CV Tracker"""
-        df = self.read_cv_tracker()
-        
-        # Generate CVID if not provided
-        if 'CVID' not in cv_data or not cv_data['CVID']:
-            cv_data['CVID'] = self.generate_cv_id()
-        
-        # Validate JobID exists
-        master_df = self.read_master_tracker()
-        if cv_data.get('JobID') not in master_df['JobID'].values:
-            return None, "Invalid JobID"
-        
-        # Auto-populate from Master Tracker
-        job_info = master_df[master_df['JobID'] == cv_data['JobID']].iloc[0]
-        cv_data['Position'] = cv_data.get('Position', job_info['Job Title'])
-        cv_data['Hiring Manager'] = cv_data.get('Hiring Manager', job_info['Hiring Manager'])
-        cv_data['Project'] = cv_data.get('Project', job_info['Project Name'])
-        
-        # Add timestamp
-        cv_data['Last Modified'] = datetime.now()
-        
-        # Append to dataframe
-        df = pd.concat([df, pd.DataFrame([cv_data])], ignore_index=True)
-        self.save_with_formatting(df, self.cv_path, "CV Tracker")
-        
-        return cv_data['CVID'], "CV added successfully"
-    
-    def update_job(self, job_id, updates):
-        """Update job in Master Tracker"""
-        df = self.read_master_tracker()
-        
-        if job_id not in df['JobID'].values:
-            return False, "Job not found"
-        
-        for key, value in updates.items():
-            df.loc[df['JobID'] == job_id, key] = value
-        
-        self.save_with_formatting(df, self.master_path, "Master Tracker")
-        return True, "Job updated successfully"
-    
-    def update_cv(self, cv_id, updates):
-        """Update CV in CV Tracker"""
-        df = self.read_cv_tracker()
-        
-        if cv_id not in df['CVID'].values:
-            return False, "CV not found"
-        
-        updates['Last Modified'] = datetime.now()
-        
-        for key, value in updates.items():
-            df.loc[df['CVID'] == cv_id, key] = value
-        
-        self.save_with_formatting(df, self.cv_path, "CV Tracker")
-        
-        # Check if status changed to "Hired" to update Master Tracker
-        if updates.get('Application Status') == 'Hired':
-            job_id = df.loc[df['CVID'] == cv_id, 'JobID'].iloc[0]
-            self.update_job(job_id, {'Job Status': 'Filled'})
-        
-        return True, "CV updated successfully"
-    
-    def search_jobs(self, criteria):
-        """Search jobs based on criteria"""
-        df = self.read_master_tracker()
-        
-        for key, value in criteria.items():
-            if key in df.columns and value:
-                df = df[df[key].str.contains(value, case=False, na=False)]
-        
-        return df
-    
-    def search_cvs(self, criteria):
-        """Search CVs based on criteria"""
-        df = self.read_cv_tracker()
-        
-        for key, value in criteria.items():
-            if key in df.columns and value:
-                df = df[df[key].str.contains(value, case=False, na=False)]
-        
-        return df
+"""
+Excel Manager for Recruitment Tracker System
+"""
+import os
+import sqlite3
+import threading
+from collections import Counter
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+import openpyxl
+from openpyxl.styles import PatternFill, Font, Alignment
+from openpyxl.utils.dataframe import dataframe_to_rows
+
+import metrics
+
+MASTER_SHEET = "Master Tracker"
+CV_SHEET = "CV Tracker"
+
+MASTER_COLUMNS = [
+    "JobID", "Position Created Date", "Job Title", "Job Location (Country)",
+    "Project Name", "Max Budgeted Salary", "Accepted Salary", "Is Job Ad Published?",
+    "TA Partner", "Sourcing Partner", "Hiring Manager", "Job Status",
+    "Business Line", "Service Line"
+]
+
+CV_COLUMNS = [
+    "CVID", "JobID", "Position", "Hiring Manager", "Project", "Candidate Name",
+    "Application Status", "CV Source", "Date CV Shared", "HM Feedback",
+    "HM Feedback Date", "HM Comments", "Interview Date", "Interview Results",
+    "Date Interview Result", "Package", "Date Offer Requested", "Date Offer Issued",
+    "Offer Status", "Date Offer Accepted or Rejected", "Remarks", "ETA",
+    "Date Onboard", "Email", "Mobile", "Current Location", "Notice Period",
+    "Agreed Start Date", "Nationality", "Last Modified"
+]
+
+# Status column of each tracker, counted for the dashboard
+STATUS_COLUMNS = {'master': 'Job Status', 'cv': 'Application Status'}
+
+
+def status_label(value):
+    """Status cell as a counter key; blank cells count as ''"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    return str(value).strip()
+
+
+def filter_frame(df, criteria):
+    """Case-insensitive substring filter on the given columns"""
+    for key, value in criteria.items():
+        if key in df.columns and value:
+            df = df[df[key].astype(str).str.contains(str(value), case=False, na=False, regex=False)]
+    return df
+
+
+def next_id(df, column, prefix):
+    """Next sequential ID of the form PREFIX-YYMMDD-NNN"""
+    return IdSequence(df, column, prefix).next()
+
+
+class IdSequence:
+    """Sequential IDs for several rows added in turn, reading the existing IDs once"""
+    
+    def __init__(self, df, column, prefix):
+        self.prefix = f"{prefix}-{datetime.now().strftime('%y%m%d')}"
+        self.last = 0
+        if not df.empty:
+            for record_id in df[column].astype(str):
+                self.note(record_id)
+    
+    def note(self, record_id):
+        """Account for an ID given with a row, so it is not generated again"""
+        number = str(record_id)[len(self.prefix) + 1:]
+        if str(record_id).startswith(f"{self.prefix}-") and number.isdigit():
+            # The whole number, so a day past 999 rows carries on at 1000, 1001, ...
+            self.last = max(self.last, int(number))
+    
+    def next(self):
+        self.last += 1
+        return f"{self.prefix}-{self.last:03d}"
+
+
+# Jobs with the same values in all of these are duplicates
+JOB_KEY = ['Job Title', 'Project Name', 'Job Location (Country)']
+
+
+def job_key(values):
+    """Duplicate-check key, or None when a part is blank (blank never equals blank)"""
+    if any(value is None or (not isinstance(value, str) and pd.isna(value)) for value in values):
+        return None
+    return tuple(values)
+
+
+class TrackerLock:
+    """
+    Mutex over tracker read-modify-write cycles that also holds across server processes:
+    a SQLite write transaction on a lock file. Re-entrant within a thread.
+    """
+    
+    def __init__(self, path, timeout=60):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+    
+    def acquire(self):
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as e:
+                conn.close()
+                raise TimeoutError(f"Trackers are locked by another writer: {e}")
+            self._local.conn = conn
+        self._local.depth = depth + 1
+    
+    def release(self):
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            self._local.conn.execute("ROLLBACK")
+            self._local.conn.close()
+            self._local.conn = None
+
+
+class ExcelManager:
+    def __init__(self, master_path="data/MasterTracker.xlsx", cv_path="data/CVTracker.xlsx"):
+        self.master_path = Path(master_path)
+        self.cv_path = Path(cv_path)
+        # The lock database lives next to the trackers, so the folder must exist first
+        self.master_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cv_path.parent.mkdir(parents=True, exist_ok=True)
+        self.commit_listeners = []  # Called with each committed TrackerTransaction
+        self.lock = TrackerLock(self.master_path.parent / ".tracker_lock.db")
+        self.init_excel_files()
+    
+    def init_excel_files(self):
+        """Initialize Excel files if they don't exist"""
+        # Create Master Tracker if not exists
+        if not self.master_path.exists():
+            df = pd.DataFrame(columns=MASTER_COLUMNS)
+            self.save_with_formatting(df, self.master_path, MASTER_SHEET)
+        
+        # Create CV Tracker if not exists
+        if not self.cv_path.exists():
+            df = pd.DataFrame(columns=CV_COLUMNS)
+            self.save_with_formatting(df, self.cv_path, CV_SHEET)
+    
+    def save_with_formatting(self, df, path, sheet_name):
+        """Save DataFrame with formatting, replacing the file atomically"""
+        temp_path = self.write_temp(df, path, sheet_name)
+        os.replace(temp_path, path)
+    
+    def write_temp(self, df, path, sheet_name):
+        """Write a formatted workbook next to `path` and return the temporary file path"""
+        path = Path(path)
+        temp_path = path.with_name(f".{path.stem}.tmp{path.suffix}")
+        try:
+            with metrics.timer('excel', 'write_master' if sheet_name == MASTER_SHEET else 'write_cv'):
+                self._write_workbook(df, temp_path, sheet_name)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return temp_path
+    
+    def _write_workbook(self, df, path, sheet_name):
+        """Write DataFrame to a workbook with formatting"""
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+            
+            # Get the workbook and worksheet
+            workbook = writer.book
+            worksheet = writer.sheets[sheet_name]
+            
+            # Format headers
+            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            header_font = Font(color="FFFFFF", bold=True)
+            
+            for cell in worksheet[1]:
+                cell.fill = header_fill
+                cell.font = header_font
+                cell.alignment = Alignment(horizontal="center")
+            
+            # Auto-adjust column widths
+            for column in worksheet.columns:
+                max_length = 0
+                column_letter = column[0].column_letter
+                
+                for cell in column:
+                    try:
+                        if len(str(cell.value)) > max_length:
+                            max_length = len(str(cell.value))
+                    except:
+                        pass
+                
+                adjusted_width = min(max_length + 2, 50)
+                worksheet.column_dimensions[column_letter].width = adjusted_width
+    
+    def generate_job_id(self):
+        """Generate unique JobID"""
+        return next_id(self.read_master_tracker(), 'JobID', 'JOB')
+    
+    def generate_cv_id(self):
+        """Generate unique CVID"""
+        return next_id(self.read_cv_tracker(), 'CVID', 'CV')
+    
+    @metrics.timed('excel', 'read_master')
+    def read_master_tracker(self):
+        """Read Master Tracker"""
+        try:
+            return pd.read_excel(self.master_path, sheet_name=MASTER_SHEET)
+        except:
+            return pd.DataFrame()
+    
+    @metrics.timed('excel', 'read_cv')
+    def read_cv_tracker(self):
+        """Read CV Tracker"""
+        try:
+            return pd.read_excel(self.cv_path, sheet_name=CV_SHEET)
+        except:
+            return pd.DataFrame()
+    
+    def tracker_version(self):
+        """Modification stamp of both tracker files; changes whenever either file is rewritten"""
+        version = []
+        for path in (self.master_path, self.cv_path):
+            try:
+                stat = path.stat()
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+    
+    def transaction(self):
+        """Start a change set that reads each tracker once and writes it once on commit"""
+        return TrackerTransaction(self)
+    
+    def add_job(self, job_data):
+        """Add new job to Master Tracker"""
+        with self.transaction() as tx:
+            return tx.add_job(job_data)
+    
+    def add_cv(self, cv_data):
+        """Add new CV to CV Tracker"""
+        with self.transaction() as tx:
+            return tx.add_cv(cv_data)
+    
+    def add_jobs_bulk(self, jobs):
+        """Add several jobs with one read and one write, returning (job_id, message) per job"""
+        with self.transaction() as tx:
+            return tx.add_jobs(jobs)
+    
+    def add_cvs_bulk(self, cvs):
+        """Add several CVs with one read and one write, returning (cv_id, message) per CV"""
+        with self.transaction() as tx:
+            return tx.add_cvs(cvs)
+    
+    def update_job(self, job_id, updates):
+        """Update job in Master Tracker"""
+        with self.transaction() as tx:
+            return tx.update_job(job_id, updates)
+    
+    def update_cv(self, cv_id, updates):
+        """Update CV in CV Tracker"""
+        with self.transaction() as tx:
+            return tx.update_cv(cv_id, updates)
+    
+    def search_jobs(self, criteria):
+        """Search jobs based on criteria"""
+        return filter_frame(self.read_master_tracker(), criteria)
+    
+    def search_cvs(self, criteria):
+        """Search CVs based on criteria"""
+        return filter_frame(self.read_cv_tracker(), criteria)
+
+
+class TrackerTransaction:
+    """All-or-nothing change set over both trackers: one read and one atomic write per file"""
+    
+    def __init__(self, manager):
+        self.manager = manager
+        self._jobs = None
+        self._cvs = None
+        self._dirty = set()
+        self.changes = []  # Field-level report of what changed
+        self.status_deltas = {'master': Counter(), 'cv': Counter()}  # Net row count change per status
+        self.read_stamps = {}  # File stamp of each tracker when this transaction read it
+    
+    def __enter__(self):
+        # Other threads and processes wait, so nobody reads a tracker this transaction is about to replace
+        self.manager.lock.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            # Nothing is written if the block failed
+            if exc_type is None:
+                self.commit()
+        finally:
+            self.manager.lock.release()
+        return False
+    
+    @property
+    def jobs(self):
+        if self._jobs is None:
+            self.read_stamps['master'] = self.manager.tracker_version()[0]
+            self._jobs = self.manager.read_master_tracker()
+        return self._jobs
+    
+    @property
+    def cvs(self):
+        if self._cvs is None:
+            self.read_stamps['cv'] = self.manager.tracker_version()[1]
+            self._cvs = self.manager.read_cv_tracker()
+        return self._cvs
+    
+    def modified(self, tracker):
+        """Check if this transaction has staged changes to 'master' or 'cv'"""
+        return tracker in self._dirty
+    
+    def find_jobs(self, criteria):
+        """Search jobs, including changes made in this transaction"""
+        return filter_frame(self.jobs, criteria)
+    
+    def find_cvs(self, criteria):
+        """Search CVs, including changes made in this transaction"""
+        return filter_frame(self.cvs, criteria)
+    
+    def add_job(self, job_data):
+        """Add new job to Master Tracker"""
+        return self.add_jobs([job_data])[0]
+    
+    def add_jobs(self, jobs):
+        """Add several jobs with one duplicate index and one append, returning (job_id, message) per job"""
+        df = self.jobs
+        seen = set()
+        if not df.empty:
+            seen.update(job_key(values) for values in df[JOB_KEY].itertuples(index=False, name=None))
+        ids = IdSequence(df, 'JobID', 'JOB')
+        
+        rows = []
+        results = []
+        for job_data in jobs:
+            # Check for duplicates, including jobs earlier in this batch
+            key = job_key([job_data.get(column) for column in JOB_KEY])
+            if key is not None and key in seen:
+                results.append((None, "Duplicate job found"))
+                continue
+            seen.add(key)
+            
+            # Generate JobID if not provided
+            if 'JobID' not in job_data or not job_data['JobID']:
+                job_data['JobID'] = ids.next()
+            else:
+                ids.note(job_data['JobID'])
+            
+            # Add default values
+            if 'Position Created Date' not in job_data:
+                job_data['Position Created Date'] = datetime.now().date()
+            
+            rows.append(job_data)
+            self.status_deltas['master'][status_label(job_data.get('Job Status'))] += 1
+            self.changes.append({'tracker': 'master', 'id': job_data['JobID'], 'action': 'added'})
+            results.append((job_data['JobID'], "Job added successfully"))
+        
+        # Append to dataframe
+        if rows:
+            self._jobs = pd.concat([df, pd.DataFrame(rows)], ignore_index=True)
+            self._dirty.add('master')
+        return results
+    
+    def add_cv(self, cv_data):
+        """Add new CV to CV Tracker"""
+        return self.add_cvs([cv_data])[0]
+    
+    def add_cvs(self, cvs):
+        """Add several CVs with one job lookup and one append, returning (cv_id, message) per CV"""
+        df = self.cvs
+        master_df = self.jobs
+        jobs = {}
+        if not master_df.empty:
+            columns = ['JobID', 'Job Title', 'Hiring Manager', 'Project Name']
+            for job_id, *job_info in master_df[columns].itertuples(index=False, name=None):
+                jobs.setdefault(job_id, job_info)
+        ids = IdSequence(df, 'CVID', 'CV')
+        
+        rows = []
+        results = []
+        for cv_data in cvs:
+            # Validate JobID exists
+            job_info = jobs.get(cv_data.get('JobID'))
+            if job_info is None:
+                results.append((None, "Invalid JobID"))
+                continue
+            
+            # Generate CVID if not provided
+            if 'CVID' not in cv_data or not cv_data['CVID']:
+                cv_data['CVID'] = ids.next()
+            else:
+                ids.note(cv_data['CVID'])
+            
+            # Auto-populate from Master Tracker
+            job_title, hiring_manager, project_name = job_info
+            cv_data['Position'] = cv_data.get('Position', job_title)
+            cv_data['Hiring Manager'] = cv_data.get('Hiring Manager', hiring_manager)
+            cv_data['Project'] = cv_data.get('Project', project_name)
+            
+            # Add timestamp
+            cv_data['Last Modified'] = datetime.now()
+            
+            rows.append(cv_data)
+            self.status_deltas['cv'][status_label(cv_data.get('Application Status'))] += 1
+            self.changes.append({'tracker': 'cv', 'id': cv_data['CVID'], 'action': 'added'})
+            results.append((cv_data['CVID'], "CV added successfully"))
+        
+        # Append to dataframe
+        if rows:
+            self._cvs = pd.concat([df, pd.DataFrame(rows)], ignore_index=True)
+            self._dirty.add('cv')
+        return results
+    
+    def update_job(self, job_id, updates):
+        """Update job in Master Tracker"""
+        df = self.jobs
+        
+        if df.empty or job_id not in df['JobID'].values:
+            return False, "Job not found"
+        
+        self._apply(df, 'JobID', job_id, updates, 'master')
+        return True, "Job updated successfully"
+    
+    def update_cv(self, cv_id, updates):
+        """Update CV in CV Tracker"""
+        df = self.cvs
+        
+        if df.empty or cv_id not in df['CVID'].values:
+            return False, "CV not found"
+        
+        updates['Last Modified'] = datetime.now()
+        self._apply(df, 'CVID', cv_id, updates, 'cv')
+        
+        # Check if status changed to "Hired" to update Master Tracker
+        if updates.get('Application Status') == 'Hired':
+            job_id = df.loc[df['CVID'] == cv_id, 'JobID'].iloc[0]
+            self.update_job(job_id, {'Job Status': 'Filled'})
+        
+        return True, "CV updated successfully"
+    
+    def _apply(self, df, id_column, record_id, updates, tracker):
+        """Apply field updates in memory and record old/new values"""
+        mask = df[id_column] == record_id
+        for key, value in updates.items():
+            if key in df.columns:
+                old = df.loc[mask, key].iloc[0]
+                # Trackers mix text, dates and numbers in one column
+                if df[key].dtype != object:
+                    df[key] = df[key].astype(object)
+            else:
+                old = None
+            df.loc[mask, key] = value
+            self._record_change(tracker, record_id, key, old, value)
+            if key == STATUS_COLUMNS[tracker]:
+                self.status_deltas[tracker][status_label(old)] -= 1
+                self.status_deltas[tracker][status_label(value)] += 1
+        self._dirty.add(tracker)
+    
+    def _record_change(self, tracker, record_id, field, old, new):
+        """Merge a field change into the report, keeping the first old value"""
+        if not isinstance(old, str) and pd.isna(old):
+            old = None
+        for change in self.changes:
+            if change['tracker'] == tracker and change['id'] == record_id and change.get('field') == field:
+                change['new'] = new
+                return
+        if field != 'Last Modified' and old != new:
+            self.changes.append({'tracker': tracker, 'id': record_id, 'field': field, 'old': old, 'new': new})
+    
+    def changed_fields(self):
+        """Changed field names per record, e.g. {'CV-250101-001': ['Interview Date']}"""
+        report = {}
+        for change in self.changes:
+            if change.get('field'):
+                report.setdefault(change['id'], []).append(change['field'])
+        return report
+    
+    def commit(self):
+        """Write every changed tracker; files are only replaced once all have been written"""
+        targets = []
+        if 'master' in self._dirty:
+            targets.append((self._jobs, self.manager.master_path, MASTER_SHEET))
+        if 'cv' in self._dirty:
+            targets.append((self._cvs, self.manager.cv_path, CV_SHEET))
+        
+        temp_paths = []
+        try:
+            for df, path, sheet_name in targets:
+                temp_paths.append((self.manager.write_temp(df, path, sheet_name), path))
+        except Exception:
+            for temp_path, path in temp_paths:
+                temp_path.unlink(missing_ok=True)
+            raise
+        
+        for temp_path, path in temp_paths:
+            os.replace(temp_path, path)
+        
+        if temp_paths:
+            for listener in self.manager.commit_listeners:
+                try:
+                    listener(self)
+                except Exception as e:
+                    print(f"Tracker commit listener error: {e}")
+        self._dirty.clear()
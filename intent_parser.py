@@ -0,0 +1,166 @@
+"""
+Local Intent Parser for Common Assistant Commands
+"""
+import re
+from datetime import datetime, timedelta
+
+from rule_extractor import parse_when
+
+# Canonical tracker statuses, matched case-insensitively
+APPLICATION_STATUSES = [
+    'CV Shared', 'Interview Scheduled', 'Interview Passed', 'Rejected',
+    'Offer Extended', 'Hired'
+]
+JOB_STATUSES = ['Open', 'Filled']
+
+CV_ID = r'CV-\d{6}-\d{3}'
+JOB_ID = r'JOB-\d{6}-\d{3}'
+
+SEARCH_COMMAND = re.compile(
+    r'^(?:please\s+)?(?:show|list|find|search|get|display)(?:\s+me)?(?:\s+(?:all|the))?\s+'
+    r'(?P<type>cvs?|candidates?|applications?|jobs?|positions?|vacancies|openings?)\b(?P<rest>.*)$',
+    re.IGNORECASE
+)
+SEARCH_PROJECT = re.compile(r'\b(?:for|in|on|under)\s+(?:the\s+)?project\s+(.+?)(?=\s+(?:with|where|for|in)\b|$)', re.IGNORECASE)
+SEARCH_PROJECT_SUFFIX = re.compile(r'\b(?:for|in|on|under)\s+(?:the\s+)?(.+?)\s+project\b', re.IGNORECASE)
+SEARCH_STATUS = re.compile(r'\b(?:with|where)\s+status\s+(?:is\s+|of\s+|=\s*)?(.+?)(?=\s+(?:for|in|on)\b|$)', re.IGNORECASE)
+SEARCH_POSITION = re.compile(r'\bfor\s+(?:the\s+)?(?:position|role)\s+(?:of\s+)?(.+?)(?=\s+(?:with|where|in|on)\b|$)', re.IGNORECASE)
+SEARCH_CANDIDATE = re.compile(r'\b(?:named|called|for\s+candidate)\s+(.+?)(?=\s+(?:with|where|in|on|for)\b|$)', re.IGNORECASE)
+
+UPDATE_COMMAND = re.compile(
+    rf'^(?:please\s+)?(?:update|set|change|mark|move)\s+(?:the\s+)?(?:status\s+of\s+)?(?P<cv_id>{CV_ID})'
+    r'(?:\s*(?:\'s)?\s+status)?\s+(?:to|as)\s+(?P<status>.+?)\s*\.?$',
+    re.IGNORECASE
+)
+
+SCHEDULE_COMMAND = re.compile(
+    r'^(?:please\s+)?(?:schedule|book|arrange|set\s+up)\s+(?:an?\s+)?interview\s+(?:for|with)\s+'
+    r'(?P<candidate>.+?)\s+(?:on|for)\s+(?P<when>.+?)'
+    r'(?:\s+with\s+(?P<interviewer>.+?))?\s*\.?$',
+    re.IGNORECASE
+)
+TIME_PATTERN = re.compile(r'\b(\d{1,2}(?::\d{2})?\s*(?:am|pm)|\d{1,2}:\d{2})\b', re.IGNORECASE)
+# Lists or trailing clauses ("Alpha and Beta", "Ali, Sara") need the LLM
+MULTIPLE_VALUES = re.compile(r'\s(?:and|or|&)\s|,', re.IGNORECASE)
+
+class IntentParser:
+    """Pattern-based parser for frequent command shapes, tried before the LLM"""
+
+    def parse(self, command):
+        """Return {'action', 'parameters'} for a recognised command, or None"""
+        command = re.sub(r'\s+', ' ', command or '').strip()
+        if not command:
+            return None
+
+        for parse in (self._parse_update, self._parse_schedule, self._parse_search):
+            parsed = parse(command)
+            if parsed:
+                return parsed
+        return None
+
+    def _parse_search(self, command):
+        match = SEARCH_COMMAND.match(command)
+        if not match:
+            return None
+
+        search_type = 'job' if match.group('type').lower().startswith(('job', 'position', 'vacanc', 'opening')) else 'cv'
+        rest = match.group('rest')
+        params = {'type': search_type}
+
+        project = SEARCH_PROJECT.search(rest) or SEARCH_PROJECT_SUFFIX.search(rest)
+        if project:
+            params['project'] = self._clean(project.group(1))
+
+        status = SEARCH_STATUS.search(rest)
+        if status:
+            params['status'] = self._canonical_status(status.group(1), search_type)
+            if not params['status']:
+                return None
+
+        position = SEARCH_POSITION.search(rest)
+        if position:
+            params['position'] = self._clean(position.group(1))
+
+        candidate = SEARCH_CANDIDATE.search(rest)
+        if candidate:
+            params['candidate'] = self._clean(candidate.group(1))
+
+        # Anything left we don't understand is better handled by the LLM
+        understood = [project, status, position, candidate]
+        leftover = rest
+        for found in understood:
+            if found:
+                leftover = leftover.replace(found.group(0), ' ')
+        if leftover.strip(' .?'):
+            return None
+        if any(MULTIPLE_VALUES.search(params[key]) for key in ('project', 'position', 'candidate') if key in params):
+            return None
+
+        return {'action': 'search', 'parameters': params}
+
+    def _parse_update(self, command):
+        match = UPDATE_COMMAND.match(command)
+        if not match:
+            return None
+
+        status = self._canonical_status(match.group('status'), 'cv')
+        if not status:
+            return None
+
+        return {'action': 'update', 'parameters': {'cv_id': match.group('cv_id').upper(), 'status': status}}
+
+    def _parse_schedule(self, command):
+        match = SCHEDULE_COMMAND.match(command)
+        if not match:
+            return None
+
+        when = match.group('when')
+        default = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Relative days dateutil doesn't understand
+        relative = False
+        for word, days in (('tomorrow', 1), ('today', 0)):
+            if re.search(rf'\b{word}\b', when, re.IGNORECASE):
+                default += timedelta(days=days)
+                when = re.sub(rf'\b{word}\b', '', when, flags=re.IGNORECASE).strip()
+                relative = True
+                break
+
+        try:
+            if re.sub(r'\bat\b', '', when).strip(' ,'):
+                parsed = parse_when(when, default=default)
+            elif relative:
+                parsed = default
+            else:
+                return None
+        except (ValueError, OverflowError):
+            return None
+
+        candidate = self._clean(match.group('candidate'))
+        interviewer = self._clean(match.group('interviewer') or '')
+        if MULTIPLE_VALUES.search(candidate) or MULTIPLE_VALUES.search(interviewer):
+            return None
+
+        params = {'date': parsed.strftime('%Y-%m-%d')}
+        if re.fullmatch(CV_ID, candidate, re.IGNORECASE):
+            params['cv_id'] = candidate.upper()
+        else:
+            params['candidate'] = candidate
+        if TIME_PATTERN.search(when):
+            params['time'] = parsed.strftime('%H:%M')
+        if interviewer:
+            params['interviewer'] = interviewer
+
+        return {'action': 'schedule interview', 'parameters': params}
+
+    def _canonical_status(self, value, search_type):
+        """The tracker's spelling of a status, or None if the value isn't exactly one"""
+        value = self._clean(value)
+        statuses = JOB_STATUSES if search_type == 'job' else APPLICATION_STATUSES
+        for status in statuses:
+            if status.lower() == value.lower():
+                return status
+        return None
+
+    def _clean(self, value):
+        return value.strip().strip('"\'').strip(' .?')
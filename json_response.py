@@ -0,0 +1,173 @@
+"""
+Fast JSON Encoding (orjson, Column-wise DataFrames) and Response Compression
+"""
+import gzip
+import json
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from flask.json.provider import JSONProvider
+
+import metrics
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_TYPES = (datetime, date)  # pandas Timestamps are datetimes
+COMPRESSIBLE_TYPES = ('application/json', 'text/csv', 'text/html', 'text/plain', 'application/x-ndjson')
+
+
+def json_column(values, missing=None):
+    """
+    One DataFrame column as JSON-safe values, converted column-wise: dates as
+    DATETIME_FORMAT strings, NaN/NaT as `missing`
+    """
+    import pandas as pd
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.strftime(DATETIME_FORMAT).astype(object).where(values.notna(), missing)
+
+    if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+        # Cells edited through the app can hold datetime objects next to text
+        is_date = values.map(type).isin([datetime, date, pd.Timestamp])
+        if is_date.any():
+            values = values.copy()
+            values[is_date] = pd.to_datetime(values[is_date]).dt.strftime(DATETIME_FORMAT)
+
+    if values.hasnans:
+        return values.astype(object).where(values.notna(), missing)
+    return values
+
+
+def json_frame(df, missing=None):
+    """JSON-safe copy of a DataFrame, see json_column"""
+    import pandas as pd
+    return pd.DataFrame({column: json_column(df[column], missing) for column in df.columns},
+                        index=df.index, columns=df.columns)
+
+
+def frame_records(df):
+    """Rows of a JSON-safe frame as dicts, built from column lists rather than row by row"""
+    columns = [str(column) for column in df.columns]
+    values = [df[column].tolist() for column in df.columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _default(obj):
+    """Types neither encoder handles natively"""
+    # Only look for pandas/numpy objects if something already imported those libraries
+    pd = sys.modules.get('pandas')
+    np = sys.modules.get('numpy')
+    if pd is not None and isinstance(obj, pd.DataFrame):
+        return frame_records(json_frame(obj))
+    if pd is not None and isinstance(obj, pd.Series):
+        return json_column(obj).tolist()
+    if np is not None and isinstance(obj, (np.integer, np.floating, np.bool_)):
+        return obj.item()
+    if np is not None and isinstance(obj, np.ndarray):
+        return obj.tolist()
+    # NaT is a datetime too, but has no date to format
+    if pd is not None and obj is pd.NaT:
+        return None
+    if isinstance(obj, DATE_TYPES):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """Encode to UTF-8 JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    """Decode JSON text or bytes"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by dumps/loads above, so jsonify uses the fast encoder"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    @metrics.timed('http', 'serialise')
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Skip the str round trip: the response body is bytes anyway
+        return self._app.response_class(dumps(obj), mimetype='application/json')
+
+
+def choose_encoding(accept_encoding):
+    """Best content coding the client accepts: br if available, then gzip"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding):
+    """Compress a body with a fast setting: these are dynamic responses, not static assets"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=4)
+    return gzip.compress(data, compresslevel=5)
+
+
+def etag_variants(etag):
+    """An ETag and the per-encoding tags compress_response derives from it"""
+    return [etag, f"{etag}-gzip", f"{etag}-br"]
+
+
+def compress_response(response, accept_encoding, min_size=1024):
+    """
+    Compress a finished response in place when it is large enough, of a textual type,
+    not streamed and not already encoded. A strong ETag gets the coding appended,
+    since the compressed bytes are a different representation.
+    """
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+            or response.status_code in (204, 206, 304) or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    with metrics.timer('http', 'compress'):
+        response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
@@ -0,0 +1,217 @@
+"""
+SQLite Leader Lease So Exactly One Server Process Runs the Email Monitor
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+
+class LeaderLease:
+    """
+    A named, expiring lease in SQLite. The holder renews it well within `ttl`; if the
+    holder dies, the lease expires and another process takes over.
+    """
+
+    def __init__(self, name, db_path="data/email_pipeline.db", ttl=30):
+        self.name = name
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.ttl = ttl
+        self.holder = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.init_database()
+
+    def get_connection(self):
+        """Get database connection (autocommit, transactions are explicit)"""
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def init_database(self):
+        """Initialize lease and shared state tables"""
+        conn = self.get_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                acquired_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS shared_state (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.close()
+
+    def acquire(self):
+        """Take the lease if it is free or expired, or renew it if held; True when held"""
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            # The write lock makes check-and-take atomic across processes
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT holder, acquired_at, expires_at FROM leases WHERE name = ?",
+                               (self.name,)).fetchone()
+            held = row is None or row[0] == self.holder or row[2] < now
+            if held:
+                acquired_at = row[1] if row and row[0] == self.holder else now
+                conn.execute(
+                    "INSERT OR REPLACE INTO leases (name, holder, acquired_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.name, self.holder, acquired_at, now + self.ttl)
+                )
+            conn.execute("COMMIT")
+            return held
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def release(self):
+        """Give the lease up if this process holds it"""
+        conn = self.get_connection()
+        try:
+            conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (self.name, self.holder))
+        finally:
+            conn.close()
+
+    def current(self):
+        """The live lease as {'holder', 'acquired_at', 'expires_at'}, or None"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT holder, acquired_at, expires_at FROM leases WHERE name = ?",
+                               (self.name,)).fetchone()
+        finally:
+            conn.close()
+        if row is None or row[2] < time.time():
+            return None
+        return {'holder': row[0], 'acquired_at': row[1], 'expires_at': row[2]}
+
+    def get_state(self, key, default=None):
+        """Value of a shared setting"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT value FROM shared_state WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else default
+
+    def set_state(self, key, value):
+        """Store a shared setting visible to every process"""
+        conn = self.get_connection()
+        try:
+            conn.execute("INSERT OR REPLACE INTO shared_state (key, value, updated_at) VALUES (?, ?, ?)",
+                         (key, value, time.time()))
+        finally:
+            conn.close()
+
+
+class MonitorSupervisor:
+    """
+    Runs in every server process. Monitoring is switched on or off through a shared
+    flag; whichever process holds the lease runs EmailMonitor, the others stand by and
+    take over when the lease expires.
+    """
+
+    def __init__(self, email_monitor, lease=None, interval=None):
+        self.email_monitor = email_monitor
+        self.lease = lease or LeaderLease('email_monitor')
+        self.interval = interval or self.lease.ttl / 3
+        self.thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def desired(self):
+        return self.lease.get_state('email_monitor.enabled') == '1'
+
+    def set_desired(self, enabled):
+        """Switch monitoring on or off for the whole deployment"""
+        self.lease.set_state('email_monitor.enabled', '1' if enabled else '0')
+        self.start()
+        return self.tick()
+
+    def tick(self):
+        """Bring this process in line with the flag and the lease; True if it runs the monitor"""
+        with self._lock:
+            desired = self.desired
+            if desired and self.lease.acquire():
+                if not self.email_monitor.monitoring:
+                    self.email_monitor.start_monitoring()
+                self.publish()
+                return True
+
+            # Not wanted, or another process leads
+            if self.email_monitor.monitoring:
+                self.email_monitor.stop_monitoring()
+            if not desired:
+                if self.lease.get_state('email_monitor.running') == self.lease.holder:
+                    self.lease.set_state('email_monitor.running', '')
+                self.lease.release()
+            return False
+
+    def publish(self):
+        """Share whether the monitor really runs here (connected, thread alive) with every process"""
+        self.lease.set_state('email_monitor.running', self.lease.holder if self.email_monitor.is_running() else '')
+
+    def status(self):
+        """Deployment-wide monitor status, the same from every process"""
+        lease = self.lease.current()
+        # Only the current leader's report counts, not one left behind by an earlier leader
+        running = bool(lease) and self.lease.get_state('email_monitor.running') == lease['holder']
+        return {
+            'enabled': self.desired,
+            'monitoring': running,
+            'leader': lease['holder'] if lease else None,
+            'is_leader': bool(lease) and lease['holder'] == self.lease.holder
+        }
+
+    def wait_until_running(self, timeout=5.0, poll=0.2):
+        """
+        Status once the leader reports the monitor running, it has failed to start
+        in this process, or `timeout` passes
+        """
+        deadline = time.time() + timeout
+        while True:
+            if self.lease.holder == (self.lease.current() or {}).get('holder'):
+                self.publish()
+            status = self.status()
+            if status['monitoring'] or time.time() >= deadline:
+                return status
+            thread = self.email_monitor.monitor_thread
+            if status['is_leader'] and not (thread and thread.is_alive()):
+                return status  # Could not connect; the reason is in the activity log
+            time.sleep(poll)
+
+    def start(self):
+        """Start the background loop once per process"""
+        with self._lock:
+            if self.thread and self.thread.is_alive():
+                return
+            self._stop.clear()
+            self.thread = threading.Thread(target=self._run, name='monitor-supervisor')
+            self.thread.daemon = True
+            self.thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Monitor supervisor error: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        """Stop the loop, the monitor if it runs here, and hand the lease on"""
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+        if self.email_monitor.monitoring:
+            self.email_monitor.stop_monitoring()
+        self.lease.release()
@@ -0,0 +1,126 @@
+"""
+Persistent LLM Response Cache
+"""
+import sqlite3
+import hashlib
+import threading
+import time
+from pathlib import Path
+
+from email_text import normalise_whitespace
+
+class LLMCache:
+    """Content-addressed cache of model responses with TTL and size-bounded LRU eviction"""
+
+    def __init__(self, db_path="data/llm_cache.db", ttl_seconds=7 * 24 * 3600, max_entries=10000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self.init_database()
+
+    def get_connection(self):
+        """Get database connection"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        """Initialize cache table"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+
+        conn.commit()
+        conn.close()
+
+    def make_key(self, model_name, prompt):
+        """Key on the model name plus a hash of the whitespace-normalised prompt"""
+        normalised = normalise_whitespace(prompt)
+        return hashlib.sha256(f"{model_name}\n{normalised}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Get a cached response, or None on a miss"""
+        now = time.time()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,))
+            row = cursor.fetchone()
+
+            if row and now - row[1] > self.ttl_seconds:
+                cursor.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                self._count('expired')
+                row = None
+
+            if not row:
+                self._count('misses')
+                return None
+
+            cursor.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self._count('hits')
+            return row[0]
+        finally:
+            conn.close()
+
+    def put(self, key, model_name, response):
+        """Store a response and evict least recently used entries over the size bound"""
+        now = time.time()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model_name, response, now, now)
+            )
+            cursor.execute("""
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            if cursor.rowcount > 0:
+                self._count('evictions', cursor.rowcount)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Remove all cached responses"""
+        conn = self.get_connection()
+        conn.execute("DELETE FROM llm_cache")
+        conn.commit()
+        conn.close()
+
+    def get_stats(self):
+        """Hit/miss metrics and current size"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM llm_cache")
+        entries = cursor.fetchone()[0]
+        conn.close()
+
+        with self._lock:
+            stats = dict(self.stats)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['entries'] = entries
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+        return stats
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
@@ -0,0 +1,258 @@
+"""
+Concurrent LLM Client with Rate Limiting, Retries and Timeouts
+"""
+import bisect
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from rate_limit import TokenBucket
+
+# Error names/messages that are worth retrying (rate limits, overload, transient network issues)
+RETRYABLE_ERROR_NAMES = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'InternalServerError',
+    'DeadlineExceeded', 'Aborted', 'ConnectionError', 'TimeoutError', 'RetryableLLMError'
+}
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# For errors that only carry a message: status lines and phrases, never bare numbers,
+# which also appear in prompts, IDs and byte counts
+RETRYABLE_ERROR_PATTERN = re.compile(
+    r'\b(?:408 request timeout|429 too many requests|500 internal server error|502 bad gateway|'
+    r'503 service unavailable|504 gateway time-?out|rate limit(?:ed)?|quota exceeded|resource exhausted|'
+    r'(?:service|temporarily) unavailable|timed out|deadline exceeded)\b',
+    re.IGNORECASE
+)
+
+
+class LLMError(Exception):
+    """LLM call failed after all retries"""
+
+
+class LLMTimeoutError(LLMError):
+    """LLM call exceeded its deadline"""
+
+
+class RetryableLLMError(LLMError):
+    """Transient LLM failure that should be retried"""
+
+
+def is_retryable(error):
+    """Check if an LLM error is transient"""
+    if isinstance(error, (RetryableLLMError, LLMTimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    status = status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return bool(RETRYABLE_ERROR_PATTERN.search(str(error)))
+
+
+def status_code(error):
+    """HTTP status of an API error (code, status_code or response.status_code), or None"""
+    for value in (getattr(error, 'code', None), getattr(error, 'status_code', None),
+                  getattr(getattr(error, 'response', None), 'status_code', None)):
+        if isinstance(value, int) and not isinstance(value, bool) and 100 <= value < 600:
+            return value
+    return None
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with recent-sample percentiles"""
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, buckets=None, window=1000):
+        self.buckets = tuple(buckets or self.BUCKETS)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        """Record one latency"""
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self._recent.append(seconds)
+
+    def percentile(self, fraction):
+        """Latency percentile over the recent window"""
+        with self._lock:
+            samples = sorted(self._recent)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def snapshot(self):
+        """Cumulative bucket counts plus summary statistics"""
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+            total = self.total
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+
+        return {
+            'buckets': cumulative,
+            'count': count,
+            'sum': round(total, 4),
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99)
+        }
+
+
+class LLMClient:
+    """
+    Runs model calls on a bounded thread pool with rate limits, deadlines and retries.
+    A call that times out keeps its pool thread until the model returns, so the pool
+    has `max_abandoned` spare threads for those; beyond that, new calls wait for a
+    thread within their deadline instead of queueing behind stuck ones.
+    """
+
+    def __init__(self, model, max_concurrency=4, requests_per_minute=60, tokens_per_minute=250000,
+                 timeout=30, max_retries=3, backoff_base=1.0, backoff_max=30.0, expected_output_tokens=500,
+                 max_abandoned=None):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_abandoned = max_concurrency if max_abandoned is None else max_abandoned
+        self.timeout = timeout  # Deadline for a single attempt, in seconds
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.expected_output_tokens = expected_output_tokens
+        self.request_limiter = TokenBucket(requests_per_minute / 60.0, capacity=max(1, max_concurrency))
+        self.token_limiter = TokenBucket(tokens_per_minute / 60.0, capacity=tokens_per_minute)
+        self.histogram = LatencyHistogram()
+        self.stats = {'calls': 0, 'succeeded': 0, 'failed': 0, 'retries': 0, 'timeouts': 0, 'in_flight': 0,
+                      'abandoned': 0}
+        pool_size = max_concurrency + self.max_abandoned
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="llm")
+        self._callers = threading.BoundedSemaphore(max_concurrency)  # Calls someone is waiting for
+        self._threads = threading.BoundedSemaphore(pool_size)  # Free pool threads, abandoned calls included
+        self._lock = threading.Lock()
+
+    def estimate_tokens(self, prompt):
+        """Rough token count (about 4 characters per token) including the expected output"""
+        return len(prompt) // 4 + self.expected_output_tokens
+
+    def generate(self, prompt, deadline=None):
+        """Generate text for a prompt, retrying transient errors with jittered backoff"""
+        started = time.monotonic()
+        deadline_at = started + deadline if deadline else None
+        self._count('calls')
+        attempt = 0
+
+        while True:
+            try:
+                text = self._attempt(prompt, deadline_at)
+                self._count('succeeded')
+                return text
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._count('failed')
+                    raise
+
+                # Full jitter exponential backoff
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+                    self._count('failed')
+                    raise LLMTimeoutError(f"Deadline exceeded after {attempt + 1} attempts: {e}") from e
+
+                attempt += 1
+                self._count('retries')
+                time.sleep(delay)
+
+    def _attempt(self, prompt, deadline_at=None):
+        """Run one rate-limited model call with a timeout"""
+        if not self.request_limiter.acquire(timeout=self._remaining(deadline_at)):
+            raise LLMTimeoutError("Timed out waiting for request rate limit")
+        if not self.token_limiter.acquire(self.estimate_tokens(prompt), timeout=self._remaining(deadline_at)):
+            raise LLMTimeoutError("Timed out waiting for token rate limit")
+
+        if not self._callers.acquire(timeout=self._remaining(deadline_at)):
+            raise LLMTimeoutError("Timed out waiting for an LLM call slot")
+        try:
+            if not self._threads.acquire(timeout=self._remaining(deadline_at)):
+                raise LLMTimeoutError("Timed out waiting for abandoned LLM calls to finish")
+
+            started = time.monotonic()
+            self._count('in_flight')
+            try:
+                future = self._executor.submit(self.model.generate_content, prompt)
+            except Exception:
+                self._threads.release()
+                raise
+            future.add_done_callback(lambda _: self._threads.release())
+            timeout = self._remaining(deadline_at)
+            try:
+                response = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                # The worker finishes in the background and holds its thread until then
+                self._count('timeouts')
+                if not future.cancel():
+                    self._count('abandoned')
+                    future.add_done_callback(lambda _: self._count('abandoned', -1))
+                raise LLMTimeoutError(f"LLM call timed out after {timeout:.3g}s")
+            finally:
+                self._count('in_flight', -1)
+        finally:
+            self._callers.release()
+
+        self.histogram.observe(time.monotonic() - started)
+        return response.text
+
+    def _remaining(self, deadline_at):
+        """Time left for the current attempt"""
+        if deadline_at is None:
+            return self.timeout
+        return min(self.timeout, max(0.0, deadline_at - time.monotonic()))
+
+    def generate_many(self, prompts, deadline=None):
+        """Generate several prompts concurrently; failed items are returned as exceptions"""
+        results = [None] * len(prompts)
+
+        def run(index):
+            try:
+                results[index] = self.generate(prompts[index], deadline=deadline)
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(prompts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def get_stats(self):
+        """Call counters and latency histogram"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['max_concurrency'] = self.max_concurrency
+        stats['latency'] = self.histogram.snapshot()
+        return stats
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        self._executor.shutdown(wait=False)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+
+class FakeResponse:
+    """Minimal response object with the `.text` attribute AIProcessor reads"""
+
+    def __init__(self, text):
+        self.text = text
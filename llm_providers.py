@@ -0,0 +1,182 @@
+"""
+LLM Providers: Gemini, a Deterministic Local Stand-in, and Record/Replay Cassettes
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+
+from llm_client import FakeResponse, LLMError
+
+DEFAULT_MODEL = 'gemini-2.0-flash-lite'
+
+
+class LLMProvider:
+    """A text-generation backend: anything with a name and generate_content(prompt) -> .text"""
+    name = 'base'
+
+    def __init__(self, model_name=DEFAULT_MODEL):
+        self.model_name = model_name
+
+    def generate_content(self, prompt):
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through google.generativeai"""
+    name = 'gemini'
+
+    def __init__(self, api_key, model_name=DEFAULT_MODEL):
+        super().__init__(model_name)
+        # Imported here so the SDK is only needed when Gemini is actually used
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt):
+        return self.model.generate_content(prompt)
+
+
+class LocalProvider(LLMProvider):
+    """
+    Deterministic offline stand-in. Responses come from `templates`, a list of
+    (regex, response) pairs tried in order, where response is a format string filled
+    from the regex's named groups or a callable(match, prompt). Prompts matching no
+    template get a plausible extraction built from the email text in the prompt.
+    """
+    name = 'local'
+
+    def __init__(self, model_name='local-template', latency=0.0, jitter=0.0, templates=None):
+        super().__init__(model_name)
+        self.latency = latency
+        self.jitter = jitter
+        self.templates = [(re.compile(pattern, re.IGNORECASE | re.DOTALL), response)
+                          for pattern, response in (templates or [])]
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls += 1
+
+        # Jitter derived from the prompt, so a rerun sleeps exactly as long
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        delay = self.latency + self.jitter * digest[0] / 255
+        if delay:
+            time.sleep(delay)
+
+        return FakeResponse(self.respond(prompt))
+
+    def respond(self, prompt):
+        for pattern, response in self.templates:
+            match = pattern.search(prompt)
+            if match:
+                return response(match, prompt) if callable(response) else response.format(**match.groupdict())
+
+        if 'recruitment system command' in prompt:
+            return json.dumps({'action': 'search', 'parameters': {'type': 'cv'}})
+
+        sections = re.split(r'--- Email (\d+) ---', prompt)
+        if 'JSON array' in prompt and len(sections) > 1:
+            items = []
+            for index, section in zip(sections[1::2], sections[2::2]):
+                item = self._extract(section)
+                item['index'] = int(index)
+                items.append(item)
+            return json.dumps(items)
+
+        return json.dumps(self._extract(prompt))
+
+    def _extract(self, text):
+        """Fields a model would plausibly pull out of one email"""
+        def field(*labels):
+            for label in labels:
+                match = re.search(rf'^\s*{label}\s*:\s*(.+?)\s*$', text, re.IGNORECASE | re.MULTILINE)
+                if match:
+                    return match.group(1)
+            return None
+
+        extracted = {
+            'candidate_name': field('Candidate(?: Name)?', 'Name'),
+            'position': field('Position', 'Role', 'Job Title'),
+            'project_name': field('Project'),
+            'email': field('E-?mail'),
+            'mobile': field('Mobile', 'Phone'),
+            'notice_period': field('Notice Period'),
+            'interview_date': field('Interview Date'),
+            'feedback': field('Feedback'),
+        }
+        job_id = re.search(r'\bJOB-\d{6}-\d{3}\b', text)
+        if job_id:
+            extracted['job_id'] = job_id.group()
+        return {key: value for key, value in extracted.items() if value}
+
+
+class CassetteProvider(LLMProvider):
+    """
+    Records responses of another provider to a JSON-lines cassette, or replays them.
+    Modes: 'record' always calls the inner provider, 'replay' only reads the cassette,
+    'auto' replays when it can and records otherwise.
+    """
+    name = 'cassette'
+
+    def __init__(self, path, inner=None, mode='auto'):
+        super().__init__(inner.model_name if inner else DEFAULT_MODEL)
+        if mode not in ('record', 'replay', 'auto'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode != 'replay' and inner is None:
+            raise ValueError("Recording needs an inner provider")
+        self.path = Path(path)
+        self.inner = inner
+        self.mode = mode
+        self.stats = {'replayed': 0, 'recorded': 0}
+        self._entries = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        entries = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry['key']] = entry['response']
+        return entries
+
+    def key(self, prompt):
+        return hashlib.sha256(f"{self.model_name}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def generate_content(self, prompt):
+        key = self.key(prompt)
+        if self.mode != 'record' and key in self._entries:
+            with self._lock:
+                self.stats['replayed'] += 1
+            return FakeResponse(self._entries[key])
+
+        if self.mode == 'replay':
+            raise LLMError(f"No recorded response for prompt {key[:12]} in {self.path}")
+
+        text = self.inner.generate_content(prompt).text
+        with self._lock:
+            self._entries[key] = text
+            self.stats['recorded'] += 1
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': key, 'model': self.model_name, 'prompt': prompt, 'response': text}) + '\n')
+        return FakeResponse(text)
+
+
+def create_provider(name, api_key=None, model_name=DEFAULT_MODEL, cassette=None, cassette_mode='auto', **options):
+    """Build a provider by name ('gemini' or 'local'), optionally wrapped in a cassette"""
+    if name == 'gemini':
+        provider = GeminiProvider(api_key, model_name)
+    elif name == 'local':
+        provider = LocalProvider(**options)
+    else:
+        raise ValueError(f"Unknown LLM provider: {name}")
+
+    if cassette:
+        provider = CassetteProvider(cassette, inner=provider, mode=cassette_mode)
+    return provider
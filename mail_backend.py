@@ -0,0 +1,335 @@
+"""
+Mailbox Backends and Staged Messages for the Email Monitor
+"""
+import mailbox
+import email.utils
+from collections import Counter
+from email.header import decode_header, make_header
+from pathlib import Path
+
+# Fields that are cheap to read and are loaded up front for every message
+HEADER_FIELDS = ('subject', 'sender', 'sender_name', 'received_time')
+
+# Fields that cost one or more round trips and are only loaded for candidates
+LAZY_FIELDS = ('to', 'conversation_id', 'body', 'recipients', 'attachments')
+
+
+class MailboxBackend:
+    """Base class for the mail sources watched by EmailMonitor"""
+    name = "mailbox"
+    folders = ("Inbox", "Sent")
+
+    def __init__(self):
+        self.fetch_counts = Counter()
+
+    def open(self):
+        """Connect to the mailbox"""
+        pass
+
+    def close(self):
+        """Release the mailbox connection"""
+        pass
+
+    def count(self, folder):
+        """Number of messages currently in a folder"""
+        raise NotImplementedError
+
+    def get_message(self, folder, index):
+        """Get the raw message at a 1-based index in a folder"""
+        raise NotImplementedError
+
+    def messages_between(self, folder, start, end):
+        """Raw messages received in [start, end), oldest first"""
+        raise NotImplementedError
+
+    def clone(self):
+        """New unopened backend for the same mailbox, for use on another thread"""
+        raise NotImplementedError
+
+    def fetch(self, raw_message, field):
+        """Fetch a single message field, counting the round trip"""
+        self.fetch_counts[field] += 1
+        return self._fetch(raw_message, field)
+
+    def _fetch(self, raw_message, field):
+        raise NotImplementedError
+
+    def total_fetches(self):
+        """Total number of field fetches since the last reset"""
+        return sum(self.fetch_counts.values())
+
+    def reset_fetch_counts(self):
+        """Reset fetch counters"""
+        self.fetch_counts.clear()
+
+
+class OutlookBackend(MailboxBackend):
+    """Outlook (MAPI over COM) mailbox"""
+    name = "Outlook"
+    FOLDER_IDS = {"Inbox": 6, "Sent": 5}  # 6 = Inbox, 5 = Sent Items
+
+    def __init__(self):
+        super().__init__()
+        self._folders = {}
+        self._pythoncom = None
+
+    def open(self):
+        """Connect to Outlook"""
+        # Imported here so the module loads on machines without pywin32
+        import pythoncom
+        import win32com.client
+
+        pythoncom.CoInitialize()
+        self._pythoncom = pythoncom
+
+        outlook = win32com.client.Dispatch("Outlook.Application")
+        namespace = outlook.GetNamespace("MAPI")
+        self._folders = {
+            name: namespace.GetDefaultFolder(folder_id)
+            for name, folder_id in self.FOLDER_IDS.items()
+        }
+
+    def close(self):
+        """Release COM"""
+        self._folders = {}
+        if self._pythoncom:
+            self._pythoncom.CoUninitialize()
+            self._pythoncom = None
+
+    def count(self, folder):
+        return self._folders[folder].Items.Count
+
+    def get_message(self, folder, index):
+        return self._folders[folder].Items[index]
+
+    def messages_between(self, folder, start, end):
+        date_format = '%m/%d/%Y %I:%M %p'
+        items = self._folders[folder].Items.Restrict(
+            f"[ReceivedTime] >= '{start.strftime(date_format)}' AND [ReceivedTime] < '{end.strftime(date_format)}'"
+        )
+        items.Sort("[ReceivedTime]")
+        return [items[i] for i in range(1, items.Count + 1)]
+
+    def clone(self):
+        return OutlookBackend()
+
+    def _fetch(self, message, field):
+        if field == 'subject':
+            return message.Subject
+        if field == 'sender':
+            return message.SenderEmailAddress
+        if field == 'sender_name':
+            return message.SenderName
+        if field == 'received_time':
+            return message.ReceivedTime
+        if field == 'to':
+            return message.To
+        if field == 'conversation_id':
+            return message.ConversationID
+        if field == 'body':
+            return message.Body
+        if field == 'recipients':
+            recipients = []
+            try:
+                for recipient in message.Recipients:
+                    recipients.append({
+                        'name': recipient.Name,
+                        'email': recipient.Address
+                    })
+            except:
+                pass
+            return recipients
+        if field == 'attachments':
+            attachments = []
+            try:
+                for attachment in message.Attachments:
+                    attachments.append({
+                        'filename': attachment.FileName,
+                        'size': attachment.Size
+                    })
+            except:
+                pass
+            return attachments
+        raise KeyError(field)
+
+
+class LocalMailboxBackend(MailboxBackend):
+    """Maildir/mbox stand-in for Outlook, used for local runs and testing"""
+    name = "local mailbox"
+
+    def __init__(self, inbox_path, sent_path=None, mailbox_format="maildir"):
+        super().__init__()
+        self.paths = {"Inbox": Path(inbox_path)}
+        if sent_path:
+            self.paths["Sent"] = Path(sent_path)
+        self.folders = tuple(self.paths)
+        self.mailbox_format = mailbox_format
+        self._boxes = {}
+
+    def open(self):
+        """Open the mailbox files"""
+        for folder, path in self.paths.items():
+            if self.mailbox_format == "mbox":
+                self._boxes[folder] = mailbox.mbox(path)
+            else:
+                self._boxes[folder] = mailbox.Maildir(path, create=True)
+
+    def close(self):
+        """Close the mailbox files"""
+        for box in self._boxes.values():
+            box.close()
+        self._boxes = {}
+
+    def _keys(self, folder):
+        # Maildir keys start with the delivery timestamp, mbox keys are positions
+        return sorted(self._boxes[folder].keys(), key=lambda key: (len(str(key)), str(key)))
+
+    def count(self, folder):
+        return len(self._keys(folder))
+
+    def get_message(self, folder, index):
+        key = self._keys(folder)[index - 1]
+        return self._boxes[folder].get_message(key)
+
+    def messages_between(self, folder, start, end):
+        box = self._boxes[folder]
+        dated = []
+        for key in self._keys(folder):
+            message = box.get_message(key)
+            received = self._fetch(message, 'received_time')
+            if received is None:
+                continue
+            if received.tzinfo:
+                # Compare in local time, like the naive dates used for partitions
+                received = received.astimezone().replace(tzinfo=None)
+            if start <= received < end:
+                dated.append((received, str(key), message))
+        dated.sort(key=lambda item: (item[0], item[1]))
+        return [message for received, key, message in dated]
+
+    def clone(self):
+        return LocalMailboxBackend(
+            self.paths["Inbox"], self.paths.get("Sent"), mailbox_format=self.mailbox_format
+        )
+
+    def _fetch(self, message, field):
+        if field == 'subject':
+            return self._decode(message.get('Subject', ''))
+        if field == 'sender':
+            return email.utils.parseaddr(message.get('From', ''))[1]
+        if field == 'sender_name':
+            name, address = email.utils.parseaddr(message.get('From', ''))
+            return self._decode(name) or address
+        if field == 'received_time':
+            try:
+                return email.utils.parsedate_to_datetime(message.get('Date'))
+            except (TypeError, ValueError):
+                return None
+        if field == 'to':
+            return self._decode(message.get('To', ''))
+        if field == 'conversation_id':
+            # Root of the References chain identifies the thread
+            references = (message.get('References') or '').split()
+            return references[0] if references else (message.get('In-Reply-To') or message.get('Message-ID'))
+        if field == 'body':
+            return self._get_body(message)
+        if field == 'recipients':
+            addresses = message.get_all('To', []) + message.get_all('Cc', [])
+            return [
+                {'name': self._decode(name) or address, 'email': address}
+                for name, address in email.utils.getaddresses(addresses)
+            ]
+        if field == 'attachments':
+            attachments = []
+            for part in message.walk():
+                filename = part.get_filename()
+                if filename:
+                    payload = part.get_payload(decode=True) or b''
+                    attachments.append({
+                        'filename': self._decode(filename),
+                        'size': len(payload)
+                    })
+            return attachments
+        raise KeyError(field)
+
+    def _get_body(self, message):
+        """Get the plain text body"""
+        for part in message.walk():
+            if part.get_content_type() == 'text/plain' and not part.get_filename():
+                payload = part.get_payload(decode=True) or b''
+                charset = part.get_content_charset() or 'utf-8'
+                return payload.decode(charset, errors='replace')
+        return ''
+
+    def _decode(self, value):
+        """Decode RFC 2047 encoded header values"""
+        if not value:
+            return ''
+        try:
+            return str(make_header(decode_header(value)))
+        except Exception:
+            return str(value)
+
+
+class StagedMessage:
+    """Mail item that loads header fields first and the rest on demand"""
+
+    def __init__(self, backend, raw_message, folder):
+        self.backend = backend
+        self.raw_message = raw_message
+        self.folder = folder
+        self._fields = {}
+        for field in HEADER_FIELDS:
+            self._fields[field] = backend.fetch(raw_message, field)
+
+    def get(self, field):
+        """Get a field, fetching it from the backend on first access"""
+        if field not in self._fields:
+            self._fields[field] = self.backend.fetch(self.raw_message, field)
+        return self._fields[field]
+
+    def is_loaded(self, field):
+        """Check if a field has already been fetched"""
+        return field in self._fields
+
+    @property
+    def subject(self):
+        return self.get('subject') or ''
+
+    @property
+    def sender(self):
+        return self.get('sender')
+
+    @property
+    def sender_name(self):
+        return self.get('sender_name')
+
+    @property
+    def received_time(self):
+        return self.get('received_time')
+
+    @property
+    def body(self):
+        return self.get('body') or ''
+
+    @property
+    def recipients(self):
+        return self.get('recipients')
+
+    @property
+    def attachments(self):
+        return self.get('attachments')
+
+    def to_email_data(self):
+        """Materialise the full email_data dict used by the AI processor"""
+        return {
+            'folder': self.folder,
+            'subject': self.subject,
+            'sender': self.sender,
+            'sender_name': self.sender_name,
+            'recipients': self.recipients,
+            'body': self.body,
+            'received_time': self.received_time,
+            'conversation_id': self.get('conversation_id'),
+            'attachments': self.attachments
+        }
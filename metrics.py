@@ -0,0 +1,293 @@
+"""
+Request and Stage Metrics in Prometheus Text Format
+"""
+import bisect
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+# Seconds; spans SQLite queries (milliseconds) up to LLM calls and workbook writes
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# METRICS_ENABLED=0 turns every timer into a plain call and hides /api/metrics
+_enabled = os.environ.get('METRICS_ENABLED', '1') != '0'
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(flag):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def format_labels(names, values, extra=''):
+    """{name="value",...} with Prometheus escaping"""
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination"""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self.values)
+        return [(self.name, format_labels(self.labelnames, labels), value) for labels, value in sorted(values.items())]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, such as requests in flight"""
+    kind = 'gauge'
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    """Cumulative latency buckets, sum and count per label combination"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}  # labels -> [bucket counts (last is +Inf), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += seconds
+
+    def samples(self):
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self.series.items()}
+
+        samples = []
+        for labels, (counts, total) in sorted(series.items()):
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                running += count
+                le = 'le="' + format_value(bound) + '"'
+                samples.append((f"{self.name}_bucket", format_labels(self.labelnames, labels, le), running))
+            samples.append((f"{self.name}_sum", format_labels(self.labelnames, labels), round(total, 6)))
+            samples.append((f"{self.name}_count", format_labels(self.labelnames, labels), running))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Metrics of this process. Timers only update in-memory counts; the text format is
+    built when /api/metrics is scraped, and collectors report figures that other
+    components already keep (LLM client and cache counters) at that point only.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, function):
+        """
+        Register a function returning (name, kind, documentation, [(labels dict, value)])
+        tuples, called at scrape time
+        """
+        self.collectors.append(function)
+        return function
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {format_value(value)}" for name, labels, value in metric.samples())
+
+        for collector in self.collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{format_labels(labels.keys(), labels.values())} {format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    'tracker_http_requests_total', 'HTTP requests by route and status', ('method', 'route', 'status'))
+HTTP_SECONDS = registry.histogram(
+    'tracker_http_request_duration_seconds', 'Time to handle a request, by route', ('method', 'route'))
+HTTP_IN_FLIGHT = registry.gauge('tracker_http_requests_in_flight', 'Requests being handled')
+STAGE_SECONDS = registry.histogram(
+    'tracker_stage_duration_seconds', 'Time spent in an instrumented stage', ('component', 'stage'))
+STAGE_ERRORS = registry.counter(
+    'tracker_stage_errors_total', 'Instrumented stages that raised', ('component', 'stage'))
+
+
+class Timer:
+    """Context manager adding the time of its block to a stage"""
+    __slots__ = ('labels', 'started')
+
+    def __init__(self, component, stage):
+        self.labels = (component, stage)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        STAGE_SECONDS.observe(self.labels, time.perf_counter() - self.started)
+        if exc_type is not None:
+            STAGE_ERRORS.inc(self.labels)
+        return False
+
+
+class NullTimer:
+    """Timer stand-in while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+def timer(component, stage):
+    """Time a block: `with metrics.timer('excel', 'write'): ...`"""
+    return Timer(component, stage) if _enabled else NULL_TIMER
+
+
+def timed(component, stage):
+    """Decorator timing every call of a function as a stage"""
+    labels = (component, stage)
+
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                STAGE_ERRORS.inc(labels)
+                raise
+            finally:
+                STAGE_SECONDS.observe(labels, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+SQL_STAGES = {'SELECT': 'select', 'INSERT': 'insert', 'UPDATE': 'update', 'DELETE': 'delete'}
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor timing each statement as a database stage named after its verb"""
+
+    def execute(self, sql, parameters=()):
+        if not _enabled:
+            return super().execute(sql, parameters)
+        with Timer('database', SQL_STAGES.get(sql.lstrip()[:6].upper(), 'other')):
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        if not _enabled:
+            return super().executemany(sql, parameters)
+        with Timer('database', SQL_STAGES.get(sql.lstrip()[:6].upper(), 'other')):
+            return super().executemany(sql, parameters)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors and execute shortcuts are timed"""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # The C shortcuts create plain cursors, so route them through cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.cursor().executemany(sql, parameters)
+
+
+def install(app):
+    """Count and time every request of a Flask app by method, route and status"""
+    from flask import g, request
+
+    @app.before_request
+    def start_request_timer():
+        if _enabled:
+            g.metrics_started = time.perf_counter()
+            HTTP_IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def record_request(error=None):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        HTTP_IN_FLIGHT.dec()
+        # The rule, not the URL, so IDs in paths don't create a series each
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        status = g.pop('metrics_status', 500)
+        HTTP_REQUESTS.inc((request.method, route, str(status)))
+        HTTP_SECONDS.observe((request.method, route), time.perf_counter() - started)
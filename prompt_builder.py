@@ -0,0 +1,105 @@
+"""
+Token-budgeted Email Prompt Construction
+"""
+import re
+import threading
+from collections import OrderedDict
+
+from email_text import clean_body
+
+CHARS_PER_TOKEN = 4  # Same rough estimate as LLMClient.estimate_tokens
+GAP_MARKER = "[...]"
+
+# Signals that a paragraph carries recruitment facts
+INFORMATIVE_PATTERNS = [
+    (re.compile(r'^\s*[A-Za-z][\w /()-]{1,30}\s*[:\-]\s*\S', re.MULTILINE), 3),  # "Label: value" lines
+    (re.compile(r'\b(?:JOB|CV)-\d{6}-\d{3}\b', re.IGNORECASE), 3),
+    (re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+'), 2),
+    (re.compile(r'\+?\d[\d\s\-()]{7,}\d'), 2),
+    (re.compile(r'\b\d{1,2}(?::\d{2})?\s*(?:am|pm)\b|\b\d{1,4}[/-]\d{1,2}[/-]\d{1,4}\b', re.IGNORECASE), 2),
+    (re.compile(r'\b(?:candidate|cv|resume|position|role|interview|feedback|offer|salary|package|notice|'
+                r'nationality|location|experience|shortlist|selected|reject|joining|available)\w*', re.IGNORECASE), 1),
+]
+
+
+class EmailPromptBuilder:
+    """Cleans email bodies and fits them to a token budget, keeping the most informative paragraphs"""
+
+    def __init__(self, token_budget=1000, cache_size=256):
+        self.token_budget = token_budget
+        self.cache_size = cache_size
+        self.stats = {'emails': 0, 'raw_bytes': 0, 'prompt_bytes': 0, 'trimmed': 0,
+                      'prompts': 0, 'prompt_total_chars': 0, 'max_prompt_chars': 0}
+        self._cache = OrderedDict()  # Emails are formatted more than once when sizing batches
+        self._lock = threading.Lock()
+
+    def body_for_prompt(self, body, token_budget=None, forwarded=False):
+        """Compact body text for a prompt; `forwarded` keeps Outlook-style forwarded messages"""
+        budget = (token_budget or self.token_budget) * CHARS_PER_TOKEN
+        key = (body, budget, forwarded)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        compact, trimmed = self._fit(clean_body(body, forwarded=forwarded), budget)
+
+        with self._lock:
+            self._cache[key] = compact
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            self.stats['emails'] += 1
+            self.stats['raw_bytes'] += len((body or '').encode('utf-8'))
+            self.stats['prompt_bytes'] += len(compact.encode('utf-8'))
+            self.stats['trimmed'] += int(trimmed)
+        return compact
+
+    def record_prompt(self, prompt):
+        """Track the size of a prompt sent to the model"""
+        with self._lock:
+            self.stats['prompts'] += 1
+            self.stats['prompt_total_chars'] += len(prompt)
+            self.stats['max_prompt_chars'] = max(self.stats['max_prompt_chars'], len(prompt))
+
+    def _fit(self, paragraphs, budget):
+        """Keep the opening paragraph plus the best-scoring others, in their original order"""
+        text = "\n\n".join(paragraphs)
+        if len(text) <= budget:
+            return text, False
+
+        ranked = sorted(range(1, len(paragraphs)), key=lambda i: (-self._score(paragraphs[i]), i))
+        chosen = {0}
+        used = len(paragraphs[0])
+        for i in ranked:
+            size = len(paragraphs[i]) + len(GAP_MARKER) + 4
+            if used + size <= budget:
+                chosen.add(i)
+                used += size
+
+        parts = []
+        previous = -1
+        for i in sorted(chosen):
+            if i != previous + 1:
+                parts.append(GAP_MARKER)
+            parts.append(paragraphs[i])
+            previous = i
+        if previous != len(paragraphs) - 1:
+            parts.append(GAP_MARKER)
+
+        # A single oversized opening paragraph is cut at the budget
+        return "\n\n".join(parts)[:budget], True
+
+    def _score(self, paragraph):
+        """Informative-signal density of a paragraph"""
+        hits = sum(weight * len(pattern.findall(paragraph)) for pattern, weight in INFORMATIVE_PATTERNS)
+        return hits / (1 + len(paragraph) / 200)
+
+    def get_stats(self):
+        """Compaction and prompt-size metrics"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['bytes_saved'] = stats['raw_bytes'] - stats['prompt_bytes']
+        stats['saved_ratio'] = round(stats['bytes_saved'] / stats['raw_bytes'], 3) if stats['raw_bytes'] else None
+        stats['avg_prompt_chars'] = round(stats['prompt_total_chars'] / stats['prompts']) if stats['prompts'] else None
+        stats['avg_prompt_tokens'] = round(stats['prompt_total_chars'] / stats['prompts'] / CHARS_PER_TOKEN) if stats['prompts'] else None
+        return stats
@@ -0,0 +1,164 @@
+"""
+Rule-based Fast-Path Extraction of Recruitment Email Fields
+"""
+import re
+from datetime import datetime
+from dateutil import parser
+
+from email_text import is_forward, strip_quoted_history
+
+# "Label: value" lines, mapped to the field names used in the LLM extraction prompt
+LABELLED_FIELDS = {
+    'candidate_name': r'candidate(?:\s+name)?|applicant(?:\s+name)?|name\s+of\s+candidate',
+    'position': r'position|role|job\s+title|designation|applied\s+for',
+    'project_name': r'project(?:\s+name)?',
+    'current_location': r'current\s+location|location',
+    'nationality': r'nationality',
+    'cv_source': r'(?:cv\s+)?source',
+    'interview_location': r'interview\s+location|venue',
+    'email': r'e-?mail(?:\s+address)?',
+    'mobile': r'mobile(?:\s+(?:no|number))?|phone(?:\s+(?:no|number))?|contact(?:\s+(?:no|number))?|tel',
+    'notice_period': r'notice(?:\s+period)?',
+    # Only interview-labelled dates: a bare "Date:" is usually a forwarded header or an availability date
+    'interview_date': r'interview\s+date|date\s+of\s+interview|interview\s+on',
+    'interview_time': r'interview\s+time|time',
+}
+
+JOB_ID_PATTERN = re.compile(r'\bJOB-\d{6}-\d{3}\b', re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE_PATTERN = re.compile(r'(?<![\w+])\+?\d[\d\s\-()]{7,}\d\b')
+# Numeric dates, removed before looking for phone numbers so 2026-03-04 isn't one
+NUMERIC_DATE_PATTERN = re.compile(r'\b(?:\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4})\b')
+ISO_DATE_PATTERN = re.compile(r'\b\d{4}[-/.]\d{1,2}[-/.]\d{1,2}\b')
+NOTICE_PATTERN = re.compile(
+    r'notice(?:\s+period)?\s*(?:of|is|:|-)?\s*(immediate(?:ly)?|\d+\s*(?:days?|weeks?|months?))'
+    r'|(\d+\s*(?:days?|weeks?|months?))\s*(?:of\s+)?notice'
+    r'|\b(immediate(?:ly)?\s+(?:joiner|available|joining)|available\s+immediately)\b',
+    re.IGNORECASE
+)
+INTERVIEW_SENTENCE = re.compile(
+    r'interview[^.\n]{0,80}?\b(?:on|for|scheduled\s+for)\s+([^.\n]{4,60})',
+    re.IGNORECASE
+)
+TIME_PATTERN = re.compile(r'\b(\d{1,2}(?::\d{2})?\s*(?:am|pm)|\d{1,2}:\d{2})\b', re.IGNORECASE)
+
+# Emails about these need free-text understanding, so the LLM always handles them
+LLM_ONLY_KEYWORDS = ['feedback', 'result', 'offer', 'reject', 'selected', 'shortlisted', 'not suitable']
+
+# Confidence of each extraction method
+LABELLED_CONFIDENCE = 0.95
+PATTERN_CONFIDENCE = 0.85
+FUZZY_CONFIDENCE = 0.6
+
+
+def parse_when(text, default=None):
+    """
+    Parse free-text date/time. Year-first dates (2026-03-04) are read as ISO; other
+    numeric dates are day first, as written by the recruiters (04/03/2026).
+    """
+    return parser.parse(text, fuzzy=True, dayfirst=not ISO_DATE_PATTERN.search(text), default=default)
+
+
+class RuleBasedExtractor:
+    """Regex and dateutil extraction of well-structured fields, used to skip the LLM when confident"""
+
+    def __init__(self, min_confidence=0.8):
+        self.min_confidence = min_confidence
+        self._labelled = {
+            field: re.compile(rf'^\s*(?:{label})\s*[:\-]\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+            for field, label in LABELLED_FIELDS.items()
+        }
+
+    def extract(self, email_data):
+        """Extract fields with a per-field confidence; returns the fields plus overall 'confidence'"""
+        body = strip_quoted_history(email_data.get('body', ''), keep_forwarded=is_forward(email_data.get('subject')))
+        text = f"{email_data.get('subject', '')}\n{body}"
+        fields = {}
+        confidence = {}
+
+        def found(field, value, score):
+            if value and field not in fields:
+                fields[field] = value.strip()
+                confidence[field] = score
+
+        # Labelled "Field: value" lines are the most reliable
+        for field, pattern in self._labelled.items():
+            match = pattern.search(body)
+            if match:
+                found(field, match.group(1), LABELLED_CONFIDENCE)
+
+        job_id = JOB_ID_PATTERN.search(text)
+        if job_id:
+            found('job_id', job_id.group().upper(), PATTERN_CONFIDENCE)
+
+        # Candidate email: any address that isn't one of the correspondents
+        known = {str(email_data.get('sender') or '').lower()}
+        known.update(str(r.get('email', '')).lower() for r in email_data.get('recipients') or [])
+        addresses = [a for a in EMAIL_PATTERN.findall(body) if a.lower() not in known]
+        if len(set(addresses)) == 1:
+            found('email', addresses[0], PATTERN_CONFIDENCE)
+
+        phones = {re.sub(r'[\s\-()]', '', p) for p in PHONE_PATTERN.findall(NUMERIC_DATE_PATTERN.sub(' ', body))}
+        if len(phones) == 1:
+            found('mobile', phones.pop(), PATTERN_CONFIDENCE)
+
+        notice = NOTICE_PATTERN.search(body)
+        if notice:
+            value = next(group for group in notice.groups() if group)
+            found('notice_period', 'Immediate' if 'immediate' in value.lower() else value, PATTERN_CONFIDENCE)
+
+        if 'interview_date' not in fields and 'interview' in text.lower():
+            sentence = INTERVIEW_SENTENCE.search(text)
+            if sentence:
+                found('interview_date', sentence.group(1), FUZZY_CONFIDENCE)
+
+        self._normalise_interview(fields, confidence)
+
+        result = dict(fields)
+        result['field_confidence'] = confidence
+        result['confidence'] = self._overall_confidence(fields, confidence)
+        result['extraction_method'] = 'rules'
+        return result
+
+    def is_sufficient(self, extracted, email_data):
+        """Check if the rule extraction can replace the LLM for this email"""
+        text = f"{email_data.get('subject', '')} {email_data.get('body', '')}".lower()
+        if any(keyword in text for keyword in LLM_ONLY_KEYWORDS):
+            return False
+
+        # Must carry enough to drive a tracker update on its own
+        if not extracted.get('candidate_name'):
+            return False
+        if not (extracted.get('position') or extracted.get('interview_date')):
+            return False
+
+        return extracted['confidence'] >= self.min_confidence
+
+    def _normalise_interview(self, fields, confidence):
+        """Parse interview date/time into ISO strings, dropping values that don't parse"""
+        if 'interview_date' not in fields:
+            return
+
+        raw = fields['interview_date']
+        if 'interview_time' in fields:
+            raw = f"{raw} {fields['interview_time']}"
+
+        try:
+            default = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            parsed = parse_when(raw, default=default)
+        except (ValueError, OverflowError):
+            del fields['interview_date']
+            del confidence['interview_date']
+            return
+
+        fields['interview_date'] = parsed.strftime('%Y-%m-%d')
+        if TIME_PATTERN.search(raw):
+            fields['interview_time'] = parsed.strftime('%H:%M')
+            confidence['interview_time'] = confidence['interview_date']
+
+    def _overall_confidence(self, fields, confidence):
+        """Weakest confidence among the fields that drive the tracker update"""
+        key_fields = [f for f in ('candidate_name', 'position', 'interview_date', 'job_id') if f in fields]
+        if not key_fields:
+            return 0.0
+        return min(confidence[f] for f in key_fields)
@@ -0,0 +1,145 @@
+"""
+Production Server for the Recruitment Tracker
+
+Runs the Flask app under a WSGI server with several worker threads or processes.
+Every process supervises the email monitor, but only the one holding the SQLite
+lease runs it; activities, queue depth and task progress live in SQLite, so any
+worker can answer status requests.
+
+    python serve.py --threads 8                    # waitress (Windows and Linux)
+    python serve.py --workers 4 --threads 4        # gunicorn (Linux/macOS)
+    python serve.py --email-worker                 # extra process analysing queued emails
+"""
+import argparse
+import os
+import sys
+
+SERVERS = ('auto', 'waitress', 'gunicorn', 'werkzeug')
+
+
+def available(module_name):
+    try:
+        __import__(module_name)
+        return True
+    except ImportError:
+        return False
+
+
+def choose_server(name, workers):
+    """Server to use: gunicorn for several processes, waitress otherwise, werkzeug as the last resort"""
+    if name != 'auto':
+        return name
+    if workers > 1 and sys.platform != 'win32' and available('gunicorn'):
+        return 'gunicorn'
+    if available('waitress'):
+        return 'waitress'
+    return 'werkzeug'
+
+
+def start_process():
+    """Load the app in this process and start its monitor supervisor"""
+    import app as app_module
+    app_module.configure_ai()
+    app_module.monitor_supervisor.start()
+    return app_module
+
+
+def run_waitress(host, port, threads):
+    from waitress import serve
+    app_module = start_process()
+    try:
+        serve(app_module.app, host=host, port=port, threads=threads)
+    finally:
+        app_module.monitor_supervisor.stop()
+
+
+def stop_supervisor(*args):
+    """Hand the monitor lease on when a worker process exits"""
+    app_module = sys.modules.get('app')
+    if app_module is not None:
+        app_module.monitor_supervisor.stop()
+
+
+def run_email_worker(poll_interval=2, batch_size=10):
+    """Analyse queued emails in this process, alongside the monitor's own worker"""
+    import app as app_module
+    app_module.configure_ai()
+    email_monitor = app_module.email_monitor
+
+    def should_run():
+        # The API key may be set through another process after this one started
+        if not app_module.ai_processor.model:
+            app_module.configure_ai()
+        return True
+
+    print("Email worker draining the work queue (Ctrl+C to stop)")
+    try:
+        email_monitor.run_worker(should_run, poll_interval=poll_interval, batch_size=batch_size)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_gunicorn(host, port, workers, threads, timeout):
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{host}:{port}")
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('timeout', timeout)
+            # Each worker imports the app itself, so none shares the parent's threads or connections
+            self.cfg.set('preload_app', False)
+            self.cfg.set('worker_exit', stop_supervisor)
+
+        def load(self):
+            return start_process().app
+
+    Application().run()
+
+
+def run_werkzeug(host, port, workers, threads):
+    from werkzeug.serving import run_simple
+    app_module = start_process()
+    if workers > 1:
+        print("werkzeug forks a process per request rather than running workers; using threads instead")
+    try:
+        run_simple(host, port, app_module.app, threaded=threads > 1, use_reloader=False, use_debugger=False)
+    finally:
+        app_module.monitor_supervisor.stop()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve the recruitment tracker with a production WSGI server")
+    arg_parser.add_argument('--host', default=os.environ.get('HOST', '127.0.0.1'))
+    arg_parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    arg_parser.add_argument('--server', default='auto', choices=SERVERS)
+    arg_parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_WORKERS', 1)),
+                            help="Worker processes (gunicorn only)")
+    arg_parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 8)),
+                            help="Threads per process")
+    arg_parser.add_argument('--timeout', type=int, default=120, help="Worker timeout in seconds (gunicorn)")
+    arg_parser.add_argument('--email-worker', action='store_true',
+                            help="Run an email analysis worker instead of the web server")
+    args = arg_parser.parse_args()
+
+    if args.email_worker:
+        run_email_worker()
+        return
+
+    server = choose_server(args.server, args.workers)
+    print(f"Serving on http://{args.host}:{args.port} with {server} "
+          f"({args.workers if server == 'gunicorn' else 1} process(es) x {args.threads} thread(s))")
+
+    if server == 'gunicorn':
+        run_gunicorn(args.host, args.port, args.workers, args.threads, args.timeout)
+    elif server == 'waitress':
+        if args.workers > 1:
+            print("waitress runs a single process; use --threads to scale")
+        run_waitress(args.host, args.port, args.threads)
+    else:
+        run_werkzeug(args.host, args.port, args.workers, args.threads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Background Runner for Bulk Operations with Progress and Cancellation
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+class TaskRunner:
+    """
+    Runs bulk operations on a small thread pool, one chunk of items at a time, so the
+    request that submits them returns at once. Progress is kept in SQLite, so any
+    server process can report on or cancel a task; a cancel request stops the task
+    before its next chunk. Each process keeps a heartbeat on the tasks it owns; queued
+    or running tasks whose heartbeat stops (the process died) are marked failed.
+    """
+
+    def __init__(self, db_path="data/tasks.db", workers=2, chunk_size=100, max_errors=100, keep_days=7,
+                 stale_after=120):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.keep_days = keep_days
+        self.stale_after = stale_after  # Seconds without a heartbeat before a task counts as orphaned
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='task')
+        self._cancelled = set()  # Cancel requests made in this process
+        self._lock = threading.Lock()
+        self.init_database()
+
+        heartbeat = threading.Thread(target=self._heartbeat, name='task-heartbeat')
+        heartbeat.daemon = True
+        heartbeat.start()
+
+    def get_connection(self):
+        """Get database connection (autocommit)"""
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def init_database(self):
+        """Initialize task table and forget old finished tasks"""
+        conn = self.get_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                state TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                processed INTEGER DEFAULT 0,
+                succeeded INTEGER DEFAULT 0,
+                failed INTEGER DEFAULT 0,
+                errors TEXT DEFAULT '[]',
+                results TEXT DEFAULT '[]',
+                cancel_requested INTEGER DEFAULT 0,
+                created_at TEXT NOT NULL,
+                started REAL,
+                finished REAL,
+                owner TEXT,
+                heartbeat REAL
+            )
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+        for column, column_type in (('owner', 'TEXT'), ('heartbeat', 'REAL')):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} {column_type}")
+        conn.execute("DELETE FROM tasks WHERE finished < ?", (time.time() - self.keep_days * 86400,))
+        conn.close()
+        self.fail_orphaned()
+
+    def fail_orphaned(self):
+        """Mark queued or running tasks whose process stopped sending heartbeats as failed"""
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute(
+                """UPDATE tasks SET state = 'failed', finished = ?,
+                errors = json_insert(errors, '$[#]', json_object('index', NULL, 'error', ?))
+                WHERE state IN ('queued', 'running') AND (heartbeat IS NULL OR heartbeat < ?)""",
+                (now, 'Server stopped before the task finished', now - self.stale_after)
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def _heartbeat(self):
+        """Keep this process's tasks alive and fail those of processes that died"""
+        while True:
+            time.sleep(self.stale_after / 4)
+            try:
+                conn = self.get_connection()
+                try:
+                    conn.execute(
+                        "UPDATE tasks SET heartbeat = ? WHERE owner = ? AND state IN ('queued', 'running')",
+                        (time.time(), self.owner)
+                    )
+                finally:
+                    conn.close()
+                self.fail_orphaned()
+            except Exception as e:
+                print(f"Task heartbeat error: {e}")
+
+    def submit(self, kind, items, handler, chunk_size=None):
+        """
+        Queue `items` for `handler`, which takes a list of items and returns one result
+        dict per item with at least 'success' (and 'error' or 'message' on failure).
+        Returns the task ID.
+        """
+        items = list(items)
+        chunk_size = chunk_size or self.chunk_size
+        chunks = (items[start:start + chunk_size] for start in range(0, len(items), chunk_size))
+        return self.submit_chunks(kind, chunks, handler, len(items))
+
+    def submit_chunks(self, kind, chunks, handler, total):
+        """
+        Queue items that arrive chunk by chunk, such as rows read from an uploaded file.
+        `total` may be an estimate; it is set to the processed count when the task completes.
+        Returns the task ID.
+        """
+        task_id = f"TASK-{datetime.now().strftime('%y%m%d')}-{uuid.uuid4().hex[:6]}"
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                """INSERT INTO tasks (task_id, kind, state, total, created_at, owner, heartbeat)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (task_id, kind, 'queued', total, datetime.now().isoformat(), self.owner, time.time())
+            )
+        finally:
+            conn.close()
+        self._executor.submit(self._run, task_id, kind, chunks, handler)
+        return task_id
+
+    def _update(self, task_id, **fields):
+        conn = self.get_connection()
+        try:
+            assignments = ', '.join(f"{name} = ?" for name in fields)
+            conn.execute(f"UPDATE tasks SET {assignments} WHERE task_id = ?", (*fields.values(), task_id))
+        finally:
+            conn.close()
+
+    def _cancel_requested(self, task_id):
+        with self._lock:
+            if task_id in self._cancelled:
+                return True
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT cancel_requested FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        finally:
+            conn.close()
+        return bool(row and row[0])
+
+    def _run(self, task_id, kind, chunks, handler):
+        counts = {'processed': 0, 'succeeded': 0, 'failed': 0}
+        errors = []
+        results = []
+        state = 'completed'
+        self._update(task_id, state='running', started=time.time())
+        try:
+            for chunk in chunks:
+                if self._cancel_requested(task_id):
+                    state = 'cancelled'
+                    break
+
+                start = counts['processed']
+                try:
+                    chunk_results = handler(chunk)
+                except Exception as e:
+                    print(f"Error in {kind} task {task_id}: {e}")
+                    chunk_results = [{'success': False, 'error': str(e)} for _ in chunk]
+
+                for offset, result in enumerate(chunk_results):
+                    if result.get('success'):
+                        counts['succeeded'] += 1
+                    else:
+                        counts['failed'] += 1
+                        if len(errors) < self.max_errors:
+                            error = {
+                                'index': start + offset,
+                                'error': result.get('error') or result.get('message') or 'Failed'
+                            }
+                            if 'row' in result:
+                                error['row'] = result['row']
+                            errors.append(error)
+                results.extend(chunk_results)
+                counts['processed'] += len(chunk)
+                self._update(task_id, errors=json.dumps(errors, default=str), **counts)
+        except Exception as e:
+            print(f"Task {task_id} failed: {e}")
+            state = 'failed'
+            errors.append({'index': None, 'error': str(e)})
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                try:
+                    close()  # Lets a file-reading generator close and remove its file
+                except Exception as e:
+                    print(f"Task {task_id} failed: {e}")
+                    state = 'failed'
+                    errors.append({'index': None, 'error': str(e)})
+            if state == 'completed':
+                counts['total'] = counts['processed']
+            self._update(task_id, state=state, finished=time.time(), errors=json.dumps(errors, default=str),
+                         results=json.dumps(results, default=str), **counts)
+            with self._lock:
+                self._cancelled.discard(task_id)
+
+    def status(self, task_id, include_results=False):
+        """Progress of a task, or None if it is unknown"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute(
+                f"""SELECT task_id, kind, state, total, processed, succeeded, failed, errors, created_at,
+                started, finished{', results' if include_results else ''} FROM tasks WHERE task_id = ?""",
+                (task_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return self._status(row, include_results)
+
+    def _status(self, row, include_results=False):
+        status = {
+            'task_id': row[0], 'kind': row[1], 'state': row[2], 'total': row[3], 'processed': row[4],
+            'succeeded': row[5], 'failed': row[6], 'errors': json.loads(row[7]), 'created_at': row[8]
+        }
+        if include_results:
+            status['results'] = json.loads(row[11])
+
+        started, finished = row[9], row[10]
+        elapsed = ((finished or time.time()) - started) if started else 0.0
+        throughput = status['processed'] / elapsed if elapsed > 0 else 0.0
+        remaining = status['total'] - status['processed']
+        status['elapsed_seconds'] = round(elapsed, 2)
+        status['throughput'] = round(throughput, 1)
+        status['eta_seconds'] = round(remaining / throughput, 1) if throughput and not finished else None
+        return status
+
+    def cancel(self, task_id):
+        """Ask a task to stop before its next chunk"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute(
+                "UPDATE tasks SET cancel_requested = 1 WHERE task_id = ? AND state IN ('queued', 'running')",
+                (task_id,)
+            )
+            cancelled = cursor.rowcount > 0
+        finally:
+            conn.close()
+        if cancelled:
+            with self._lock:
+                self._cancelled.add(task_id)
+        return cancelled
+
+    def list_tasks(self, limit=50):
+        """Status of recent tasks, newest first"""
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(
+                """SELECT task_id, kind, state, total, processed, succeeded, failed, errors, created_at,
+                started, finished FROM tasks ORDER BY created_at DESC LIMIT ?""",
+                (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._status(row) for row in rows]
+
+    def shutdown(self, wait=True):
+        """Stop the pool after the running chunks"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
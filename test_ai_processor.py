@@ -0,0 +1,108 @@
+"""
+Tests for AI Processor Tracker Updates
+"""
+from collections import Counter
+
+import pytest
+
+from ai_processor import AIProcessingError, AIProcessor
+from excel_manager import ExcelManager
+from llm_cache import LLMCache
+
+JOB = {'Job Title': 'Site Engineer', 'Project Name': 'Alpha', 'Job Location (Country)': 'UAE', 'Job Status': 'Open'}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+    manager.add_job(dict(JOB))
+    return manager
+
+
+@pytest.fixture
+def processor(tmp_path, manager):
+    return AIProcessor(excel_manager=manager, cache=LLMCache(db_path=tmp_path / 'llm_cache.db'))
+
+
+def make_email(subject='CV - Ali Hassan'):
+    return {'subject': subject, 'body': '', 'sender': 'cvs@agency.com', 'sender_name': 'Agency', 'attachments': []}
+
+
+def count_io(manager, monkeypatch):
+    """Count tracker reads and workbook writes made through the manager"""
+    calls = Counter()
+    for name in ('read_master_tracker', 'read_cv_tracker'):
+        def counted(name=name, method=getattr(manager, name)):
+            calls[name] += 1
+            return method()
+        monkeypatch.setattr(manager, name, counted)
+
+    write_temp = manager.write_temp
+
+    def counted_write(df, path, sheet_name):
+        calls[f"write {path.name}"] += 1
+        return write_temp(df, path, sheet_name)
+
+    monkeypatch.setattr(manager, 'write_temp', counted_write)
+    return calls
+
+
+def test_cv_and_interview_update_read_and_write_each_tracker_once(processor, manager, monkeypatch):
+    calls = count_io(manager, monkeypatch)
+    extracted = {'candidate_name': 'Ali Hassan', 'position': 'Site Engineer', 'interview_date': '2026-03-04',
+                 'interview_time': '10:00'}
+
+    result = processor._update_trackers(extracted, make_email())
+
+    assert calls == {'read_master_tracker': 1, 'read_cv_tracker': 1, 'write CVTracker.xlsx': 1}
+    assert 'Updated interview schedule for Ali Hassan' in result['action_taken']
+    row = manager.read_cv_tracker().iloc[0]
+    assert row['Application Status'] == 'Interview Scheduled'
+
+
+def test_failed_tracker_write_raises_and_writes_nothing(processor, manager, monkeypatch):
+    def failing_write_temp(df, path, sheet_name):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(manager, 'write_temp', failing_write_temp)
+
+    with pytest.raises(AIProcessingError, match="disk full"):
+        processor._update_trackers({'candidate_name': 'Ali Hassan', 'position': 'Site Engineer'}, make_email())
+    assert manager.read_cv_tracker().empty
+
+
+def test_batch_reports_a_failed_tracker_update_for_that_email_only(processor, manager, monkeypatch):
+    write_temp = manager.write_temp
+    writes = []
+
+    def write_once(df, path, sheet_name):
+        writes.append(path)
+        if len(writes) > 1:
+            raise OSError("disk full")
+        return write_temp(df, path, sheet_name)
+
+    monkeypatch.setattr(manager, 'write_temp', write_once)
+    emails = [
+        dict(make_email('CV - Ali Hassan'), body="Candidate Name: Ali Hassan\nPosition: Site Engineer"),
+        dict(make_email('CV - Sara Khan'), body="Candidate Name: Sara Khan\nPosition: Site Engineer"),
+    ]
+
+    results = processor.process_email_batch(emails)
+
+    assert results[0]['candidate_name'] == 'Ali Hassan'
+    assert isinstance(results[1], AIProcessingError)
+    assert manager.read_cv_tracker()['Candidate Name'].tolist() == ['Ali Hassan']
+
+
+def test_interview_goes_to_the_cv_added_by_the_same_email(processor, manager):
+    job_id = manager.read_master_tracker()['JobID'].iloc[0]
+    old_cv_id, _ = manager.add_cv({'JobID': job_id, 'Candidate Name': 'Ali Hassan', 'Application Status': 'Rejected'})
+    extracted = {'candidate_name': 'Ali Hassan', 'position': 'Site Engineer', 'interview_date': '2026-03-04'}
+
+    result = processor._update_trackers(extracted, make_email())
+
+    assert 'ambiguous_matches' not in result
+    cvs = manager.read_cv_tracker().set_index('CVID')
+    new_cv_id = next(cv_id for cv_id in cvs.index if cv_id != old_cv_id)
+    assert cvs.loc[new_cv_id, 'Application Status'] == 'Interview Scheduled'
+    assert cvs.loc[old_cv_id, 'Application Status'] == 'Rejected'
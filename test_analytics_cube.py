@@ -0,0 +1,102 @@
+"""
+Tests for the Materialised Recruitment Analytics Cube
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from analytics_cube import DIMENSION_COLUMNS, AnalyticsCube, aggregate, compute_facts
+from excel_manager import CV_SHEET, ExcelManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+    with manager.transaction() as tx:
+        alpha, _ = tx.add_job({'Job Title': 'Site Engineer', 'Project Name': 'Alpha', 'Job Location (Country)': 'UAE',
+                               'Hiring Manager': 'Omar'})
+        beta, _ = tx.add_job({'Job Title': 'Quantity Surveyor', 'Project Name': 'Beta', 'Job Location (Country)': 'KSA',
+                              'Hiring Manager': 'Layla'})
+        tx.add_cvs([
+            {'JobID': alpha, 'Candidate Name': 'Ali Hassan', 'Application Status': 'CV Shared',
+             'Date CV Shared': datetime(2026, 1, 5)},
+            {'JobID': alpha, 'Candidate Name': 'Sara Khan', 'Application Status': 'Interview Scheduled',
+             'Date CV Shared': datetime(2026, 1, 20), 'Interview Date': datetime(2026, 2, 1)},
+            {'JobID': beta, 'Candidate Name': 'José Ramírez', 'Application Status': 'Offer Extended',
+             'Date CV Shared': datetime(2026, 2, 3), 'Offer Status': 'Pending'},
+        ])
+    return manager
+
+
+@pytest.fixture
+def cube(manager, tmp_path):
+    cube = AnalyticsCube(manager, db_path=tmp_path / 'analytics.db')
+    cube.refresh()
+    return cube
+
+
+def normalised(frame):
+    return frame.sort_values(DIMENSION_COLUMNS).reset_index(drop=True)
+
+
+def full_rebuild(manager):
+    return aggregate(compute_facts(manager.read_cv_tracker(), manager.read_master_tracker()))
+
+
+def assert_matches_full_rebuild(cube, manager):
+    pd.testing.assert_frame_equal(normalised(cube.cube), normalised(full_rebuild(manager)), check_dtype=False)
+
+
+def test_incremental_refreshes_equal_a_full_rebuild(cube, manager):
+    cvs = manager.read_cv_tracker().set_index('Candidate Name')
+    job_id = manager.read_master_tracker()['JobID'].iloc[1]
+
+    manager.update_cv(cvs.loc['José Ramírez', 'CVID'], {'Application Status': 'Hired', 'Offer Status': 'Accepted',
+                                                       'Date Onboard': datetime(2026, 3, 5)})
+    assert_matches_full_rebuild(cube, manager)
+
+    manager.update_cv(cvs.loc['Ali Hassan', 'CVID'], {'Project': 'Gamma', 'Application Status': 'Rejected'})
+    assert_matches_full_rebuild(cube, manager)
+
+    manager.add_cv({'JobID': job_id, 'Candidate Name': 'Omar Farouk', 'Date CV Shared': datetime(2026, 3, 1)})
+    assert_matches_full_rebuild(cube, manager)
+
+    assert cube.stats['full_rebuilds'] == 1
+    assert cube.stats['incremental_refreshes'] == 3
+    assert cube.stats['rows_changed'] == 3
+
+
+def test_rows_removed_outside_the_app_are_retracted(cube, manager):
+    df = manager.read_cv_tracker()
+    manager.save_with_formatting(df.iloc[1:], manager.cv_path, CV_SHEET)
+
+    cube.refresh()
+
+    assert_matches_full_rebuild(cube, manager)
+    assert cube.query()['cvs'].iloc[0] == 2
+
+
+def test_funnel_and_offer_acceptance(cube, manager):
+    cv_id = manager.read_cv_tracker().set_index('Candidate Name').loc['José Ramírez', 'CVID']
+    manager.update_cv(cv_id, {'Application Status': 'Hired', 'Offer Status': 'Accepted',
+                              'Date Onboard': datetime(2026, 3, 5)})
+
+    funnel = {row['project']: row for row in cube.funnel(by=['project'])}
+    assert (funnel['Alpha']['cvs'], funnel['Alpha']['interviews'], funnel['Alpha']['hires']) == (2, 1, 0)
+    assert funnel['Beta']['overall_conversion'] == 1.0
+    assert cube.time_to_hire(filters={'project': 'Beta'}) == [{'hires_with_dates': 1, 'avg_days': 30.0}]
+    assert cube.offer_acceptance()[0]['acceptance_rate'] == 1.0
+
+
+def test_materialised_cube_is_reloaded(cube, manager, tmp_path):
+    reloaded = AnalyticsCube(manager, db_path=tmp_path / 'analytics.db')
+    reloaded.refresh()
+
+    assert reloaded.stats['full_rebuilds'] == 0
+    assert_matches_full_rebuild(reloaded, manager)
+
+
+def test_unknown_dimension_is_rejected(cube):
+    with pytest.raises(ValueError, match="Unknown dimension"):
+        cube.query(by=['candidate'])
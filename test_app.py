@@ -0,0 +1,41 @@
+"""
+Tests for Bulk Route Validation
+"""
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from task_runner import TaskRunner
+    monkeypatch.setitem(app_module.components._instances, 'task_runner', TaskRunner(db_path=tmp_path / 'tasks.db'))
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize('url', ['/api/candidates/bulk', '/api/projects', '/api/jobs', '/api/cvs'])
+def test_empty_list_is_rejected(client, url):
+    response = client.post(url, json=[])
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('body', [{'name': 'Ali Hassan'}, 'Ali Hassan', None])
+def test_candidates_bulk_needs_a_list(client, body):
+    assert client.post('/api/candidates/bulk', json=body).status_code == 400
+
+
+def test_bulk_items_must_have_the_expected_type(client):
+    assert client.post('/api/candidates/bulk', json=['Ali Hassan']).status_code == 400
+    assert client.post('/api/projects', json=[{'name': 'Alpha'}]).status_code == 400
+
+
+def test_valid_list_is_queued(client, tmp_path, monkeypatch):
+    from database import Database
+    monkeypatch.setitem(app_module.components._instances, 'db', Database(tmp_path / 'recruitment_data.db'))
+
+    response = client.post('/api/candidates/bulk', json=[{'name': 'Ali Hassan'}, {'name': 'Sara Khan'}])
+
+    assert response.status_code == 202
+    assert response.get_json()['total'] == 2
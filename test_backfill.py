@@ -0,0 +1,85 @@
+"""
+Tests for the Mailbox Backfill Runner against a Local Maildir
+"""
+import mailbox
+import subprocess
+import sys
+from email.message import EmailMessage
+from pathlib import Path
+
+import pytest
+
+from activity_log import ActivityLog
+from backfill import BackfillRunner
+from email_dedupe import EmailDeduplicator
+from email_monitor import EmailMonitor
+from mail_backend import LocalMailboxBackend
+from work_queue import WorkQueue
+
+
+def fill_maildir(path, count):
+    box = mailbox.Maildir(path, create=True)
+    for n in range(count):
+        message = EmailMessage()
+        message['Subject'] = f"CV for Site Engineer {n}"
+        message['From'] = 'Agency <cvs@agency.com>'
+        message['Date'] = f"Mon, 02 Mar 2026 10:{n % 60:02d}:00 +0000"
+        message.set_content(f"Candidate Name: Candidate {n}")
+        box.add(message)
+    box.close()
+
+
+@pytest.fixture
+def runner(tmp_path):
+    fill_maildir(tmp_path / 'inbox', 30)
+    db_path = tmp_path / 'pipeline.db'
+    monitor = EmailMonitor(
+        backend=LocalMailboxBackend(tmp_path / 'inbox'),
+        deduplicator=EmailDeduplicator(db_path=db_path),
+        work_queue=WorkQueue(db_path=db_path),
+        activity_log=ActivityLog(db_path=db_path)
+    )
+    return BackfillRunner(monitor, db_path=db_path, workers=1)
+
+
+def test_run_processes_every_message(runner):
+    run_id = runner.create_run('2026-03-01', '2026-03-08')
+
+    assert runner.resume(run_id) == (True, "Backfill resumed")
+    assert runner.wait(run_id, timeout=30)
+
+    status = runner.status(run_id)
+    assert status['state'] == 'done'
+    assert status['messages']['recruitment'] == 30
+
+
+def test_resume_and_cancel_report_unknown_and_active_runs(runner):
+    assert runner.resume('BF-missing') == (False, "Backfill run not found")
+    assert runner.cancel('BF-missing') == (False, "Backfill run not found")
+
+    run_id = runner.create_run('2026-03-01', '2026-03-08')
+    assert runner.cancel(run_id) == (False, "Backfill run is not running")
+
+
+def test_cancel_right_after_resume_is_not_lost(runner):
+    run_id = runner.create_run('2026-03-01', '2026-03-08')
+
+    runner.resume(run_id)
+    assert runner.cancel(run_id) == (True, "Backfill cancelling")
+    assert runner.wait(run_id, timeout=30)
+
+    status = runner.status(run_id)
+    assert status['state'] == 'cancelled'
+    assert status['messages']['processed'] == 0
+
+
+def test_cli_runs_against_a_local_maildir(tmp_path):
+    fill_maildir(tmp_path / 'inbox', 3)
+    completed = subprocess.run(
+        [sys.executable, str(Path(__file__).with_name('backfill.py')), '--maildir', str(tmp_path / 'inbox'),
+         '--start', '2026-03-01', '--end', '2026-03-08', '--workers', '1'],
+        cwd=tmp_path, capture_output=True, text=True, timeout=120
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert 'Backfill run BF-' in completed.stdout
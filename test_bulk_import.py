@@ -0,0 +1,122 @@
+"""
+Tests for Bulk Imports into the Trackers
+"""
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+import app as app_module
+from bulk_import import BulkImporter
+from excel_manager import ExcelManager, TrackerLock
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+
+
+@pytest.fixture
+def writes(manager, monkeypatch):
+    """Paths of every tracker workbook written"""
+    written = []
+    write_temp = manager.write_temp
+
+    def counting_write_temp(df, path, sheet_name):
+        written.append(path)
+        return write_temp(df, path, sheet_name)
+
+    monkeypatch.setattr(manager, 'write_temp', counting_write_temp)
+    return written
+
+
+def jobs_csv(count):
+    lines = ['Title,Project,Country'] + [f"Engineer {n},Alpha,UAE" for n in range(count)]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def prepare(importer, data, filename='jobs.csv', target='jobs'):
+    plan, message = importer.prepare(target, FileStorage(io.BytesIO(data), filename=filename))
+    assert plan is not None, message
+    return plan
+
+
+def test_import_writes_the_tracker_once(manager, writes):
+    importer = BulkImporter(manager, None, chunk_size=10)
+    plan = prepare(importer, jobs_csv(35))
+    handler = importer.handler(plan)
+
+    results = [result for chunk in importer.chunks(plan) for result in handler(chunk)]
+
+    assert len(results) == 35 and all(result['success'] for result in results)
+    assert writes == [manager.master_path]
+    jobs = manager.read_master_tracker()
+    assert list(jobs['Job Title']) == [f"Engineer {n}" for n in range(35)]
+    assert jobs['JobID'].is_unique
+    assert not os.path.exists(plan['path'])
+
+
+def test_cancelled_import_keeps_the_rows_already_added(manager, writes):
+    importer = BulkImporter(manager, None, chunk_size=10)
+    plan = prepare(importer, jobs_csv(35))
+    handler = importer.handler(plan)
+    chunks = importer.chunks(plan)
+
+    added = handler(next(chunks)) + handler(next(chunks))
+    chunks.close()
+
+    assert writes == [manager.master_path]
+    assert list(manager.read_master_tracker()['JobID']) == [result['id'] for result in added]
+    assert not os.path.exists(plan['path'])
+
+    # The transaction let go of the trackers
+    other = TrackerLock(manager.lock.path, timeout=0.1)
+    other.acquire()
+    other.release()
+
+
+def test_cvs_can_reference_jobs_and_are_checked_in_the_same_import(manager, writes):
+    job_id, _ = manager.add_job({'Job Title': 'Site Engineer', 'Project Name': 'Alpha',
+                                 'Job Location (Country)': 'UAE'})
+    writes.clear()
+    importer = BulkImporter(manager, None, chunk_size=1)
+    data = f"JobID,Candidate Name\n{job_id},Ali Hassan\nJOB-X,Sara Khan\n{job_id},Omar Farouk\n".encode('utf-8')
+    plan = prepare(importer, data, filename='cvs.csv', target='cvs')
+    handler = importer.handler(plan)
+
+    results = [result for chunk in importer.chunks(plan) for result in handler(chunk)]
+
+    assert [result['success'] for result in results] == [True, False, True]
+    assert results[1]['error'] == "Invalid JobID"
+    assert writes == [manager.cv_path]
+    cvs = manager.read_cv_tracker()
+    assert list(cvs['Candidate Name']) == ['Ali Hassan', 'Omar Farouk']
+    assert set(cvs['Project']) == {'Alpha'}
+
+
+def test_upload_is_removed_when_the_task_cannot_start(manager, monkeypatch):
+    class BrokenRunner:
+        def submit_chunks(self, kind, chunks, handler, total):
+            raise RuntimeError("Task database is locked")
+
+    importer = BulkImporter(manager, None)
+    plans = []
+    prepare_plan = importer.prepare
+
+    def recording_prepare(*args, **kwargs):
+        plan, message = prepare_plan(*args, **kwargs)
+        plans.append(plan)
+        return plan, message
+
+    monkeypatch.setattr(importer, 'prepare', recording_prepare)
+    monkeypatch.setitem(app_module.components._instances, 'bulk_importer', importer)
+    monkeypatch.setitem(app_module.components._instances, 'task_runner', BrokenRunner())
+
+    response = app_module.app.test_client().post(
+        '/api/import/jobs', data={'file': (io.BytesIO(jobs_csv(3)), 'jobs.csv')},
+        content_type='multipart/form-data')
+
+    assert response.status_code == 500
+    assert "Task database is locked" in response.get_json()['error']
+    assert not os.path.exists(plans[0]['path'])
@@ -0,0 +1,43 @@
+"""
+Tests for Conversation Batching
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+from conversation_batcher import ConversationBatcher
+
+
+def make_email(subject, received_time, conversation_id='thread-1'):
+    return {'subject': subject, 'body': '', 'conversation_id': conversation_id, 'received_time': received_time}
+
+
+def test_thread_is_released_after_its_quiet_window():
+    batcher = ConversationBatcher(window_seconds=60)
+    batcher.add(make_email('CV', '2026-03-02 10:00:00'), now=0)
+    batcher.add(make_email('Re: CV', '2026-03-02 10:05:00'), now=30)
+
+    assert batcher.pop_due(now=80) == []
+    assert len(batcher.pop_due(now=90)[0]) == 2
+    assert batcher.pending_count() == 0
+
+
+def test_messages_sort_by_time_across_offsets_after_json_round_trip():
+    gulf = timezone(timedelta(hours=4))
+    # 09:30 +04:00 is 05:30 UTC, before 06:00 UTC, although it sorts after it as text
+    first = make_email('CV', datetime(2026, 3, 2, 9, 30, tzinfo=gulf))
+    second = make_email('Re: CV', datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc))
+
+    batcher = ConversationBatcher()
+    for email_data in (second, first):
+        batcher.add(json.loads(json.dumps(email_data, default=str)), now=0)
+
+    assert [e['subject'] for e in batcher.pop_all()[0]] == ['CV', 'Re: CV']
+
+
+def test_mixed_formats_and_missing_times_sort_without_errors():
+    batcher = ConversationBatcher()
+    batcher.add(make_email('Third', 'Mon, 02 Mar 2026 12:00:00 +0000'), now=0)
+    batcher.add(make_email('Second', '2026-03-02T11:00:00+00:00'), now=0)
+    batcher.add(make_email('First', None), now=0)
+
+    assert [e['subject'] for e in batcher.pop_all()[0]] == ['First', 'Second', 'Third']
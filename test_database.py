@@ -0,0 +1,106 @@
+"""
+Tests for Bulk Inserts and ID Allocation in the Recruitment Database
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / 'recruitment_data.db'
+
+
+def run_together(workers):
+    """Start the workers at the same moment and wait for all of them"""
+    barrier = threading.Barrier(len(workers))
+    errors = []
+
+    def run(worker):
+        barrier.wait()
+        try:
+            worker()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_concurrent_bulk_imports_never_share_an_id(db_path):
+    databases = [Database(db_path) for _ in range(4)]
+    results = [[] for _ in databases]
+
+    def importer(index):
+        def work():
+            for batch in range(5):
+                candidates = [{'name': f"Candidate {index}-{batch}-{n}", 'current_location': f"City {index}"}
+                              for n in range(10)]
+                results[index].extend(databases[index].add_candidates_bulk(candidates))
+        return work
+
+    run_together([importer(index) for index in range(len(databases))])
+
+    ids = [candidate_id for result in results for candidate_id, error in result]
+    assert None not in ids
+    assert len(set(ids)) == len(ids) == 200
+    assert len(databases[0].get_candidates()) == 200
+
+
+def test_concurrent_project_imports_number_every_project(db_path):
+    databases = [Database(db_path) for _ in range(4)]
+    results = [None] * len(databases)
+
+    def importer(index):
+        def work():
+            results[index] = databases[index].add_projects_bulk([f"Project {index}-{n}" for n in range(25)])
+        return work
+
+    run_together([importer(index) for index in range(len(databases))])
+
+    ids = [project_id for result in results for project_id in result]
+    assert None not in ids
+    assert len(set(ids)) == 100
+    assert sorted(int(project_id.rsplit('-', 1)[1]) for project_id in ids) == list(range(1, 101))
+
+
+def test_duplicate_project_is_reported_without_using_a_number(db_path):
+    db = Database(db_path)
+
+    first, duplicate, second = db.add_projects_bulk(['Alpha', 'Alpha', 'Beta'])
+
+    assert duplicate is None
+    assert int(second.rsplit('-', 1)[1]) == int(first.rsplit('-', 1)[1]) + 1
+
+
+def test_lock_timeout_closes_the_connection(db_path, monkeypatch):
+    db = Database(db_path)
+    opened = []
+
+    def get_connection():
+        conn = sqlite3.connect(db_path, timeout=0.1)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(db, 'get_connection', get_connection)
+    writer = sqlite3.connect(db_path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            db.add_projects_bulk(['Alpha'])
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            db.add_candidates_bulk([{'name': 'Ali Hassan'}])
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
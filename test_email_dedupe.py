@@ -0,0 +1,55 @@
+"""
+Tests for Email Content Deduplication
+"""
+import pytest
+
+from email_dedupe import EmailDeduplicator
+
+FORWARD = """FYI
+
+---------- Forwarded message ---------
+From: Agency <cvs@agency.com>
+Subject: CV
+
+Candidate Name: {name}
+"""
+
+
+@pytest.fixture
+def deduplicator(tmp_path):
+    return EmailDeduplicator(db_path=tmp_path / 'pipeline.db')
+
+
+def make_email(body='Candidate Name: Ali Hassan', subject='CV - Ali Hassan', folder='Inbox'):
+    return {'subject': subject, 'body': body, 'attachments': [], 'folder': folder}
+
+
+def test_forwards_with_the_same_note_are_not_duplicates(deduplicator):
+    assert deduplicator.check(make_email(FORWARD.format(name='Ali Hassan'), 'FW: FYI')) == (False, 1)
+    assert deduplicator.check(make_email(FORWARD.format(name='Sara Khan'), 'FW: FYI')) == (False, 1)
+
+
+def test_same_body_with_another_subject_is_not_a_duplicate(deduplicator):
+    assert deduplicator.check(make_email(subject='CV - Ali Hassan')) == (False, 1)
+    assert deduplicator.check(make_email(subject='Interview - Ali Hassan')) == (False, 1)
+
+
+def test_pending_copies_count_real_hits_and_are_stored_on_record(deduplicator):
+    email_data = make_email()
+    assert deduplicator.check(email_data, record=False) == (False, 1)
+    assert deduplicator.check(make_email(folder='Sent'), record=False) == (True, 2)
+    assert deduplicator.check(make_email(), record=False) == (True, 3)
+
+    deduplicator.record(email_data)
+
+    assert deduplicator.count() == 1
+    assert deduplicator.check(make_email(), record=False) == (True, 4)
+
+
+def test_released_email_is_seen_again(deduplicator):
+    email_data = make_email()
+    deduplicator.check(email_data, record=False)
+    deduplicator.release(email_data)
+
+    assert deduplicator.check(make_email(), record=False) == (False, 1)
+    assert deduplicator.count() == 0
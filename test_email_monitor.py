@@ -0,0 +1,104 @@
+"""
+Tests for the Email Monitor's Header Prefilter against a Local Maildir
+"""
+import mailbox
+from email.message import EmailMessage
+
+import pytest
+
+from activity_log import ActivityLog
+from email_dedupe import EmailDeduplicator
+from email_monitor import EmailMonitor
+from mail_backend import LocalMailboxBackend, StagedMessage
+from work_queue import WorkQueue
+
+LAZY_FETCHES = ('to', 'body', 'recipients', 'attachments')
+
+
+def add_message(path, subject, body, sender='Agency <cvs@agency.com>', to='Omar <omar@example.com>'):
+    message = EmailMessage()
+    message['Subject'] = subject
+    message['From'] = sender
+    message['To'] = to
+    message['Date'] = 'Mon, 02 Mar 2026 10:00:00 +0000'
+    message.set_content(body)
+    box = mailbox.Maildir(path, create=True)
+    box.add(message)
+    box.close()
+
+
+@pytest.fixture
+def mail_dir(tmp_path):
+    return tmp_path / 'inbox', tmp_path / 'sent'
+
+
+def make_monitor(tmp_path, backend, **options):
+    db_path = tmp_path / 'pipeline.db'
+    return EmailMonitor(
+        backend=backend,
+        deduplicator=EmailDeduplicator(db_path=db_path),
+        work_queue=WorkQueue(db_path=db_path),
+        activity_log=ActivityLog(db_path=db_path),
+        **options
+    )
+
+
+def process_all(monitor, backend, folder):
+    for index in range(1, backend.count(folder) + 1):
+        monitor._process_email(StagedMessage(backend, backend.get_message(folder, index), folder), folder)
+
+
+def lazy_fetches(backend):
+    return {field: backend.fetch_counts[field] for field in LAZY_FETCHES}
+
+
+def test_ignored_sender_is_rejected_without_lazy_fetches(tmp_path, mail_dir):
+    inbox, sent = mail_dir
+    add_message(inbox, 'Daily digest', 'Nothing here', sender='Mailer <mailer-daemon@example.com>')
+    backend = LocalMailboxBackend(inbox, sent)
+    monitor = make_monitor(tmp_path, backend, ignored_senders=['mailer-daemon'])
+    backend.open()
+
+    process_all(monitor, backend, 'Inbox')
+
+    assert lazy_fetches(backend) == {field: 0 for field in LAZY_FETCHES}
+    assert monitor.work_queue.pending_count() == 0
+
+
+def test_subject_rejection_without_body_scan_fetches_nothing_else(tmp_path, mail_dir):
+    inbox, sent = mail_dir
+    add_message(inbox, 'Lunch on Friday?', 'Shall we try the new place?')
+    add_message(sent, 'Re: Lunch on Friday?', 'Sounds good')
+    backend = LocalMailboxBackend(inbox, sent)
+    monitor = make_monitor(tmp_path, backend, scan_body=False)
+    backend.open()
+
+    process_all(monitor, backend, 'Inbox')
+    process_all(monitor, backend, 'Sent')
+
+    assert lazy_fetches(backend) == {field: 0 for field in LAZY_FETCHES}
+
+
+def test_body_scan_rejection_fetches_only_the_body(tmp_path, mail_dir):
+    inbox, sent = mail_dir
+    add_message(inbox, 'Lunch on Friday?', 'Shall we try the new place?')
+    backend = LocalMailboxBackend(inbox, sent)
+    monitor = make_monitor(tmp_path, backend)
+    backend.open()
+
+    process_all(monitor, backend, 'Inbox')
+
+    assert lazy_fetches(backend) == {'to': 0, 'body': 1, 'recipients': 0, 'attachments': 0}
+
+
+def test_no_reply_senders_are_kept_by_default(tmp_path, mail_dir):
+    inbox, sent = mail_dir
+    add_message(inbox, 'New application: Site Engineer', 'Ali Hassan applied', sender='Jobs <no-reply@board.com>')
+    backend = LocalMailboxBackend(inbox, sent)
+    monitor = make_monitor(tmp_path, backend)
+    backend.open()
+
+    process_all(monitor, backend, 'Inbox')
+
+    assert monitor.work_queue.pending_count() == 1
+    assert backend.fetch_counts['recipients'] == 1
@@ -0,0 +1,65 @@
+"""
+Tests for the Email Body Text Helpers
+"""
+from email_text import clean_body
+
+GMAIL_FORWARD = """Please see below, shortlisted for the site role.
+
+Thanks
+Omar
+
+---------- Forwarded message ---------
+From: Agency <cvs@agency.com>
+Date: Mon, 2 Mar 2026 at 10:00
+Subject: CV - Ali Hassan
+To: <omar@example.com>
+
+Candidate Name: Ali Hassan
+Position: Site Engineer
+
+Best regards
+Agency Team
+"""
+
+OUTLOOK_FORWARD = """FYI
+
+________________________________
+From: Agency <cvs@agency.com>
+Sent: Monday, March 2, 2026 10:00 AM
+To: Omar
+Subject: CV - Ali Hassan
+
+Candidate Name: Ali Hassan
+"""
+
+
+def test_forwarded_body_is_kept_without_its_headers():
+    assert clean_body(GMAIL_FORWARD) == [
+        'Please see below, shortlisted for the site role.',
+        'Candidate Name: Ali Hassan\nPosition: Site Engineer'
+    ]
+
+
+def test_outlook_forward_needs_the_forward_subject():
+    assert clean_body(OUTLOOK_FORWARD, forwarded=True) == ['FYI', 'Candidate Name: Ali Hassan']
+    assert clean_body(OUTLOOK_FORWARD) == ['FYI']
+
+
+def test_reply_history_is_dropped():
+    assert clean_body("Confirmed for Tuesday.\n\nOn Mon, 2 Mar 2026, Sara wrote:\n> Can you do Tuesday?") == [
+        'Confirmed for Tuesday.'
+    ]
+
+
+def test_only_real_disclaimers_are_dropped():
+    body = (
+        "Our disclaimer on salaries: figures are indicative.\n\n"
+        "This email contains confidential salary details.\n\n"
+        "DISCLAIMER: This e-mail is confidential and intended solely for the addressee.\n\n"
+        "If you have received this email in error, please delete it."
+    )
+
+    assert clean_body(body) == [
+        'Our disclaimer on salaries: figures are indicative.',
+        'This email contains confidential salary details.'
+    ]
@@ -0,0 +1,106 @@
+"""
+Tests for Entity Resolution against the Trackers
+"""
+from collections import Counter
+
+import pytest
+
+from entity_resolver import EntityResolver
+from excel_manager import ExcelManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+    with manager.transaction() as tx:
+        engineer, _ = tx.add_job({'Job Title': 'Site Engineer', 'Project Name': 'Alpha',
+                                  'Job Location (Country)': 'UAE'})
+        surveyor, _ = tx.add_job({'Job Title': 'Quantity Surveyor', 'Project Name': 'Beta',
+                                  'Job Location (Country)': 'UAE'})
+        tx.add_cvs([
+            {'JobID': engineer, 'Candidate Name': 'Ali Hassan', 'Email': 'ali.hassan@mail.com',
+             'Mobile': '+971 50 123 4567'},
+            {'JobID': engineer, 'Candidate Name': 'José Ramírez', 'Email': 'jose@mail.com'},
+            {'JobID': surveyor, 'Candidate Name': 'Sara Khan'},
+            {'JobID': engineer, 'Candidate Name': 'Sara Khan'},
+        ])
+    return manager
+
+
+@pytest.fixture
+def resolver(manager):
+    return EntityResolver(manager)
+
+
+def test_exact_email_match_beats_a_different_name(resolver):
+    match = resolver.resolve_cv(name='A. Hassan', email='ALI.HASSAN@mail.com')
+
+    assert match['id'].startswith('CV-')
+    assert match['confidence'] == 1.0
+    assert match['candidates'][0]['name'] == 'Ali Hassan'
+
+
+def test_phone_matches_without_country_code(resolver):
+    match = resolver.resolve_cv(phone='050-123-4567')
+
+    assert match['candidates'][0]['name'] == 'Ali Hassan'
+    assert match['id'] is not None
+
+
+def test_fuzzy_name_match_ignores_order_accents_and_titles(resolver):
+    match = resolver.resolve_cv(name='Mr Ramirez Jose')
+
+    assert match['candidates'][0]['name'] == 'José Ramírez'
+    assert match['id'] is not None
+    assert not match['ambiguous']
+
+
+def test_same_name_twice_is_ambiguous(resolver):
+    match = resolver.resolve_cv(name='Sara Khan')
+
+    assert match['id'] is None
+    assert match['ambiguous']
+    assert len(match['candidates']) == 2
+
+
+def test_position_breaks_a_name_tie(resolver):
+    match = resolver.resolve_cv(name='Sara Khan', position='Quantity Surveyor')
+
+    assert match['id'] is not None
+    assert not match['ambiguous']
+
+
+def test_unknown_name_has_no_match(resolver):
+    assert resolver.resolve_cv(name='Omar Farouk')['id'] is None
+
+
+def test_job_title_resolves_with_project_context(resolver):
+    match = resolver.resolve_job('site engineer', project='Alpha')
+
+    assert match['candidates'][0]['name'] == 'Site Engineer'
+    assert match['id'] is not None
+
+
+def test_each_lookup_reads_only_its_tracker(resolver, manager, monkeypatch):
+    reads = Counter()
+    for name in ('read_master_tracker', 'read_cv_tracker'):
+        def counted(name=name, method=getattr(manager, name)):
+            reads[name] += 1
+            return method()
+        monkeypatch.setattr(manager, name, counted)
+
+    resolver.resolve_cv(name='Ali Hassan')
+    resolver.resolve_cv(name='Sara Khan')
+    assert reads == {'read_cv_tracker': 1}
+
+    resolver.resolve_job('Site Engineer')
+    assert reads == {'read_cv_tracker': 1, 'read_master_tracker': 1}
+
+
+def test_index_is_rebuilt_after_the_tracker_changes(resolver, manager):
+    assert resolver.resolve_cv(name='Omar Farouk')['id'] is None
+
+    job_id = manager.read_master_tracker()['JobID'].iloc[0]
+    cv_id, _ = manager.add_cv({'JobID': job_id, 'Candidate Name': 'Omar Farouk'})
+
+    assert resolver.resolve_cv(name='Omar Farouk')['id'] == cv_id
@@ -0,0 +1,62 @@
+"""
+Tests for Tracker Transactions
+"""
+import pytest
+
+from excel_manager import ExcelManager
+
+JOB = {'Job Title': 'Site Engineer', 'Project Name': 'Alpha', 'Job Location (Country)': 'UAE', 'Job Status': 'Open'}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+
+
+def test_commit_writes_both_trackers(manager):
+    with manager.transaction() as tx:
+        job_id, _ = tx.add_job(dict(JOB))
+        cv_id, _ = tx.add_cv({'JobID': job_id, 'Candidate Name': 'Ali Hassan', 'Application Status': 'CV Shared'})
+
+    assert manager.read_master_tracker()['JobID'].tolist() == [job_id]
+    assert manager.read_cv_tracker()['CVID'].tolist() == [cv_id]
+    assert {change['id'] for change in tx.changes} == {job_id, cv_id}
+
+
+def test_failed_block_writes_nothing(manager):
+    version = manager.tracker_version()
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction() as tx:
+            job_id, _ = tx.add_job(dict(JOB))
+            tx.add_cv({'JobID': job_id, 'Candidate Name': 'Ali Hassan'})
+            raise RuntimeError("extraction failed")
+
+    assert manager.tracker_version() == version
+    assert manager.read_master_tracker().empty
+    assert manager.read_cv_tracker().empty
+
+
+def test_failed_write_replaces_neither_tracker(manager, monkeypatch):
+    version = manager.tracker_version()
+    write_temp = manager.write_temp
+
+    def failing_write_temp(df, path, sheet_name):
+        if path == manager.cv_path:
+            raise OSError("disk full")
+        return write_temp(df, path, sheet_name)
+
+    monkeypatch.setattr(manager, 'write_temp', failing_write_temp)
+
+    with pytest.raises(OSError):
+        with manager.transaction() as tx:
+            job_id, _ = tx.add_job(dict(JOB))
+            tx.add_cv({'JobID': job_id, 'Candidate Name': 'Ali Hassan'})
+
+    assert manager.tracker_version() == version
+    assert sorted(p.name for p in manager.master_path.parent.glob('*.xlsx')) == ['CVTracker.xlsx', 'MasterTracker.xlsx']
+
+
+def test_cv_for_unknown_job_is_rejected(manager):
+    assert manager.add_cv({'JobID': 'JOB-260301-001', 'Candidate Name': 'Ali Hassan'}) == (None, "Invalid JobID")
+    assert manager.read_cv_tracker().empty
@@ -0,0 +1,75 @@
+"""
+Tests for the Local Intent Parser
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from intent_parser import IntentParser
+
+
+@pytest.fixture
+def intent_parser():
+    return IntentParser()
+
+
+def test_schedule_with_iso_date_keeps_month_and_day(intent_parser):
+    parsed = intent_parser.parse("schedule interview for Ali Hassan on 2026-03-04 at 3pm")
+
+    assert parsed == {
+        'action': 'schedule interview',
+        'parameters': {'date': '2026-03-04', 'candidate': 'Ali Hassan', 'time': '15:00'}
+    }
+
+
+def test_schedule_with_day_first_date(intent_parser):
+    parsed = intent_parser.parse("schedule an interview for CV-260301-001 on 04/03/2026 at 10:00 with Sara")
+
+    assert parsed['parameters'] == {'date': '2026-03-04', 'cv_id': 'CV-260301-001', 'time': '10:00',
+                                    'interviewer': 'Sara'}
+
+
+def test_schedule_tomorrow(intent_parser):
+    parsed = intent_parser.parse("schedule interview for Ali Hassan on tomorrow at 2pm")
+
+    assert parsed['parameters']['date'] == (date.today() + timedelta(days=1)).isoformat()
+    assert parsed['parameters']['time'] == '14:00'
+
+
+def test_update_status(intent_parser):
+    assert intent_parser.parse("update CV-260301-001 to rejected") == {
+        'action': 'update', 'parameters': {'cv_id': 'CV-260301-001', 'status': 'Rejected'}
+    }
+
+
+def test_search_by_project_and_status(intent_parser):
+    parsed = intent_parser.parse("show cvs for project Alpha with status cv shared")
+
+    assert parsed == {'action': 'search', 'parameters': {'type': 'cv', 'project': 'Alpha', 'status': 'CV Shared'}}
+
+
+@pytest.mark.parametrize('command', [
+    "update CV-260301-004 to hired and notify him",
+    "update CV-260301-004 to hired by Friday",
+    "set CV-260301-004 as maybe",
+])
+def test_update_with_unknown_status_goes_to_llm(intent_parser, command):
+    assert intent_parser.parse(command) is None
+
+
+@pytest.mark.parametrize('command', [
+    "show cvs for project Alpha and Beta",
+    "show cvs for project Alpha, Beta",
+    "show cvs with status hired or rejected",
+    "show cvs named Ali Hassan and Sara Khan",
+])
+def test_search_with_several_values_goes_to_llm(intent_parser, command):
+    assert intent_parser.parse(command) is None
+
+
+def test_schedule_for_two_candidates_goes_to_llm(intent_parser):
+    assert intent_parser.parse("schedule interview for Ali and Sara on 2026-03-04 at 3pm") is None
+
+
+def test_unrecognised_command(intent_parser):
+    assert intent_parser.parse("what is the weather like") is None
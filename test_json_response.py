@@ -0,0 +1,110 @@
+"""
+Tests for Fast JSON Encoding and Response Compression
+"""
+import gzip
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask, jsonify
+
+import json_response
+from json_response import FastJSONProvider, compress_response, dumps, json_frame, loads
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def encoder(request, monkeypatch):
+    """Run a test with orjson (when installed) and with the standard library fallback"""
+    if request.param == 'json':
+        monkeypatch.setattr(json_response, 'orjson', None)
+    elif json_response.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'CVID': ['CV-260301-001', 'CV-260301-002'],
+        'Interview Date': [pd.Timestamp('2026-03-04 10:30'), pd.NaT],
+        'Package': [12000.0, np.nan],
+        'Remarks': [datetime(2026, 3, 5, 9, 0), 'Call back'],
+    })
+
+
+def test_frame_dates_and_blanks_are_json_safe(encoder, frame):
+    assert loads(dumps(frame)) == [
+        {'CVID': 'CV-260301-001', 'Interview Date': '2026-03-04 10:30:00', 'Package': 12000.0,
+         'Remarks': '2026-03-05 09:00:00'},
+        {'CVID': 'CV-260301-002', 'Interview Date': None, 'Package': None, 'Remarks': 'Call back'},
+    ]
+
+
+def test_missing_values_can_be_blank_strings(frame):
+    display = json_frame(frame, missing='')
+
+    assert display['Interview Date'].tolist() == ['2026-03-04 10:30:00', '']
+    assert display['Package'].tolist() == [12000.0, '']
+
+
+def test_scalars_the_encoders_do_not_know(encoder):
+    value = {
+        'timestamp': pd.Timestamp('2026-03-04 10:30'),
+        'nat': pd.NaT,
+        'day': date(2026, 3, 4),
+        'count': np.int64(3),
+        'share': np.float32(0.5),
+        'flag': np.bool_(True),
+        'salary': Decimal('12000.50'),
+        'tags': {'urgent'},
+        'series': pd.Series([pd.Timestamp('2026-03-04'), pd.NaT]),
+    }
+
+    assert loads(dumps(value)) == {
+        'timestamp': '2026-03-04T10:30:00', 'nat': None, 'day': '2026-03-04', 'count': 3, 'share': 0.5,
+        'flag': True, 'salary': 12000.5, 'tags': ['urgent'], 'series': ['2026-03-04 00:00:00', None],
+    }
+
+
+def test_unknown_types_still_fail(encoder):
+    with pytest.raises(TypeError):
+        dumps({'value': object()})
+
+
+def test_jsonify_uses_the_fast_provider(frame):
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    with app.app_context():
+        response = jsonify({'rows': frame})
+
+    assert response.mimetype == 'application/json'
+    assert loads(response.get_data())['rows'][1]['Interview Date'] is None
+
+
+def test_large_json_is_gzipped_with_a_derived_etag():
+    app = Flask(__name__)
+    body = dumps([{'CVID': f"CV-260301-{n:03d}"} for n in range(200)])
+
+    with app.app_context():
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag('abc')
+        compress_response(response, 'gzip, deflate', min_size=1024)
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.get_etag() == ('abc-gzip', False)
+    assert gzip.decompress(response.get_data()) == body
+    assert 'Accept-Encoding' in response.vary
+
+
+def test_small_or_unaccepted_responses_are_not_compressed():
+    app = Flask(__name__)
+
+    with app.app_context():
+        small = compress_response(app.response_class(b'{}', mimetype='application/json'), 'gzip')
+        plain = compress_response(app.response_class(b'x' * 4096, mimetype='application/json'), 'identity')
+
+    assert 'Content-Encoding' not in small.headers
+    assert 'Content-Encoding' not in plain.headers
@@ -0,0 +1,128 @@
+"""
+Tests for the Leader Lease and the Email Monitor Supervisor
+"""
+import pytest
+
+import leader_lease
+from leader_lease import LeaderLease, MonitorSupervisor
+
+
+class Clock:
+    def __init__(self, now=1000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class StubMonitor:
+    """The parts of EmailMonitor the supervisor drives"""
+
+    def __init__(self):
+        self.monitoring = False
+        self.monitor_thread = None
+
+    def start_monitoring(self):
+        self.monitoring = True
+
+    def stop_monitoring(self):
+        self.monitoring = False
+
+    def is_running(self):
+        return self.monitoring
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(leader_lease.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def leases(tmp_path, clock):
+    return [LeaderLease('email_monitor', db_path=tmp_path / 'pipeline.db', ttl=30) for _ in range(2)]
+
+
+def test_only_one_holder_at_a_time(leases):
+    first, second = leases
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.acquire()  # Renewal
+    assert second.current()['holder'] == first.holder
+
+
+def test_expired_lease_is_taken_over(leases, clock):
+    first, second = leases
+    first.acquire()
+
+    clock.now += 29
+    assert not second.acquire()
+
+    clock.now += 2
+    assert first.current() is None
+    assert second.acquire()
+    assert not first.acquire()
+    assert first.current()['holder'] == second.holder
+
+
+def test_renewal_keeps_the_lease_and_its_start(leases, clock):
+    first, second = leases
+    first.acquire()
+    acquired_at = first.current()['acquired_at']
+
+    for _ in range(5):
+        clock.now += 20
+        assert first.acquire()
+
+    assert not second.acquire()
+    assert first.current()['acquired_at'] == acquired_at
+
+
+def test_release_hands_over_at_once(leases):
+    first, second = leases
+    first.acquire()
+
+    second.release()  # Not the holder: no effect
+    assert not second.acquire()
+
+    first.release()
+    assert second.acquire()
+
+
+def test_standby_supervisor_takes_over_the_monitor(leases, clock):
+    supervisors = [MonitorSupervisor(StubMonitor(), lease=lease) for lease in leases]
+    leader, standby = supervisors
+
+    assert leader.tick() is False  # Monitoring not switched on yet
+    leader.lease.set_state('email_monitor.enabled', '1')
+    assert leader.tick()
+    assert not standby.tick()
+    assert leader.email_monitor.monitoring and not standby.email_monitor.monitoring
+    assert standby.status() == {'enabled': True, 'monitoring': True, 'leader': leader.lease.holder,
+                                'is_leader': False}
+
+    # The leader's process stops renewing
+    clock.now += 31
+    assert standby.status()['monitoring'] is False
+    assert standby.tick()
+    assert standby.status()['leader'] == standby.lease.holder
+    assert standby.status()['monitoring'] is True
+
+    # The old leader comes back and stands down
+    assert not leader.tick()
+    assert not leader.email_monitor.monitoring
+
+
+def test_switching_off_stops_the_monitor_and_frees_the_lease(leases):
+    leader, standby = [MonitorSupervisor(StubMonitor(), lease=lease) for lease in leases]
+    leader.lease.set_state('email_monitor.enabled', '1')
+    leader.tick()
+
+    leader.lease.set_state('email_monitor.enabled', '0')
+    assert not leader.tick()
+
+    assert not leader.email_monitor.monitoring
+    assert leader.lease.current() is None
+    assert standby.status() == {'enabled': False, 'monitoring': False, 'leader': None, 'is_leader': False}
@@ -0,0 +1,85 @@
+"""
+Tests for the Persistent LLM Response Cache
+"""
+from datetime import date
+
+import pytest
+
+import llm_cache
+from ai_processor import AIProcessor
+from llm_cache import LLMCache
+from llm_providers import LocalProvider
+
+
+class Clock:
+    def __init__(self, now=1000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return LLMCache(db_path=tmp_path / 'llm_cache.db', ttl_seconds=60, max_entries=2)
+
+
+def test_hit_returns_the_stored_response(cache):
+    key = cache.make_key('model', 'Extract   this\n email')
+
+    assert cache.get(key) is None
+    cache.put(key, 'model', '{"candidate_name": "Ali"}')
+
+    assert cache.get(cache.make_key('model', 'Extract this email')) == '{"candidate_name": "Ali"}'
+    assert cache.get(cache.make_key('other-model', 'Extract this email')) is None
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 1)
+
+
+def test_entries_expire_after_the_ttl(cache, clock):
+    key = cache.make_key('model', 'prompt')
+    cache.put(key, 'model', 'response')
+
+    clock.now += 60
+    assert cache.get(key) == 'response'
+
+    clock.now += 1
+    assert cache.get(key) is None
+    assert cache.get_stats()['expired'] == 1
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    keys = [cache.make_key('model', f"prompt {n}") for n in range(3)]
+    cache.put(keys[0], 'model', 'first')
+    clock.now += 1
+    cache.put(keys[1], 'model', 'second')
+    clock.now += 1
+    cache.get(keys[0])  # Now more recent than the second entry
+    clock.now += 1
+    cache.put(keys[2], 'model', 'third')
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == 'first'
+    assert cache.get(keys[2]) == 'third'
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_command_parses_are_only_replayed_on_the_same_day(tmp_path):
+    provider = LocalProvider()
+    processor = AIProcessor(provider=provider, cache=LLMCache(db_path=tmp_path / 'llm_cache.db'))
+    command = "schedule an interview with Ali Hassan tomorrow at 10am"
+
+    processor._parse_command_with_ai(command, today=date(2026, 3, 2))
+    processor._parse_command_with_ai(command, today=date(2026, 3, 2))
+    assert provider.calls == 1
+
+    processor._parse_command_with_ai(command, today=date(2026, 3, 3))
+    assert provider.calls == 2
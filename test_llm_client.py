@@ -0,0 +1,117 @@
+"""
+Tests for the Rate-Limited, Retrying LLM Client
+"""
+import re
+import threading
+import time
+
+import pytest
+
+from llm_client import FakeResponse, LLMClient, LLMTimeoutError, RetryableLLMError
+
+
+class FakeModel:
+    """Local stand-in for a generative model with injectable latency and faults"""
+
+    def __init__(self, response_text='{}', latency=0.0, faults=()):
+        self.response_text = response_text
+        self.latency = latency
+        self.faults = list(faults)  # Raised, in order, by the first calls
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        """Sleep for the configured latency, then fail or respond"""
+        with self._lock:
+            self.calls += 1
+            fault = self.faults.pop(0) if self.faults else None
+
+        if self.latency:
+            time.sleep(self.latency)
+        if fault:
+            raise fault
+
+        return FakeResponse(self.response_text)
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def make(model, **options):
+        options.setdefault('requests_per_minute', 60000)
+        options.setdefault('backoff_base', 0.001)
+        client = LLMClient(model, **options)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.shutdown()
+
+
+def test_transient_errors_are_retried(make_client):
+    model = FakeModel('{"ok": true}', faults=[RetryableLLMError("503 Service Unavailable")] * 2)
+    client = make_client(model)
+
+    assert client.generate('prompt') == '{"ok": true}'
+    assert model.calls == 3
+    assert client.get_stats()['retries'] == 2
+
+
+def test_permanent_errors_are_not_retried(make_client):
+    model = FakeModel(faults=[ValueError("400 invalid argument")])
+    client = make_client(model)
+
+    with pytest.raises(ValueError):
+        client.generate('prompt')
+    assert model.calls == 1
+
+
+def test_retries_stop_at_the_limit(make_client):
+    model = FakeModel(faults=[RetryableLLMError("503 Service Unavailable")] * 3)
+    client = make_client(model, max_retries=1)
+
+    with pytest.raises(RetryableLLMError):
+        client.generate('prompt')
+    assert model.calls == 2
+    assert client.get_stats()['failed'] == 1
+
+
+def test_slow_call_times_out(make_client):
+    client = make_client(FakeModel(latency=0.5), timeout=0.05, max_retries=0)
+
+    with pytest.raises(LLMTimeoutError, match=r"timed out after 0\.05s"):
+        client.generate('prompt')
+    assert client.get_stats()['timeouts'] == 1
+
+
+def test_timeout_message_reports_the_deadline_applied(make_client):
+    client = make_client(FakeModel(latency=0.5), timeout=30, max_retries=0)
+
+    with pytest.raises(LLMTimeoutError) as error:
+        client.generate('prompt', deadline=0.05)
+
+    applied = float(re.search(r"after ([\d.e-]+)s", str(error.value)).group(1))
+    assert applied <= 0.05
+
+
+def test_request_rate_is_throttled(make_client):
+    # 10 requests a second with a burst of one
+    client = make_client(FakeModel(), requests_per_minute=600, max_concurrency=1)
+
+    started = time.monotonic()
+    for _ in range(4):
+        client.generate('prompt')
+
+    assert time.monotonic() - started >= 0.25
+
+
+def test_rate_limit_wait_respects_the_deadline(make_client):
+    model = FakeModel()
+    client = make_client(model, requests_per_minute=6, max_concurrency=1)
+    client.generate('prompt')
+
+    with pytest.raises(LLMTimeoutError):
+        client.generate('prompt', deadline=0.05)
+    assert model.calls == 1
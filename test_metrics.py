@@ -0,0 +1,162 @@
+"""
+Tests for the Prometheus Text Format of the Metrics
+"""
+import re
+import sqlite3
+
+import pytest
+
+import app as app_module
+import metrics
+from metrics import MetricsRegistry, TimedConnection
+
+# name{labels} value, as Prometheus parses a sample line
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*"'
+                         r'(,[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*")*\})? (-?[0-9.e+-]+|\+Inf)$')
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture(autouse=True)
+def metrics_enabled():
+    enabled = metrics.enabled()
+    metrics.set_enabled(True)
+    yield
+    metrics.set_enabled(enabled)
+
+
+def stage_samples(component, stage):
+    """Count and error count of a stage so far"""
+    count = metrics.STAGE_SECONDS.series.get((component, stage), [[0], 0.0])[0]
+    return sum(count), metrics.STAGE_ERRORS.values.get((component, stage), 0)
+
+
+def test_counter_and_gauge_render_help_type_and_labelled_samples(registry):
+    requests = registry.counter('app_requests_total', 'Requests by route', ('method', 'route'))
+    in_flight = registry.gauge('app_in_flight', 'Requests being handled')
+    requests.inc(('GET', '/api/jobs'))
+    requests.inc(('GET', '/api/jobs'), 2)
+    requests.inc(('POST', '/api/cvs'))
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    assert registry.render() == (
+        '# HELP app_requests_total Requests by route\n'
+        '# TYPE app_requests_total counter\n'
+        'app_requests_total{method="GET",route="/api/jobs"} 3\n'
+        'app_requests_total{method="POST",route="/api/cvs"} 1\n'
+        '# HELP app_in_flight Requests being handled\n'
+        '# TYPE app_in_flight gauge\n'
+        'app_in_flight 1\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative_and_end_with_inf(registry):
+    latency = registry.histogram('app_seconds', 'Latency', ('stage',), buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(('write',), seconds)
+
+    assert registry.render().splitlines()[2:] == [
+        'app_seconds_bucket{stage="write",le="0.1"} 2',  # A value on a bound is counted in it
+        'app_seconds_bucket{stage="write",le="1.0"} 3',
+        'app_seconds_bucket{stage="write",le="+Inf"} 4',
+        'app_seconds_sum{stage="write"} 3.65',
+        'app_seconds_count{stage="write"} 4',
+    ]
+
+
+def test_label_values_are_escaped(registry):
+    errors = registry.counter('app_errors_total', 'Errors', ('message',))
+    errors.inc(('say "hi"\\\nbye',))
+
+    line = registry.render().splitlines()[-1]
+    assert line == 'app_errors_total{message="say \\"hi\\"\\\\\\nbye"} 1'
+    assert SAMPLE_LINE.match(line)
+
+
+def test_collectors_are_rendered_and_a_failing_one_is_skipped(registry):
+    @registry.collector
+    def broken():
+        raise RuntimeError("Not ready")
+
+    @registry.collector
+    def cache():
+        return [('app_cache_lookups_total', 'counter', 'Cache lookups',
+                 [({'result': 'hit'}, 7), ({'result': 'miss'}, 2)])]
+
+    assert registry.render() == (
+        '# HELP app_cache_lookups_total Cache lookups\n'
+        '# TYPE app_cache_lookups_total counter\n'
+        'app_cache_lookups_total{result="hit"} 7\n'
+        'app_cache_lookups_total{result="miss"} 2\n'
+    )
+
+
+def test_timers_record_duration_and_errors():
+    before = stage_samples('test', 'block')
+    with metrics.timer('test', 'block'):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.timer('test', 'block'):
+            raise ValueError("Bad row")
+
+    @metrics.timed('test', 'block')
+    def work():
+        return 'done'
+
+    assert work() == 'done'
+    count, errors = stage_samples('test', 'block')
+    assert (count - before[0], errors - before[1]) == (3, 1)
+
+
+def test_disabled_metrics_record_nothing():
+    metrics.set_enabled(False)
+    before = stage_samples('test', 'disabled')
+
+    with metrics.timer('test', 'disabled'):
+        pass
+
+    assert metrics.timer('test', 'disabled') is metrics.NULL_TIMER
+    assert stage_samples('test', 'disabled') == before
+
+
+def test_timed_connection_times_statements_by_verb(tmp_path):
+    before = stage_samples('database', 'select')
+
+    conn = sqlite3.connect(tmp_path / 'timed.db', factory=TimedConnection)
+    conn.execute("CREATE TABLE items (name TEXT)")
+    conn.executemany("INSERT INTO items VALUES (?)", [('a',), ('b',)])
+    assert conn.execute("  select count(*) from items").fetchone() == (2,)
+    conn.close()
+
+    assert stage_samples('database', 'select')[0] == before[0] + 1
+
+
+def test_scrape_counts_requests_by_route_rule(tmp_path, monkeypatch):
+    from task_runner import TaskRunner
+    monkeypatch.setitem(app_module.components._instances, 'task_runner', TaskRunner(db_path=tmp_path / 'tasks.db'))
+    client = app_module.app.test_client()
+    labels = ('GET', '/api/tasks/<task_id>', '404')
+    before = metrics.HTTP_REQUESTS.values.get(labels, 0)
+
+    assert client.get('/api/tasks/TASK-1').status_code == 404
+    assert client.get('/api/tasks/TASK-2').status_code == 404
+    response = client.get('/api/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert f'tracker_http_requests_total{{method="GET",route="/api/tasks/<task_id>",status="404"}} {before + 2}' in text
+    assert 'TASK-1' not in text
+    for line in text.splitlines():
+        assert line.startswith(('# HELP ', '# TYPE ')) or SAMPLE_LINE.match(line), line
+
+
+def test_scrape_is_refused_while_disabled():
+    metrics.set_enabled(False)
+
+    assert app_module.app.test_client().get('/api/metrics').status_code == 404
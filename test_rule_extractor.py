@@ -0,0 +1,91 @@
+"""
+Tests for the Rule-based Fast-Path Extractor
+"""
+from datetime import datetime
+
+import pytest
+
+from rule_extractor import RuleBasedExtractor, parse_when
+
+
+def make_email(body, subject="Candidate profile"):
+    return {'subject': subject, 'body': body, 'sender': 'recruiter@agency.com', 'attachments': []}
+
+
+@pytest.fixture
+def extractor():
+    return RuleBasedExtractor()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2026-03-04', datetime(2026, 3, 4)),
+    ('2026-03-04 10:30', datetime(2026, 3, 4, 10, 30)),
+    ('2026/03/04', datetime(2026, 3, 4)),
+    ('04/03/2026', datetime(2026, 3, 4)),
+    ('4 March 2026', datetime(2026, 3, 4)),
+])
+def test_parse_when_reads_iso_year_first_and_other_dates_day_first(text, expected):
+    assert parse_when(text) == expected
+
+
+def test_labelled_iso_interview_date_keeps_month_and_day(extractor):
+    result = extractor.extract(make_email(
+        "Candidate Name: Ali Hassan\nPosition: Site Engineer\nInterview Date: 2026-03-04\nInterview Time: 10:00"
+    ))
+
+    assert result['interview_date'] == '2026-03-04'
+    assert result['interview_time'] == '10:00'
+
+
+def test_day_first_interview_date(extractor):
+    result = extractor.extract(make_email("Candidate: Ali Hassan\nPosition: Site Engineer\nInterview Date: 04/03/2026"))
+
+    assert result['interview_date'] == '2026-03-04'
+
+
+def test_forwarded_date_header_is_not_an_interview_date(extractor):
+    result = extractor.extract(make_email(
+        "---------- Forwarded message ---------\nFrom: Agency <cvs@agency.com>\n"
+        "Date: Mon, 2 Mar 2026 at 09:15\nSubject: CV\n\nCandidate Name: Ali Hassan\nPosition: Site Engineer",
+        subject="FW: CV"
+    ))
+
+    assert 'interview_date' not in result
+    assert 'interview_time' not in result
+
+
+def test_availability_date_is_not_an_interview_date(extractor):
+    result = extractor.extract(make_email("Candidate Name: Ali Hassan\nPosition: Site Engineer\nDate: 04/03/2026"))
+
+    assert 'interview_date' not in result
+
+
+def test_dates_are_not_taken_for_phone_numbers(extractor):
+    result = extractor.extract(make_email(
+        "Candidate: Ali Hassan\nPosition: Site Engineer\nAvailable from 2026-03-04, interviewed on 04/03/2026."
+    ))
+
+    assert 'mobile' not in result
+
+
+def test_phone_number_next_to_a_date(extractor):
+    result = extractor.extract(make_email(
+        "Candidate: Ali Hassan\nAvailable from 2026-03-04. Reach him on +971 50 123 4567."
+    ))
+
+    assert result['mobile'] == '+971501234567'
+
+
+def test_sufficient_structured_email_skips_llm(extractor):
+    email_data = make_email("Candidate Name: Ali Hassan\nPosition: Site Engineer\nJob ID: JOB-260301-001")
+    result = extractor.extract(email_data)
+
+    assert result['candidate_name'] == 'Ali Hassan'
+    assert result['job_id'] == 'JOB-260301-001'
+    assert extractor.is_sufficient(result, email_data)
+
+
+def test_feedback_email_goes_to_llm(extractor):
+    email_data = make_email("Candidate Name: Ali Hassan\nPosition: Site Engineer\nFeedback: strong technically")
+
+    assert not extractor.is_sufficient(extractor.extract(email_data), email_data)
@@ -0,0 +1,81 @@
+"""
+Tests for Incrementally Maintained Tracker Counters
+"""
+import pytest
+
+from excel_manager import MASTER_SHEET, ExcelManager
+from tracker_counters import TrackerCounters
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+    manager.add_jobs_bulk([
+        {'Job Title': 'Site Engineer', 'Project Name': 'Alpha', 'Job Location (Country)': 'UAE', 'Job Status': 'Open'},
+        {'Job Title': 'Quantity Surveyor', 'Project Name': 'Beta', 'Job Location (Country)': 'UAE', 'Job Status': 'Open'},
+    ])
+    return manager
+
+
+def recount(manager, tmp_path):
+    """Counts from a full rebuild, kept apart from the counters under test"""
+    counters = TrackerCounters(manager, path=tmp_path / 'recount.json')
+    manager.commit_listeners.remove(counters.apply_transaction)
+    counters.rebuild()
+    return counters.counts
+
+
+def test_commits_update_the_counts_without_rebuilding(manager, tmp_path):
+    counters = TrackerCounters(manager)
+    assert counters.get_counts()['master'] == {'Open': 2}
+    assert counters.stats['rebuilds'] == 1
+
+    job_id = manager.read_master_tracker()['JobID'].iloc[0]
+    with manager.transaction() as tx:
+        cv_id, _ = tx.add_cv({'JobID': job_id, 'Candidate Name': 'Ali Hassan', 'Application Status': 'CV Shared'})
+        tx.add_cv({'JobID': job_id, 'Candidate Name': 'Sara Khan', 'Application Status': 'CV Shared'})
+    manager.update_cv(cv_id, {'Application Status': 'Hired'})
+
+    counts = counters.get_counts()
+    assert counters.stats['rebuilds'] == 1
+    assert counts['cv'] == {'CV Shared': 1, 'Hired': 1}
+    assert counts['master'] == {'Open': 1, 'Filled': 1}
+    assert counts == recount(manager, tmp_path)
+
+
+def test_external_edit_is_rebuilt_on_the_stamp_mismatch(manager, tmp_path):
+    counters = TrackerCounters(manager)
+    counters.get_counts()
+
+    # Written without a transaction, as if edited in Excel
+    df = manager.read_master_tracker()
+    df.loc[0, 'Job Status'] = 'Filled'
+    manager.save_with_formatting(df, manager.master_path, MASTER_SHEET)
+
+    assert counters.get_counts()['master'] == {'Open': 1, 'Filled': 1}
+    assert counters.stats['rebuilds'] == 2
+
+
+def test_deltas_on_another_file_version_trigger_a_rebuild(manager):
+    counters = TrackerCounters(manager)
+    counters.get_counts()
+
+    # Edited outside the app, then changed by a transaction before the counts are read again
+    df = manager.read_master_tracker()
+    df.loc[1, 'Job Status'] = 'Filled'
+    manager.save_with_formatting(df, manager.master_path, MASTER_SHEET)
+    manager.update_job(df.loc[0, 'JobID'], {'Job Status': 'Filled'})
+
+    assert counters.stamps['master'] is None
+    assert counters.get_counts()['master'] == {'Filled': 2}
+    assert counters.stats['rebuilds'] == 2
+
+
+def test_persisted_counts_are_reused_by_the_next_process(manager):
+    TrackerCounters(manager).get_counts()
+
+    restarted = TrackerCounters(manager)
+
+    assert restarted.get_counts()['master'] == {'Open': 2}
+    assert restarted.stats['rebuilds'] == 0
+    assert restarted.summary()['open_jobs'] == 2
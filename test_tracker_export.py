@@ -0,0 +1,83 @@
+"""
+Tests for Streaming Tracker Exports
+"""
+import csv
+import io
+from datetime import datetime
+
+import openpyxl
+import pytest
+
+from excel_manager import MASTER_SHEET, ExcelManager
+from json_response import loads
+from tracker_export import TrackerExporter
+from tracker_view import TrackerView
+
+FIELDS = ['Job Title', 'Project Name', 'Position Created Date', 'Max Budgeted Salary']
+JOBS = [
+    ('Site Engineer', 'Alpha', datetime(2026, 3, 4, 9, 30), 15000),
+    ('Quantity Surveyor', 'Beta', datetime(2026, 2, 1), None),
+    ('Planning Engineer', 'Alpha', None, 18000),
+    ('Ingénieur Sécurité', 'Gamma', datetime(2026, 1, 15), 12000),
+    ('Document Controller', 'Beta', datetime(2026, 3, 1), 9000),
+]
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    manager = ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+    manager.add_jobs_bulk([
+        {'Job Title': title, 'Project Name': project, 'Job Location (Country)': 'UAE',
+         'Position Created Date': created, 'Max Budgeted Salary': salary}
+        for title, project, created, salary in JOBS
+    ])
+    # Chunks of two rows, so every export spans several slices
+    return TrackerExporter(TrackerView(manager), chunk_size=2, read_size=1024)
+
+
+def body(exporter, export_format, **selection):
+    return b''.join(exporter.export('master', export_format, fields=FIELDS, **selection))
+
+
+def test_csv_has_a_bom_header_and_every_row(exporter):
+    data = body(exporter, 'csv').decode('utf-8')
+
+    assert data.startswith('﻿')
+    rows = list(csv.reader(io.StringIO(data[1:])))
+    assert rows[0] == FIELDS
+    assert rows[1] == ['Site Engineer', 'Alpha', '2026-03-04 09:30:00', '15000.0']
+    assert rows[3] == ['Planning Engineer', 'Alpha', '', '18000.0']
+    assert rows[4][0] == 'Ingénieur Sécurité'
+    assert len(rows) == len(JOBS) + 1
+
+
+def test_csv_applies_filters_and_sort(exporter):
+    data = body(exporter, 'csv', filters={'Project Name': 'beta'}, sort='-Job Title').decode('utf-8')
+
+    rows = list(csv.reader(io.StringIO(data[1:])))
+    assert [row[0] for row in rows[1:]] == ['Quantity Surveyor', 'Document Controller']
+
+
+def test_ndjson_has_one_object_per_row(exporter):
+    lines = body(exporter, 'ndjson').splitlines()
+
+    assert len(lines) == len(JOBS)
+    assert loads(lines[0]) == {'Job Title': 'Site Engineer', 'Project Name': 'Alpha',
+                               'Position Created Date': '2026-03-04 09:30:00', 'Max Budgeted Salary': 15000.0}
+    assert loads(lines[1])['Max Budgeted Salary'] == ''
+
+
+def test_xlsx_keeps_the_tracker_values(exporter):
+    workbook = openpyxl.load_workbook(io.BytesIO(body(exporter, 'xlsx')))
+
+    assert workbook.sheetnames == [MASTER_SHEET]
+    rows = list(workbook[MASTER_SHEET].values)
+    assert list(rows[0]) == FIELDS
+    assert rows[1] == ('Site Engineer', 'Alpha', datetime(2026, 3, 4, 9, 30), 15000)
+    assert rows[2] == ('Quantity Surveyor', 'Beta', datetime(2026, 2, 1), None)
+    assert len(rows) == len(JOBS) + 1
+
+
+def test_unknown_format_is_rejected(exporter):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        exporter.export('master', 'pdf')
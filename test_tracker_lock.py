@@ -0,0 +1,98 @@
+"""
+Tests for the Cross-Process Tracker Lock
+"""
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+from excel_manager import ExcelManager, TrackerLock
+
+HERE = str(Path(__file__).parent)
+
+
+def start_python(code, tmp_path):
+    """Run code in another interpreter with the trackers in tmp_path"""
+    script = f"import sys; sys.path.insert(0, {HERE!r})\n" + textwrap.dedent(code)
+    return subprocess.Popen([sys.executable, '-c', script], cwd=tmp_path, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+
+
+def test_lock_held_by_another_process_excludes_this_one(manager, tmp_path):
+    holder = start_python("""
+        import time
+        from excel_manager import ExcelManager
+        manager = ExcelManager('MasterTracker.xlsx', 'CVTracker.xlsx')
+        with manager.transaction():
+            print('locked', flush=True)
+            time.sleep(1.5)
+    """, tmp_path)
+    try:
+        assert holder.stdout.readline().strip() == 'locked'
+
+        waiting = TrackerLock(manager.lock.path, timeout=0.2)
+        with pytest.raises(TimeoutError):
+            waiting.acquire()
+    finally:
+        holder.wait(timeout=30)
+
+    assert holder.returncode == 0, holder.stderr.read()
+    waiting.acquire()
+    waiting.release()
+
+
+def test_writers_in_several_processes_lose_no_rows(manager, tmp_path):
+    writers = [start_python(f"""
+        from excel_manager import ExcelManager
+        manager = ExcelManager('MasterTracker.xlsx', 'CVTracker.xlsx')
+        for n in range(3):
+            job_id, message = manager.add_job({{'Job Title': 'Engineer {process}-' + str(n), 'Project Name': 'Alpha',
+                                                'Job Location (Country)': 'UAE'}})
+            assert job_id, message
+    """, tmp_path) for process in range(3)]
+
+    for writer in writers:
+        writer.wait(timeout=120)
+        assert writer.returncode == 0, writer.stderr.read()
+
+    jobs = manager.read_master_tracker()
+    assert len(jobs) == 9
+    assert jobs['JobID'].is_unique
+
+
+def test_lock_is_reentrant_within_a_thread_and_exclusive_across_threads(manager):
+    lock = manager.lock
+    lock.acquire()
+    lock.acquire()
+    lock.release()
+
+    # Still held by this thread after one release
+    other = TrackerLock(lock.path, timeout=0.1)
+    outcome = []
+
+    def try_lock():
+        try:
+            other.acquire()
+            outcome.append('acquired')
+            other.release()
+        except TimeoutError:
+            outcome.append('timed out')
+
+    thread = threading.Thread(target=try_lock)
+    thread.start()
+    thread.join()
+    assert outcome == ['timed out']
+
+    lock.release()
+    thread = threading.Thread(target=try_lock)
+    thread.start()
+    thread.join()
+    assert outcome == ['timed out', 'acquired']
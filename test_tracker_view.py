@@ -0,0 +1,108 @@
+"""
+Tests for Paged, Sorted and Filtered Tracker Views
+"""
+import pytest
+
+import app as app_module
+from excel_manager import ExcelManager
+from tracker_view import TrackerView
+
+JOBS = [
+    ('Site Engineer', 'Alpha', 'UAE', 'Open'),
+    ('Quantity Surveyor', 'Beta', 'KSA', 'Filled'),
+    ('Planning Engineer', 'Alpha', 'Qatar', 'Open'),
+    ('Document Controller', 'Gamma', 'UAE', 'Open'),
+    ('Safety Officer', 'Beta', 'Oman', 'Filled'),
+]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ExcelManager(tmp_path / 'MasterTracker.xlsx', tmp_path / 'CVTracker.xlsx')
+    manager.add_jobs_bulk([
+        {'Job Title': title, 'Project Name': project, 'Job Location (Country)': country, 'Job Status': status}
+        for title, project, country, status in JOBS
+    ])
+    return manager
+
+
+@pytest.fixture
+def view(manager):
+    return TrackerView(manager, default_page_size=2)
+
+
+@pytest.fixture
+def client(view, monkeypatch):
+    monkeypatch.setitem(app_module.components._instances, 'tracker_view', view)
+    return app_module.app.test_client()
+
+
+def titles(result):
+    return [row['Job Title'] for row in result['rows']]
+
+
+def test_pages_split_the_rows(view):
+    first = view.query('master', page=1)
+    last = view.query('master', page=3)
+
+    assert (first['total'], first['pages'], first['page_size']) == (5, 3, 2)
+    assert titles(first) == ['Site Engineer', 'Quantity Surveyor']
+    assert titles(last) == ['Safety Officer']
+    assert view.query('master', page=4)['rows'] == []
+
+
+def test_page_size_is_capped(manager):
+    view = TrackerView(manager, max_page_size=3)
+
+    assert view.query('master', page_size=100)['page_size'] == 3
+
+
+def test_sort_ascending_and_descending(view):
+    ascending = view.query('master', page_size=5, sort='Job Title')
+    descending = view.query('master', page_size=5, sort='-Job Title')
+
+    assert titles(ascending) == sorted(title for title, *_ in JOBS)
+    assert titles(descending) == titles(ascending)[::-1]
+
+
+def test_filters_are_case_insensitive_substrings_and_combine(view):
+    result = view.query('master', page_size=5, filters={'Project Name': 'alpha', 'Job Title': 'ENGINEER'},
+                        sort='-Job Title')
+
+    assert titles(result) == ['Site Engineer', 'Planning Engineer']
+    assert result['total'] == 2
+
+
+def test_fields_limit_the_columns(view):
+    result = view.query('master', fields=['Job Title', 'No Such Column'])
+
+    assert list(result['rows'][0]) == ['Job Title']
+
+
+def test_new_version_is_served_after_a_write(view, manager):
+    assert view.query('master')['total'] == 5
+
+    manager.add_job({'Job Title': 'Electrical Engineer', 'Project Name': 'Delta', 'Job Location (Country)': 'UAE'})
+
+    assert view.query('master')['total'] == 6
+
+
+def test_etag_round_trip(client, manager):
+    first = client.get('/api/jobs?page=1&sort=Job%20Title')
+    etag = first.headers['ETag']
+
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert [row['Job Title'] for row in first.get_json()['rows']] == ['Document Controller', 'Planning Engineer']
+
+    cached = client.get('/api/jobs?page=1&sort=Job%20Title', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    # Another query is another representation
+    assert client.get('/api/jobs?page=2&sort=Job%20Title', headers={'If-None-Match': etag}).status_code == 200
+
+    manager.add_job({'Job Title': 'Electrical Engineer', 'Project Name': 'Delta', 'Job Location (Country)': 'UAE'})
+    changed = client.get('/api/jobs?page=1&sort=Job%20Title', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
@@ -0,0 +1,120 @@
+"""
+Tests for the Durable Work Queue
+"""
+import threading
+
+import pytest
+
+import work_queue
+from work_queue import DONE, FAILED, IN_PROGRESS, PENDING, WorkQueue
+
+
+class Clock:
+    def __init__(self, now=1000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(work_queue.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    return WorkQueue(db_path=tmp_path / 'queue.db', max_attempts=3, visibility_timeout=60,
+                     retry_base_delay=10, retry_max_delay=100)
+
+
+def test_claim_and_ack(queue):
+    item_id = queue.enqueue({'subject': 'CV'})
+
+    assert queue.claim() == [(item_id, {'subject': 'CV'}, 1)]
+    assert queue.claim() == []
+    assert queue.counts()[IN_PROGRESS] == 1
+
+    queue.ack([item_id])
+    assert queue.counts()[DONE] == 1
+    assert queue.pending_count() == 0
+
+
+def test_fail_backs_off_before_the_retry(queue, clock):
+    item_id = queue.enqueue({'subject': 'CV'})
+    queue.claim()
+
+    assert queue.fail(item_id, 'quota') == PENDING
+    clock.now += 7  # Under the first delay of 10s less jitter
+    assert queue.claim() == []
+
+    clock.now += 6
+    assert queue.claim() == [(item_id, {'subject': 'CV'}, 2)]
+
+
+def test_fail_dead_letters_after_max_attempts(queue, clock):
+    item_id = queue.enqueue({'subject': 'CV'})
+    for attempt in range(1, 4):
+        assert queue.claim()[0][2] == attempt
+        state = queue.fail(item_id, 'quota')
+        clock.now += 200
+
+    assert state == FAILED
+    assert queue.claim() == []
+    assert queue.counts()[FAILED] == 1
+
+
+def test_expired_claim_is_reclaimed(queue, clock):
+    item_id = queue.enqueue({'subject': 'CV'})
+    queue.claim(worker_id='crashed')
+
+    clock.now += 30
+    assert queue.claim() == []
+
+    clock.now += 31
+    assert queue.claim(worker_id='other') == [(item_id, {'subject': 'CV'}, 2)]
+
+
+def test_extend_keeps_a_claim_invisible(queue, clock):
+    item_id = queue.enqueue({'subject': 'CV'})
+    queue.claim()
+
+    clock.now += 50
+    queue.extend([item_id])
+    clock.now += 50
+    assert queue.claim() == []
+
+
+def test_expired_claim_on_last_attempt_is_dead_lettered(queue, clock):
+    queue.enqueue({'subject': 'CV'})
+    for _ in range(3):
+        assert len(queue.claim()) == 1
+        clock.now += 61
+
+    assert queue.claim() == []
+    assert queue.counts()[FAILED] == 1
+
+
+def test_concurrent_claimers_never_share_an_item(tmp_path):
+    # Real clock: two workers with their own connections claim from one database
+    queues = [WorkQueue(db_path=tmp_path / 'queue.db') for _ in range(2)]
+    item_ids = {queues[0].enqueue({'n': n}) for n in range(200)}
+    claimed = [[], []]
+
+    def worker(index):
+        while True:
+            items = queues[index].claim(limit=7, worker_id=f"worker-{index}")
+            if not items:
+                return
+            claimed[index].extend(item_id for item_id, _, _ in items)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not set(claimed[0]) & set(claimed[1])
+    assert set(claimed[0]) | set(claimed[1]) == item_ids
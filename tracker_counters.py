@@ -0,0 +1,125 @@
+"""
+Incrementally Maintained Tracker Counters for the Dashboard
+"""
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+
+from excel_manager import STATUS_COLUMNS, status_label
+
+TRACKERS = ('master', 'cv')
+
+
+class TrackerCounters:
+    """
+    Row counts per job status and application status, updated from each committed
+    tracker transaction and persisted next to the trackers with the file stamps they
+    describe. A stamp mismatch means the workbook was edited elsewhere, so the counts
+    are rebuilt from the files.
+    """
+
+    def __init__(self, excel_manager, path=None):
+        self.excel_manager = excel_manager
+        self.path = Path(path) if path else excel_manager.master_path.parent / "tracker_counters.json"
+        self.counts = {tracker: Counter() for tracker in TRACKERS}
+        self.stamps = {tracker: None for tracker in TRACKERS}
+        self.stats = {'incremental_updates': 0, 'rebuilds': 0}
+        self._lock = threading.Lock()
+        self._load()
+        excel_manager.commit_listeners.append(self.apply_transaction)
+
+    def _current_stamps(self):
+        master, cv = self.excel_manager.tracker_version()
+        return {'master': master, 'cv': cv}
+
+    def _load(self):
+        """Restore persisted counts if they still describe the tracker files"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+            for tracker in TRACKERS:
+                self.counts[tracker] = Counter(saved['counts'][tracker])
+                stamp = saved['stamps'][tracker]
+                self.stamps[tracker] = tuple(stamp) if stamp else None
+        except (OSError, ValueError, KeyError):
+            self.stamps = {tracker: None for tracker in TRACKERS}
+
+    def _save(self):
+        """Persist counts and stamps atomically"""
+        temp_path = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'counts': {tracker: dict(counts) for tracker, counts in self.counts.items()},
+                    'stamps': self.stamps
+                }, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving tracker counters: {e}")
+
+    def apply_transaction(self, tx):
+        """Apply a committed transaction's status deltas"""
+        with self._lock:
+            stamps = self._current_stamps()
+            for tracker in TRACKERS:
+                if not tx.modified(tracker):
+                    continue
+                # The deltas only apply to counts of the file version the transaction read;
+                # otherwise the counts are rebuilt on the next read
+                if self.stamps[tracker] is None or self.stamps[tracker] != tx.read_stamps.get(tracker):
+                    self.stamps[tracker] = None
+                    continue
+                self.counts[tracker].update(tx.status_deltas[tracker])
+                self.counts[tracker] = +self.counts[tracker]  # Drop zero and negative entries
+                self.stamps[tracker] = stamps[tracker]
+            self.stats['incremental_updates'] += 1
+            self._save()
+
+    def rebuild(self, trackers=TRACKERS):
+        """Recount from the tracker files"""
+        with self._lock:
+            self._rebuild(trackers)
+            self._save()
+
+    def _rebuild(self, trackers):
+        stamps = self._current_stamps()
+        for tracker in trackers:
+            df = self.excel_manager.read_master_tracker() if tracker == 'master' else self.excel_manager.read_cv_tracker()
+            column = STATUS_COLUMNS[tracker]
+            if df.empty:
+                self.counts[tracker] = Counter()
+            elif column in df.columns:
+                self.counts[tracker] = Counter(status_label(value) for value in df[column])
+            else:
+                self.counts[tracker] = Counter({'': len(df)})
+            self.stamps[tracker] = stamps[tracker]
+        self.stats['rebuilds'] += 1
+
+    def get_counts(self):
+        """Current counts, rebuilding any tracker whose file changed outside this process"""
+        with self._lock:
+            stamps = self._current_stamps()
+            stale = [tracker for tracker in TRACKERS if self.stamps[tracker] != stamps[tracker]]
+            if stale:
+                self._rebuild(stale)
+                self._save()
+            return {tracker: Counter(counts) for tracker, counts in self.counts.items()}
+
+    def summary(self):
+        """Dashboard KPIs"""
+        counts = self.get_counts()
+        jobs = counts['master']
+        cvs = counts['cv']
+        return {
+            'total_jobs': sum(jobs.values()),
+            'open_jobs': jobs['Open'],
+            'filled_jobs': jobs['Filled'],
+            'total_cvs': sum(cvs.values()),
+            'interviews_scheduled': cvs['Interview Scheduled'],
+            'offers_extended': cvs['Offer Extended'],
+            'hired': cvs['Hired'],
+            'jobs_by_status': dict(jobs),
+            'cvs_by_status': dict(cvs)
+        }
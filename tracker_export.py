@@ -0,0 +1,90 @@
+"""
+Streaming Tracker Exports (CSV, NDJSON, xlsx)
+"""
+import csv
+import io
+import tempfile
+
+from json_response import dumps
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class TrackerExporter:
+    """
+    Writes the rows of a TrackerView selection as a generator of byte chunks, one
+    slice of rows at a time, so large exports neither build the whole body in memory
+    nor wait for it before the first bytes go out.
+    """
+
+    def __init__(self, tracker_view, chunk_size=1000, read_size=64 * 1024):
+        self.tracker_view = tracker_view
+        self.chunk_size = chunk_size
+        self.read_size = read_size
+
+    def export(self, tracker, export_format, filters=None, sort=None, fields=None):
+        """Byte chunks of the selection in 'csv', 'ndjson' or 'xlsx'"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        columns = self.tracker_view.columns(tracker, fields)
+        chunks = self.tracker_view.iter_chunks(tracker, filters, sort, columns, self.chunk_size,
+                                               raw=export_format == 'xlsx')
+        return getattr(self, f"_{export_format}")(tracker, columns, chunks)
+
+    def _csv(self, tracker, columns, chunks):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # BOM so Excel opens the UTF-8 file with the right encoding
+        buffer.write('﻿')
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk.itertuples(index=False, name=None))
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    def _ndjson(self, tracker, columns, chunks):
+        for chunk in chunks:
+            values = [chunk[column].tolist() for column in chunk.columns]
+            yield b''.join(dumps(dict(zip(columns, row))) + b'\n' for row in zip(*values))
+
+    def _xlsx(self, tracker, columns, chunks):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Font, PatternFill
+        from excel_manager import CV_SHEET, MASTER_SHEET
+
+        # A zip archive can't be sent before it is finished; write_only keeps the rows on
+        # disk instead of in memory, then the file goes out in blocks
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(MASTER_SHEET if tracker == 'master' else CV_SHEET)
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_font = Font(color="FFFFFF", bold=True)
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(worksheet, value=column)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal="center")
+            header.append(cell)
+        worksheet.append(header)
+
+        for chunk in chunks:
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                worksheet.append(row)
+
+        with tempfile.TemporaryFile() as output:
+            workbook.save(output)
+            output.seek(0)
+            while True:
+                block = output.read(self.read_size)
+                if not block:
+                    break
+                yield block
@@ -0,0 +1,157 @@
+"""
+Paged, Sorted and Filtered Read Views over the Trackers
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+from json_response import dumps, frame_records, json_frame
+
+TRACKERS = ('master', 'cv')
+
+
+def to_display(df):
+    """JSON-safe copy of a tracker: dates as strings, blanks instead of NaN"""
+    return json_frame(df, missing='')
+
+
+class TrackerView:
+    """Serves pages of a tracker from a per-version snapshot, caching sort orders and filtered row sets"""
+
+    def __init__(self, excel_manager, default_page_size=50, max_page_size=500, cache_size=32):
+        self.excel_manager = excel_manager
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+        self.cache_size = cache_size
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def version(self, tracker):
+        """File stamp of one tracker"""
+        return self.excel_manager.tracker_version()[TRACKERS.index(tracker)]
+
+    def etag(self, tracker, query_string=''):
+        """Strong validator for one representation: tracker version plus the normalised query"""
+        key = f"{tracker}|{self.version(tracker)}|{query_string}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _snapshot(self, tracker):
+        version = self.version(tracker)
+        with self._lock:
+            snapshot = self._snapshots.get(tracker)
+            if snapshot is None or snapshot['version'] != version:
+                raw = self.excel_manager.read_master_tracker() if tracker == 'master' else self.excel_manager.read_cv_tracker()
+                snapshot = {
+                    'version': version,
+                    'raw': raw,
+                    'display': to_display(raw),
+                    'encoded': None,
+                    'orders': {},
+                    'filters': OrderedDict()
+                }
+                self._snapshots[tracker] = snapshot
+            return snapshot
+
+    def all_rows(self, tracker):
+        """Every row of the tracker, JSON-safe"""
+        return frame_records(self._snapshot(tracker)['display'])
+
+    def all_rows_json(self, tracker):
+        """Every row of the tracker as encoded JSON, built once per version"""
+        snapshot = self._snapshot(tracker)
+        if snapshot['encoded'] is None:
+            snapshot['encoded'] = dumps(frame_records(snapshot['display']))
+        return snapshot['encoded']
+
+    def query(self, tracker, page=1, page_size=None, sort=None, filters=None, fields=None):
+        """
+        One page of rows. `sort` is a column name, prefixed with '-' for descending;
+        `filters` maps columns to case-insensitive substrings; `fields` limits the columns.
+        """
+        snapshot = self._snapshot(tracker)
+        display = snapshot['display']
+        page = max(1, int(page or 1))
+        page_size = min(self.max_page_size, max(1, int(page_size or self.default_page_size)))
+
+        positions = self._positions(snapshot, filters or {}, sort)
+        total = len(positions)
+        start = (page - 1) * page_size
+        rows = display.iloc[positions[start:start + page_size]]
+        if fields:
+            rows = rows[[field for field in fields if field in rows.columns]]
+
+        return {
+            'rows': frame_records(rows),
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'pages': (total + page_size - 1) // page_size
+        }
+
+    def iter_chunks(self, tracker, filters=None, sort=None, fields=None, chunk_size=1000, raw=False):
+        """
+        Matching rows in slices of `chunk_size`, as display frames or, with raw=True, as
+        the tracker's own values. Only one slice is materialised at a time.
+        """
+        snapshot = self._snapshot(tracker)
+        frame = snapshot['raw'] if raw else snapshot['display']
+        if fields:
+            frame = frame[[field for field in fields if field in frame.columns]]
+        positions = self._positions(snapshot, filters or {}, sort)
+        for start in range(0, len(positions), chunk_size):
+            yield frame.iloc[positions[start:start + chunk_size]]
+
+    def columns(self, tracker, fields=None):
+        """Column names of the tracker, limited to `fields` when given"""
+        columns = list(self._snapshot(tracker)['display'].columns)
+        return [field for field in fields if field in columns] if fields else columns
+
+    def _positions(self, snapshot, filters, sort):
+        """Row positions matching all filters in sort order, cached per snapshot"""
+        display = snapshot['display']
+        filters = {column: str(value) for column, value in filters.items() if column in display.columns and value}
+        order = self._order(snapshot, sort) if sort else None
+        if not filters:
+            return order if order is not None else range(len(display))
+
+        key = (tuple(sorted(filters.items())), sort if order is not None else None)
+        cache = snapshot['filters']
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+
+        mask = pd.Series(True, index=display.index)
+        for column, value in filters.items():
+            mask &= display[column].astype(str).str.contains(value, case=False, na=False, regex=False)
+        matched = mask.to_numpy()
+        positions = [i for i in (order if order is not None else range(len(display))) if matched[i]]
+
+        with self._lock:
+            cache[key] = positions
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return positions
+
+    def _order(self, snapshot, sort):
+        """Row positions in sort order, computed once per column and direction"""
+        descending = sort.startswith('-')
+        column = sort.lstrip('-')
+        raw = snapshot['raw']
+        if column not in raw.columns:
+            return None
+
+        with self._lock:
+            if sort in snapshot['orders']:
+                return snapshot['orders'][sort]
+
+        values = raw[column]
+        if values.dtype == object:
+            # Mixed text/number/date columns sort by their text form
+            values = values.map(lambda value: '' if pd.isna(value) else str(value).lower())
+        order = values.reset_index(drop=True).sort_values(ascending=not descending, na_position='last', kind='stable').index.to_list()
+
+        with self._lock:
+            snapshot['orders'][sort] = order
+        return order
@@ -0,0 +1,212 @@
+"""
+Durable SQLite-backed work queue for the email pipeline
+"""
+import sqlite3
+import json
+import random
+import time
+from pathlib import Path
+
+PENDING = 'pending'
+IN_PROGRESS = 'in_progress'
+DONE = 'done'
+FAILED = 'failed'
+
+class WorkQueue:
+    """Persistent work queue with visibility timeouts, retries and batch claim/ack"""
+
+    def __init__(self, db_path="data/email_pipeline.db", name="email", max_attempts=5,
+                 visibility_timeout=300, retry_base_delay=30, retry_max_delay=3600):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.name = name
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout  # Seconds before an unacked claim is retried
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.init_database()
+
+    def get_connection(self):
+        """Get database connection (autocommit, transactions are explicit)"""
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def init_database(self):
+        """Initialize queue table"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        # WAL lets workers read queue depth while another process claims
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS work_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                claimed_by TEXT,
+                claimed_until REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_work_queue_claim
+            ON work_queue (queue, state, available_at)
+        """)
+
+        conn.close()
+
+    def enqueue(self, payload):
+        """Add an item and return its ID"""
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute(
+                """INSERT INTO work_queue (queue, payload, state, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (self.name, json.dumps(payload, default=str), PENDING, now, now, now)
+            )
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def claim(self, limit=10, worker_id=None, visibility_timeout=None):
+        """Claim up to `limit` items; returns a list of (id, payload, attempts)"""
+        now = time.time()
+        claimed_until = now + (visibility_timeout or self.visibility_timeout)
+        conn = self.get_connection()
+
+        try:
+            # Take the write lock up front so concurrent workers never claim the same rows
+            conn.execute("BEGIN IMMEDIATE")
+
+            # A worker that died holding an item on its last attempt doesn't get it retried
+            conn.execute(
+                """UPDATE work_queue SET state = ?, last_error = COALESCE(last_error, 'Claim expired'),
+                claimed_until = NULL, updated_at = ?
+                WHERE queue = ? AND state = ? AND claimed_until < ? AND attempts >= ?""",
+                (FAILED, now, self.name, IN_PROGRESS, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                """SELECT id, payload, attempts FROM work_queue
+                WHERE queue = ? AND (
+                    (state = ? AND available_at <= ?) OR
+                    (state = ? AND claimed_until < ? AND attempts < ?)
+                )
+                ORDER BY id LIMIT ?""",
+                (self.name, PENDING, now, IN_PROGRESS, now, self.max_attempts, limit)
+            ).fetchall()
+
+            if rows:
+                conn.executemany(
+                    """UPDATE work_queue SET state = ?, claimed_by = ?, claimed_until = ?,
+                    attempts = attempts + 1, updated_at = ? WHERE id = ?""",
+                    [(IN_PROGRESS, worker_id, claimed_until, now, row[0]) for row in rows]
+                )
+            conn.execute("COMMIT")
+
+            return [(row[0], json.loads(row[1]), row[2] + 1) for row in rows]
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def extend(self, item_ids, visibility_timeout=None):
+        """Extend the visibility timeout of claimed items that are still being worked on"""
+        if not item_ids:
+            return
+        now = time.time()
+        claimed_until = now + (visibility_timeout or self.visibility_timeout)
+        conn = self.get_connection()
+        try:
+            conn.executemany(
+                "UPDATE work_queue SET claimed_until = ?, updated_at = ? WHERE id = ? AND state = ?",
+                [(claimed_until, now, item_id, IN_PROGRESS) for item_id in item_ids]
+            )
+        finally:
+            conn.close()
+
+    def ack(self, item_ids):
+        """Mark claimed items as done"""
+        if not item_ids:
+            return
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            conn.executemany(
+                "UPDATE work_queue SET state = ?, claimed_until = NULL, updated_at = ? WHERE id = ?",
+                [(DONE, now, item_id) for item_id in item_ids]
+            )
+        finally:
+            conn.close()
+
+    def fail(self, item_id, error=None):
+        """Release a claimed item for retry with backoff, or mark it failed; returns its new state"""
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT attempts FROM work_queue WHERE id = ?", (item_id,)).fetchone()
+            if not row:
+                conn.execute("COMMIT")
+                return None
+
+            attempts = row[0]
+            if attempts >= self.max_attempts:
+                state = FAILED
+                conn.execute(
+                    "UPDATE work_queue SET state = ?, last_error = ?, claimed_until = NULL, updated_at = ? WHERE id = ?",
+                    (FAILED, error, now, item_id)
+                )
+            else:
+                state = PENDING
+                # Exponential backoff with jitter
+                delay = min(self.retry_base_delay * 2 ** (attempts - 1), self.retry_max_delay)
+                delay *= random.uniform(0.8, 1.2)
+                conn.execute(
+                    """UPDATE work_queue SET state = ?, last_error = ?, available_at = ?,
+                    claimed_by = NULL, claimed_until = NULL, updated_at = ? WHERE id = ?""",
+                    (PENDING, error, now + delay, now, item_id)
+                )
+            conn.execute("COMMIT")
+            return state
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def counts(self):
+        """Number of items in each state"""
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT state, COUNT(*) FROM work_queue WHERE queue = ? GROUP BY state",
+                (self.name,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        counts = {PENDING: 0, IN_PROGRESS: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def pending_count(self):
+        """Number of items not yet done (pending or being worked on)"""
+        counts = self.counts()
+        return counts[PENDING] + counts[IN_PROGRESS]
+
+    def purge(self, older_than_seconds=7 * 24 * 3600):
+        """Delete done items older than the given age"""
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                "DELETE FROM work_queue WHERE queue = ? AND state = ? AND updated_at < ?",
+                (self.name, DONE, time.time() - older_than_seconds)
+            )
+        finally:
+            conn.close()